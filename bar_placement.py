@@ -0,0 +1,157 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Rozmieszczenie prętów głównych w przekroju liczone wektorowo (NumPy).
+Pręty układane są w dowolnej liczbie warstw: pierwsza warstwa pomiędzy odgięciami strzemienia, kolejne na całej
+szerokości wewnątrz strzemienia, co najmniej w rozstawie spacing_between_bars. Liczba prętów w warstwach liczona jest
+wprost ze szerokości warstw, bez sprawdzania kolejnych wariantów.
+Funkcje przyjmują pojedynczy przekrój lub tablice parametrów całego katalogu przekrojów.
+"""
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+# wymiar kruszywa przyjmowany przy minimalnym rozstawie prętów
+DIAMETER_AGGREGATE = 16
+
+
+def spacing_between_bars(diameter, diameter_aggregate: float = DIAMETER_AGGREGATE) -> np.ndarray:
+    """Minimalny rozstaw osi prętów, jak beam_layout.spacing_between_bars"""
+    diameter = np.asarray(diameter, dtype=float)
+    return np.ceil(np.maximum(np.maximum(diameter, 20), diameter_aggregate + 5)) + diameter
+
+
+def bar_bending(diameter) -> np.ndarray:
+    """Wygięcie pręta, jak beam_layout.bar_bending"""
+    diameter = np.asarray(diameter, dtype=float)
+    return np.where(diameter <= 16, diameter * 2.5, diameter * 4.0)
+
+
+def capacity(width, spacing) -> np.ndarray:
+    """
+    Największa liczba prętów w warstwie, width - odległość osi skrajnych prętów, spacing - minimalny rozstaw osi.
+    0 - warstwa węższa od pręta.
+    """
+    width = np.asarray(width, dtype=float)
+    spacing = np.asarray(spacing, dtype=float)
+    gaps = np.maximum(np.floor(width / spacing), 0)
+    # korekta zaokrągleń - warunek jak przy sprawdzaniu rozstawu: width / liczba odstępów >= spacing
+    gaps = np.where((gaps > 0) & (width / np.maximum(gaps, 1) < spacing), gaps - 1, gaps)
+    gaps = np.where(width / (gaps + 1) >= spacing, gaps + 1, gaps)
+    return np.where(width < 0, 0, gaps + 1).astype(int)
+
+
+class BarPlacement(NamedTuple):
+    """
+    Rozmieszczenie prętów jednej strony przekroju (góra lub dół) dla serii przekrojów.
+    Pola dwuwymiarowe mają wymiar (przekroje, warstwy), warstwy bez prętów mają count = 0.
+    x0 - oś pierwszego pręta warstwy od lewej krawędzi przekroju, step - rozstaw prętów w warstwie,
+    offset - odległość osi warstwy od krawędzi (górnej lub dolnej) przekroju.
+    """
+    spacing: np.ndarray
+    first_capacity: np.ndarray
+    next_capacity: np.ndarray
+    x0: np.ndarray
+    step: np.ndarray
+    count: np.ndarray
+    offset: np.ndarray
+    layers: np.ndarray
+    fits_width: np.ndarray
+
+    @property
+    def depth(self) -> np.ndarray:
+        """odległość osi najgłębszej warstwy od krawędzi przekroju"""
+        return self.offset[np.arange(len(self.layers)), self.layers - 1]
+
+    def layers_at(self, index: int = 0) -> list[tuple[float, float, int, float]]:
+        """Warstwy prętów przekroju index: (x0, step, count, offset)"""
+        return [(self.x0[index, layer].item(), self.step[index, layer].item(), self.count[index, layer].item(),
+                 self.offset[index, layer].item()) for layer in range(self.layers[index])]
+
+
+def solve(beam_width, cover_left, cover_right, cover, diameter_stirrup, diameter, quantity,
+          diameter_aggregate: float = DIAMETER_AGGREGATE) -> BarPlacement:
+    """Rozmieszczenie prętów jednej strony przekroju, cover - otulina od strony prętów (góra lub dół)"""
+    beam_width, cover_left, cover_right, cover, diameter_stirrup, diameter, quantity = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (beam_width, cover_left, cover_right, cover,
+                                                                       diameter_stirrup, diameter, quantity)))
+    quantity = quantity.astype(int)
+    spacing = spacing_between_bars(diameter, diameter_aggregate)
+    bending = bar_bending(diameter_stirrup)
+
+    # pierwsza warstwa pomiędzy odgięciami strzemienia, jeżeli pręt mieści się w odgięciu
+    in_bending = bending - diameter_stirrup / 2 >= diameter / 2
+    first_x0 = np.where(in_bending, cover_left + diameter_stirrup / 2 + bending,
+                        cover_left + diameter_stirrup + diameter / 2)
+    first_x1 = np.where(in_bending, beam_width - cover_right - diameter_stirrup / 2 - bending,
+                        beam_width - cover_right - diameter_stirrup - diameter / 2)
+    # kolejne warstwy na całej szerokości wewnątrz strzemienia
+    next_x0 = cover_left + diameter_stirrup + diameter / 2
+    next_x1 = beam_width - cover_right - diameter_stirrup - diameter / 2
+    first_capacity = capacity(first_x1 - first_x0, spacing)
+    next_capacity = capacity(next_x1 - next_x0, spacing)
+
+    first = np.minimum(quantity, first_capacity)
+    rest = quantity - first
+    # przy warstwach węższych od pręta liczba warstw liczona jest dla jednego pręta w warstwie
+    per_layer = np.maximum(next_capacity, 1)
+    layers = 1 + -(-rest // per_layer)
+    layer = np.arange(layers.max())[None, :]
+    count = np.where(layer == 0, first[:, None],
+                     np.clip(rest[:, None] - (layer - 1) * per_layer[:, None], 0, per_layer[:, None]))
+
+    x0 = np.where(layer == 0, first_x0[:, None], next_x0[:, None])
+    width = np.where(layer == 0, (first_x1 - first_x0)[:, None], (next_x1 - next_x0)[:, None])
+    step = np.where(count > 1, width / np.maximum(count - 1, 1), 0)
+    offset = (cover + diameter_stirrup + diameter / 2)[:, None] + layer * spacing[:, None]
+    fits_width = (first_capacity >= np.minimum(quantity, 1)) & ((rest == 0) | (next_capacity > 0))
+    return BarPlacement(spacing=spacing, first_capacity=first_capacity, next_capacity=next_capacity, x0=x0,
+                        step=step, count=count, offset=offset, layers=layers, fits_width=fits_width)
+
+
+class SectionPlacement(NamedTuple):
+    """Rozmieszczenie prętów górnych i dolnych serii przekrojów oraz wynik sprawdzenia"""
+    top: BarPlacement
+    bottom: BarPlacement
+    # odstęp osi najgłębszych warstw prętów górnych i dolnych
+    clearance: np.ndarray
+    fits_height: np.ndarray
+
+    @property
+    def feasible(self) -> np.ndarray:
+        return self.top.fits_width & self.bottom.fits_width & self.fits_height
+
+    def errors(self, index: int = 0) -> list[str]:
+        """Opis niespełnionych warunków przekroju index, pusta lista - pręty mieszczą się w przekroju"""
+        errors = []
+        for side, placement in (('top', self.top), ('bottom', self.bottom)):
+            if not placement.fits_width[index]:
+                errors.append(f"{side} bars: section is too narrow for a single bar")
+        if not self.fits_height[index]:
+            errors.append(f"{self.top.layers[index]} top and {self.bottom.layers[index]} bottom bar layers "
+                          f"do not fit in the section height (clearance {self.clearance[index]:.1f})")
+        return errors
+
+
+def solve_section(beam_width, beam_height, cover_left, cover_right, cover_top, cover_bottom, diameter_stirrup,
+                  diameter_main_top, quantity_main_top, diameter_main_bottom, quantity_main_bottom,
+                  diameter_aggregate: float = DIAMETER_AGGREGATE) -> SectionPlacement:
+    """Rozmieszczenie prętów jednego przekroju lub katalogu przekrojów (parametry skalarne lub tablice)"""
+    top = solve(beam_width, cover_left, cover_right, cover_top, diameter_stirrup, diameter_main_top,
+                quantity_main_top, diameter_aggregate)
+    bottom = solve(beam_width, cover_left, cover_right, cover_bottom, diameter_stirrup, diameter_main_bottom,
+                   quantity_main_bottom, diameter_aggregate)
+    clearance = np.asarray(beam_height, dtype=float) - top.depth - bottom.depth
+    return SectionPlacement(top=top, bottom=bottom, clearance=clearance,
+                            fits_height=clearance >= np.maximum(top.spacing, bottom.spacing))
+
+
+# parametry DxfElement używane przez solve_section
+SECTION_PARAMETERS = ('beam_width', 'beam_height', 'cover_left', 'cover_right', 'cover_top', 'cover_bottom',
+                      'diameter_stirrup', 'diameter_main_top', 'quantity_main_top', 'diameter_main_bottom',
+                      'quantity_main_bottom')
+
+
+def solve_catalog(sections: Iterable[dict]) -> SectionPlacement:
+    """Sprawdzenie katalogu przekrojów jednym wywołaniem, sections - parametry belek (np. z pliku .jsonl)"""
+    sections = list(sections)
+    return solve_section(**{name: np.array([section[name] for section in sections]) for name in SECTION_PARAMETERS})
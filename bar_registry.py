@@ -0,0 +1,116 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Rejestr prętów zestawienia stali.
+Pręty identyfikowane są kluczem (element, liczba elementów, średnica, klasa stali, długość, kształt) -
+dodanie pręta i scalenie z identycznym prętem to jedna operacja na słowniku, sumy wg klasy stali i średnicy
+liczone są przy dodawaniu.
+"""
+from typing import Iterable, Iterator, NamedTuple
+
+from beam_layout import ScheduleRow, mass_1m_bar
+
+
+class BarKey(NamedTuple):
+    name_element: str
+    # elementy o tej samej nazwie i różnej liczbie sztuk to osobne pozycje zestawienia
+    number_of_elements: int
+    diameter: float
+    steel_grade: str
+    length: float
+    shape: tuple
+
+
+class BarPosition(NamedTuple):
+    """pozycja zestawienia - pręt jednego elementu i liczba elementów"""
+    row: ScheduleRow
+    number_of_elements: int = 1
+
+    @property
+    def total_quantity(self) -> int:
+        """liczba prętów we wszystkich elementach"""
+        return self.row.quantity_bar * self.number_of_elements
+
+    @property
+    def total_length(self) -> float:
+        """długość prętów we wszystkich elementach [m], zaokrąglona jak w tabeli zestawienia"""
+        return round(self.row.length / 1000 * self.row.quantity_bar * self.number_of_elements, 2)
+
+    @property
+    def mass(self) -> float:
+        """masa prętów we wszystkich elementach [kg]"""
+        return round(self.total_length * mass_1m_bar(self.row.diameter), 2)
+
+
+class BarRegistry:
+    """
+    Zestawienie prętów jednego lub wielu elementów.
+    Kolumny zestawienia (klasa stali, średnica) w kolejności pierwszego wystąpienia, jak w tabeli DxfElement.
+    """
+
+    def __init__(self, rows: Iterable[ScheduleRow] = (), number_of_elements: int = 1):
+        self._positions: dict[BarKey, BarPosition] = {}
+        # klasa stali -> średnice, słowniki zachowują kolejność dodania
+        self._grades: dict[str, dict[float, None]] = {}
+        self._length: dict[tuple[str, float], float] = {}
+        for row in rows:
+            self.add(row, number_of_elements)
+
+    @staticmethod
+    def key(row: ScheduleRow, number_of_elements: int = 1) -> BarKey:
+        return BarKey(row.name_element, number_of_elements, row.diameter, row.steel_grade, row.length, row.shape)
+
+    def add(self, row: ScheduleRow, number_of_elements: int = 1) -> BarPosition:
+        """
+        Dodanie pręta, identyczny pręt tego samego elementu o tej samej liczbie sztuk zwiększa liczbę prętów
+        istniejącej pozycji
+        """
+        key = self.key(row, number_of_elements)
+        column = (row.steel_grade, row.diameter)
+        position = self._positions.get(key)
+        if position is None:
+            position = BarPosition(row, number_of_elements)
+            self._grades.setdefault(row.steel_grade, {})[row.diameter] = None
+        else:
+            self._length[column] -= position.total_length
+            position = position._replace(
+                row=position.row._replace(quantity_bar=position.row.quantity_bar + row.quantity_bar))
+        self._positions[key] = position
+        self._length[column] = self._length.get(column, 0) + position.total_length
+        return position
+
+    def extend(self, rows: Iterable[ScheduleRow], number_of_elements: int = 1):
+        for row in rows:
+            self.add(row, number_of_elements)
+
+    def __iter__(self) -> Iterator[BarPosition]:
+        return iter(self._positions.values())
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @property
+    def rows(self) -> list[ScheduleRow]:
+        return [position.row for position in self._positions.values()]
+
+    @property
+    def grades(self) -> dict[str, list[float]]:
+        """średnice prętów wg klasy stali"""
+        return {grade: list(diameters) for grade, diameters in self._grades.items()}
+
+    @property
+    def columns(self) -> list[tuple[str, float]]:
+        """kolumny zestawienia (klasa stali, średnica)"""
+        return [(grade, diameter) for grade, diameters in self._grades.items() for diameter in diameters]
+
+    def total_length(self, steel_grade: str, diameter: float) -> float:
+        """długość prętów wg klasy stali i średnicy [m]"""
+        return self._length.get((steel_grade, diameter), 0)
+
+    def mass(self, steel_grade: str, diameter: float) -> float:
+        """masa prętów wg klasy stali i średnicy [kg]"""
+        return round(self.total_length(steel_grade, diameter) * mass_1m_bar(diameter), 1)
+
+    @property
+    def total_mass(self) -> float:
+        """masa całkowita [kg]"""
+        return sum(self.mass(steel_grade, diameter) for steel_grade, diameter in self.columns)
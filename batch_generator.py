@@ -0,0 +1,192 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Iterable
+
+import validation
+
+# stopień kompresji gzip i zip - szybki zapis przy niewielkiej różnicy rozmiaru względem 9
+COMPRESSLEVEL = 6
+
+
+@dataclass
+class BatchResult:
+    index: int
+    name: str
+    ok: bool
+    seconds: float = 0
+    error: str = None
+    cached: bool = False
+    # zawartość pliku przekazywana do archiwum zip, usuwana po zapisie do archiwum
+    data: bytes = None
+
+
+# pamięć podręczna plików DXF procesu roboczego
+_cache = None
+# format zapisu i kompresja plików procesu roboczego
+_output = ('asc', None)
+
+
+def _init_worker(output_dir: str = None, cache_dir: str = None, fmt: str = 'asc', compression: str = None):
+    """Inicjalizacja procesu roboczego, pliki zapisywane są w output_dir"""
+    global _cache, _output
+    if output_dir is not None:
+        os.chdir(output_dir)
+    if cache_dir is not None:
+        from dxf_cache import DxfCache
+        _cache = DxfCache(cache_dir)
+    else:
+        _cache = None
+    _output = (fmt, compression)
+
+
+def _render(parameters: dict) -> bytes:
+    """Zawartość pliku DXF belki, z pamięci podręcznej lub rysowana"""
+    fmt = _output[0]
+    if _cache is not None:
+        return _cache.read(fmt, **parameters)
+    from beam_generator import new_element
+    return new_element(**parameters, autosave=False).to_bytes(fmt)
+
+
+def _generate(task: tuple[int, dict]) -> BatchResult:
+    """Generowanie jednej belki, błąd nie przerywa całej paczki"""
+    index, parameters = task
+    name = str(parameters.get('name', 'Belka')) if isinstance(parameters, dict) else ''
+    start = time.perf_counter()
+    hits = _cache.stats.hits if _cache is not None else 0
+    fmt, compression = _output
+    data = None
+    try:
+        if compression == 'zip':
+            # archiwum zapisuje proces główny
+            data = _render(parameters)
+        elif compression == 'gzip':
+            filename = f"{name}.dxf.gz"
+            data = _render(parameters)
+            print(f"Zapisuje {filename}")
+            import gzip
+            with gzip.open(filename, 'wb', compresslevel=COMPRESSLEVEL) as file:
+                file.write(data)
+            data = None
+        elif _cache is not None:
+            _cache.generate(fmt, **parameters)
+        else:
+            # import ezdxf dopiero przy rysowaniu - szybkie uruchomienie CLI
+            from beam_generator import new_element
+            new_element(**parameters, autosave=False).save(fmt=fmt)
+    except Exception as error:
+        return BatchResult(index=index, name=name, ok=False, seconds=time.perf_counter() - start,
+                           error=''.join(traceback.format_exception_only(type(error), error)).strip())
+    return BatchResult(index=index, name=name, ok=True, seconds=time.perf_counter() - start,
+                       cached=_cache is not None and _cache.stats.hits > hits, data=data)
+
+
+def _collect(results: Iterable[BatchResult], archive: str = None) -> list[BatchResult]:
+    """Wyniki w kolejności parametrów, archive - zapis plików do archiwum zip na bieżąco, bez plików pośrednich"""
+    if archive is None:
+        return list(results)
+    import zipfile
+    collected, names = [], set()
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=COMPRESSLEVEL) as file:
+        for result in results:
+            if result.ok:
+                # powtórzona nazwa to błąd belki - program rozpakowujący zachowałby tylko jeden z plików
+                if f'{result.name}.dxf' in names:
+                    result.ok = False
+                    result.error = f"duplicate file name '{result.name}.dxf' in archive"
+                else:
+                    names.add(f'{result.name}.dxf')
+                    file.writestr(f'{result.name}.dxf', result.data)
+                result.data = None
+            collected.append(result)
+    print(f"Zapisuje {archive}, belek: {sum(result.ok for result in collected)}")
+    return collected
+
+
+def generate_batch(parameters: list[dict], workers: int = None, output_dir: str = None,
+                   chunksize: int = None, cache_dir: str = None, fmt: str = 'asc', compression: str = None,
+                   archive: str = None) -> list[BatchResult]:
+    """
+    Generowanie wielu belek w puli procesów
+    workers - liczba procesów, default=os.cpu_count(), 1 - bez puli procesów
+    output_dir - katalog zapisu plików, default=katalog bieżący
+    cache_dir - katalog pamięci podręcznej plików DXF (dxf_cache), default=bez pamięci podręcznej
+    fmt - 'asc' lub 'bin' (DXF binarny)
+    compression - 'gzip' (pliki .dxf.gz) lub 'zip' (jedno archiwum), default=bez kompresji
+    archive - plik archiwum zip, default=belki.zip w output_dir
+    Wyniki zwracane są w kolejności parametrów wejściowych.
+    """
+    validation.is_valid_choice(fmt, validation.FORMATS)
+    if compression is not None:
+        validation.is_valid_choice(compression, validation.COMPRESSIONS)
+    if output_dir is not None:
+        output_dir = os.path.abspath(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+    if cache_dir is not None:
+        cache_dir = os.path.abspath(cache_dir)
+    if compression == 'zip':
+        archive = os.path.abspath(archive or os.path.join(output_dir or os.getcwd(), 'belki.zip'))
+    else:
+        archive = None
+    tasks = list(enumerate(parameters))
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) <= 1:
+        cwd = os.getcwd()
+        _init_worker(output_dir, cache_dir, fmt, compression)
+        try:
+            return _collect(map(_generate, tasks), archive)
+        finally:
+            os.chdir(cwd)
+            _init_worker()
+
+    from concurrent.futures import ProcessPoolExecutor
+    if chunksize is None:
+        # kilka paczek na proces - mniejszy narzut IPC przy zachowaniu równego obciążenia
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(output_dir, cache_dir, fmt, compression)) as executor:
+        return _collect(executor.map(_generate, tasks, chunksize=chunksize), archive)
+
+
+def load_parameters(path: str) -> list[dict]:
+    """Wczytanie parametrów belek z pliku .json (lista) lub .jsonl (jedna belka w linii)"""
+    with open(path, encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in file if line.strip()]
+        return json.load(file)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Generowanie wielu belek DXF w puli procesów')
+    parser.add_argument('parameters', help='plik .json (lista parametrów) lub .jsonl')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='liczba procesów, default=liczba rdzeni')
+    parser.add_argument('-o', '--output-dir', default=None, help='katalog zapisu plików .dxf')
+    parser.add_argument('--cache', default=None, help='katalog pamięci podręcznej plików .dxf')
+    parser.add_argument('-f', '--format', choices=validation.FORMATS, default='asc',
+                        help="format DXF: 'asc' - tekstowy, 'bin' - binarny, default=asc")
+    parser.add_argument('--compress', choices=validation.COMPRESSIONS, default=None,
+                        help="'gzip' - pliki .dxf.gz, 'zip' - jedno archiwum, default=bez kompresji")
+    parser.add_argument('--archive', default=None, help='plik archiwum przy --compress zip, default=belki.zip')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = generate_batch(load_parameters(args.parameters), workers=args.workers, output_dir=args.output_dir,
+                             cache_dir=args.cache, fmt=args.format, compression=args.compress,
+                             archive=args.archive)
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"[{result.index}] {result.name}: {result.error}", file=sys.stderr)
+    cached = f", z pamięci podręcznej: {sum(result.cached for result in results)}" if args.cache else ''
+    print(f"{len(results) - len(failed)}/{len(results)} OK{cached}, {time.perf_counter() - start:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
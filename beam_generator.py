@@ -1,35 +1,108 @@
 # Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
 # Copyright (c) 2011-2022, Manfred Moitzi - EZDXF
-import math
-import re
-from typing import Literal
+import importlib
+import io
+import os
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import BinaryIO, Callable, Iterable
+
 import ezdxf
-import ezdxf.math
 from ezdxf import zoom
 from ezdxf.enums import TextEntityAlignment
 
-from LANG.LANG_PL import LANG_PL
-from LANG.LANG_DE import LANG_DE
-from LANG.LANG_ENG import LANG_ENG
+import beam_layout
+# point_position i spacing_between_bars importowane również dla zgodności wstecz
+from beam_layout import (BeamLayout, ContinuousBeamLayout, Dimension, Polyline, Support, point_position,  # noqa: F401
+                         spacing_between_bars)
+import validation
+from bar_registry import BarRegistry
+
+# moduły opisów w katalogu LANG, ładowany jest tylko wybrany język
+LANGUAGES = {'pl': 'LANG_PL', 'eng': 'LANG_ENG', 'de': 'LANG_DE'}
+
+
+@dataclass
+class BuildMetrics:
+    """Pomiar rysowania i zapisu jednej belki, przekazywany obserwatorom"""
+    name: str
+    # etap - czas [s]: setup, layout, części rysunku z DxfElement.parts(), zoom_extents, output
+    phases: dict[str, float] = field(default_factory=dict)
+    # liczba encji w modelu wg typu, warstwy i części rysunku
+    entities_by_type: dict[str, int] = field(default_factory=dict)
+    entities_by_layer: dict[str, int] = field(default_factory=dict)
+    entities_by_part: dict[str, int] = field(default_factory=dict)
+    output_size: int = None
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.phases.values())
+
+    @property
+    def entities(self) -> int:
+        return sum(self.entities_by_type.values())
+
+    @property
+    def dimensions(self) -> int:
+        return self.entities_by_type.get('DIMENSION', 0)
+
+    @property
+    def hatches(self) -> int:
+        return self.entities_by_type.get('HATCH', 0)
+
+
+# obserwatorzy wszystkich belek - wywoływani z BuildMetrics po każdym zapisie rysunku
+_observers: list[Callable[[BuildMetrics], None]] = []
+
+
+def add_observer(observer: Callable[[BuildMetrics], None]):
+    """Dodanie obserwatora wszystkich belek, np. logger.info"""
+    _observers.append(observer)
+
+
+def remove_observer(observer: Callable[[BuildMetrics], None]):
+    _observers.remove(observer)
+
+
+class _CountingStream(io.RawIOBase):
+    """Strumień zliczający bajty zapisywane do strumienia docelowego"""
 
+    def __init__(self, stream: BinaryIO):
+        super().__init__()
+        self.stream = stream
+        self.size = 0
 
-def point_position(x0: float, y0: float, distance: float, theta: float = 60) -> tuple[float, float]:
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.stream.write(data)
+        self.size += len(data)
+        return len(data)
+
+
+@lru_cache(maxsize=None)
+def standard_linetypes(measurement: int = 1) -> dict[str, tuple[str, list[float]]]:
     """
-    theta zgodna z ruchem wskazowek zegara. godzina 12:00 to 0st, 3:00 to 90st, 6:00 to 180st, 9:00 to 270st
+    Definicje standardowych typów linii ezdxf, liczone raz na proces.
+    measurement - 1 jednostki metryczne (skala ISO), 0 - calowe
     """
-    theta_rad = math.pi / 2 - math.radians(theta)
-    return x0 + distance * math.cos(theta_rad), y0 + distance * math.sin(theta_rad)
+    from ezdxf.tools.standards import ISO_LTYPE_FACTOR, linetypes
+    return {name: (description, pattern)
+            for name, description, pattern in linetypes(scale=ISO_LTYPE_FACTOR if measurement else 1.0)}
 
 
 def tuple_dest(tuple_start: tuple[float, float], width: float = 0, height: float = 0) -> tuple[float, float]:
     return tuple_start[0] + width, tuple_start[1] + height
 
 
-def spacing_between_bars(diameter: float, diameter_aggregate: float = 16) -> float:
-    return math.ceil(max(diameter, 20, diameter_aggregate + 5)) + diameter
-
-
 class DxfElement:
+    # model belki odtwarzany z parametrów przy update()
+    layout_class = BeamLayout
+    # zmiana tych parametrów w update() rysuje belkę od nowa
+    redraw_parameters = frozenset({'name', 'dxfversion'})
+
     def __init__(self,
                  beam_span: float,
                  beam_height: float,
@@ -60,7 +133,23 @@ class DxfElement:
                  dxfversion: str = 'R2010',
                  start_point_x: float = 0,
                  start_point_y: float = 0,
-                 language: str = 'pl'):
+                 language: str = 'pl',
+                 stirrup_style: str = 'polyline',
+                 bar_symbol: str = 'hatch',
+                 explode_blocks: bool = True,
+                 views: Iterable[str] = None,
+                 autosave: bool = True,
+                 observers: Iterable[Callable[[BuildMetrics], None]] = ()):
+        # parametry belki - do update()
+        self.parameters = {key: value for key, value in locals().items()
+                           if key not in ('self', 'autosave', 'observers')}
+        start = time.perf_counter()
+        # False - rysunek tylko w pamięci, zapis przez save(), write() lub to_bytes()
+        self.autosave = self._is_valid_flag(autosave)
+        # obserwatorzy tej belki, wywoływani z BuildMetrics po każdym zapisie rysunku
+        self.observers = list(observers)
+        # czasy etapów ostatniego rysowania [s]
+        self.timings = {}
 
         self.first_row_stirrup_spacing_right = self._is_valid_value(first_row_stirrup_spacing_right, 0, 400)
         self.first_row_stirrup_spacing_left = self._is_valid_value(first_row_stirrup_spacing_left, 0, 400)
@@ -91,12 +180,40 @@ class DxfElement:
                                                    first_row_stirrup_range_right, 300, 15000)
         self.beam_height = self._is_valid_value(beam_height, 100, 1500)
         self.language = self._is_valid_path_name(language)
+        # 'polyline' - każde strzemię w widoku osobno, 'block' - odcinki o stałym rozstawie jako jeden blok (MINSERT)
+        self.stirrup_style = self._is_valid_choice(stirrup_style, validation.CHOICES['stirrup_style'])
+        # pręty w przekroju: 'hatch' - okrąg i kreskowanie dla każdego pręta, 'block' - wstawienie bloku pręta,
+        # 'multipath' - jedno kreskowanie dla wszystkich prętów warstwy
+        self.bar_symbol = self._is_valid_choice(bar_symbol, validation.CHOICES['bar_symbol'])
+        # False - opisy prętów i znaczniki wstawiane bezpośrednio jako bloki z atrybutami, bez bloków anonimowych
+        self.explode_blocks = self._is_valid_flag(explode_blocks)
+        # rysowane widoki (validation.VIEWS) lub pojedyncze części rysunku, None - cały rysunek
+        self.views = validation.is_valid_views(views)
+        self.secondary_stirrup_spacing = self._is_valid_value(secondary_stirrup_spacing, 5, 400)
+
+        # cała geometria liczona jest w modelu, DxfElement zajmuje się tylko rysowaniem
+        self.layout = BeamLayout(
+            beam_span=self.beam_span, beam_height=self.beam_height, beam_width=self.beam_width,
+            width_support_left=self.width_support_left, width_support_right=self.width_support_right,
+            diameter_main_top=self.diameter_main_top, quantity_main_top=self.quantity_main_top,
+            steel_grade_main_top=self.steel_grade_main_top, diameter_main_bottom=self.diameter_main_bottom,
+            quantity_main_bottom=self.quantity_main_bottom, steel_grade_main_bottom=self.steel_grade_main_bottom,
+            diameter_stirrup=self.diameter_stirrup, steel_grade_stirrup=self.steel_grade_stirrup,
+            cover_view_left=self.cover_view_left, cover_view_right=self.cover_view_right,
+            cover_bottom=self.cover_bottom, cover_top=self.cover_top, cover_left=self.cover_left,
+            cover_right=self.cover_right, first_row_stirrup_range_left=self.first_row_stirrup_range_left,
+            first_row_stirrup_range_right=self.first_row_stirrup_range_right,
+            first_row_stirrup_spacing_left=self.first_row_stirrup_spacing_left,
+            first_row_stirrup_spacing_right=self.first_row_stirrup_spacing_right,
+            secondary_stirrup_spacing=self.secondary_stirrup_spacing, number_of_elements=self.number_of_elements,
+            name=self.name, start_point_x=self.start_point_x, start_point_y=self.start_point_y)
+        self._is_valid_section(self.layout)
+        self.position = self.layout.position
+        self.dxfversion = dxfversion
+        self._new_drawing(start)
 
-        self.secondary_stirrup_spacing = math.floor(
-            min(0.75 * self.beam_height * 0.9, self._is_valid_value(secondary_stirrup_spacing, 0, 400)) / 5) * 5
-        self.dimension_points = [0.0, float(self.beam_span)]
-        self.number_of_stirrups_of_the_second_row = None
-
+    def _new_drawing(self, start: float):
+        """Nowy rysunek: warstwy, style i bloki, rysowanie części i zapis przy autosave"""
         self.counter = None
         self.bar = None
         self.stirrup = None
@@ -106,71 +223,166 @@ class DxfElement:
         self.dim_name = None
         self.dim_name_bar = None
         self.text = None
-        self.steel_bill = []
-        self.count_stirrups = 0
-        self.position = {}
 
-        self.dxfversion = dxfversion
         self.language_choice()
-        self.drawing = ezdxf.new(dxfversion=self.dxfversion, setup=["linetypes"])
+        # tylko typy linii używane przez warstwy, zamiast pełnego zestawu setup=["linetypes"]
+        self.drawing = ezdxf.new(dxfversion=self.dxfversion)
         self.initial_drawing()
         self.layer_element()
-        self._start_points(start_y=-2*self.beam_height)
         self.msp = self.drawing.modelspace()
-        self.beam_outline()
-        self.view_top_bar(quantity_bar=int(self.quantity_main_top), steel_grade=self.steel_grade_main_top)
-        self.view_top_bar(quantity_bar=int(self.quantity_main_top), steel_grade=self.steel_grade_main_top, dimension=True)
-        self.view_bottom_bar(quantity_bar=int(self.quantity_main_bottom), steel_grade=self.steel_grade_main_bottom)
-        self.view_bottom_bar(quantity_bar=int(self.quantity_main_bottom), steel_grade=self.steel_grade_main_bottom, dimension=True)
-        self._secondary_stirrup_spacing_min()
-        self.layout_new()
-        self.stirrup_spacing()
-        self.dimension_main()
-        self.dimension_stirrup()
-        self.beam_section_rectangular()
-        self.view_stirrups_type_2()
-        self.create_table(steel_bill=self.steel_bill)
-        self.generate_block()
-        self.save()
+        # części rysunku: dane modelu, z których powstały, i uchwyty ich encji
+        self.groups = {}
+        self.timings['setup'] = time.perf_counter() - start
+        self.render()
+        if self.autosave:
+            self.save()
+
+    def parts(self) -> dict[str, tuple]:
+        """
+        Części rysunku wybranych widoków w kolejności rysowania: nazwa - (metoda rysująca, dane modelu użyte
+        przez metodę). Część rysowana jest ponownie tylko wtedy, gdy zmieniły się jej dane.
+        Dane modelu liczone są tylko dla wybranych części.
+        """
+        selected = validation.selected_parts(self.views)
+        return {name: (draw, data()) for name, (draw, data) in self._parts().items() if name in selected}
+
+    def _parts(self) -> dict[str, tuple]:
+        """Wszystkie części rysunku: nazwa - (metoda rysująca, funkcja zwracająca dane modelu)"""
+        layout = self.layout
+        return {
+            'outline': (self.beam_outline, lambda: (layout.outline, layout.supports, layout.section_markers,
+                                                    self.explode_blocks)),
+            'top_bar': (self.view_top_bar, lambda: layout.top_bar),
+            'top_bar_detail': (lambda: self.view_top_bar(dimension=True),
+                               lambda: (layout.top_bar_detail, layout.dimensions_top_bar)),
+            'bottom_bar': (self.view_bottom_bar, lambda: layout.bottom_bar),
+            'bottom_bar_detail': (lambda: self.view_bottom_bar(dimension=True),
+                                  lambda: (layout.bottom_bar_detail, layout.dimensions_bottom_bar)),
+            'paper_space': (self.layout_new, lambda: self.name),
+            'stirrups': (self.stirrup_spacing,
+                         lambda: (self.stirrup_style, layout.stirrup_lines, layout.stirrup_runs)),
+            'dimension_main': (self.dimension_main, lambda: layout.dimensions_main),
+            'dimension_stirrup': (self.dimension_stirrup, lambda: layout.dimensions_stirrup),
+            'section': (self.beam_section_rectangular, lambda: (layout.section, layout.stirrup_section,
+                                                                layout.dimensions_section, self.diameter_main_top,
+                                                                self.diameter_main_bottom, self.bar_symbol)),
+            'stirrup_shape': (self.view_stirrups_type_2,
+                              lambda: (layout.stirrup_shape, layout.dimensions_stirrup_shape)),
+            'table': (lambda: self.create_table(steel_bill=self.steel_bill),
+                      lambda: (layout.schedule, self.number_of_elements, self.language)),
+            'labels': (self.generate_block, lambda: (layout.schedule, self.explode_blocks)),
+        }
+
+    @property
+    def steel_bill(self) -> list:
+        """wiersze zestawienia stali, liczone dopiero przy rysowaniu tabeli lub opisów"""
+        return list(self.layout.schedule)
+
+    def render(self) -> list[str]:
+        """Rysowanie części rysunku, których dane zmieniły się od poprzedniego rysowania. Zwraca nazwy części"""
+        rendered = []
+        start = time.perf_counter()
+        # dane modelu liczone są przy pierwszym odczycie
+        parts = self.parts()
+        self.timings['layout'] = time.perf_counter() - start
+        # części usunięte z wybranych widoków
+        for name in [name for name in self.groups if name not in parts]:
+            self._delete(self.groups.pop(name)[1])
+            if name == 'paper_space' and self.name in self.drawing.layouts:
+                self.drawing.layouts.delete(self.name)
+        for name, (draw, data) in parts.items():
+            group = self.groups.get(name)
+            if group is not None:
+                if group[0] == data:
+                    continue
+                self._delete(group[1])
+            start = time.perf_counter()
+            first = len(self.msp)
+            draw()
+            self.groups[name] = (data, [entity.dxf.handle for entity in self.msp[first:]])
+            self.timings[name] = time.perf_counter() - start
+            rendered.append(name)
+        return rendered
+
+    def _delete(self, handles: list[str]):
+        for handle in handles:
+            entity = self.drawing.entitydb.get(handle)
+            if entity is not None and entity.is_alive:
+                self.msp.delete_entity(entity)
+
+    def update(self, save: bool = None, **changes) -> list[str]:
+        """
+        Zmiana parametrów narysowanej belki - ponownie rysowane są tylko części, których dane się zmieniły,
+        zmiana nazwy lub wersji dxf rysuje belkę od nowa. Zwraca nazwy narysowanych części.
+        save - zapis pliku po zmianie, False - np. przy kilku zmianach pod rząd, domyślnie jak autosave
+        """
+        if save is None:
+            save = self.autosave
+        parameters = {**self.parameters, **changes}
+        if changes.keys() & self.redraw_parameters:
+            autosave = self.autosave
+            self.__init__(**parameters, autosave=False, observers=self.observers)
+            self.autosave = autosave
+            if save:
+                self.save()
+            return list(self.groups)
+
+        start = time.perf_counter()
+        self.timings = {}
+        errors = validation.validate(parameters)
+        if errors:
+            raise ValueError('; '.join(errors))
+        layout = self._is_valid_section(self.layout_class.from_parameters(parameters))
+        self.parameters = parameters
+        for key, value in changes.items():
+            setattr(self, key, value)
+        self.layout = layout
+        self.position = self.layout.position
+        self.language_choice()
+        self.timings['setup'] = time.perf_counter() - start
+
+        rendered = self.render()
+        if save:
+            self.save()
+        return rendered
 
     @staticmethod
     def _is_valid_value(value: float, min_value: float = 0, max_value: float = 99999):
-        if type(value) != int or value < min_value or value > max_value:
-            raise ValueError(f"{value} max is {max_value}[m]")
-        return value
+        return validation.is_valid_value(value, min_value, max_value)
 
     @staticmethod
     def _is_valid_value_beam(value: float, range_left: float, range_right: float, min_value: float = 0,
                              max_value: float = 99999) -> float or ValueError:
-        if type(value) != int or value <= min_value or value > max_value or value - range_left - range_right < 0:
-            raise ValueError(f"{value} max is {max_value}[m]")
-        return value
+        return validation.is_valid_value_beam(value, range_left, range_right, min_value, max_value)
 
     @staticmethod
     def _is_valid_path_name(name: str) -> str or ValueError:
-        """todo: poprawić regex, bo wywala błąd"""
-        # regex = "^(?:[^/]*(?:/(?:/[^/]*/?)?)?([^?]+)(?:\??.+)?)$"
-        regex = "/\\:*?\"<>|"
-        if not re.match(regex, name) or name.__len__() > 20:
-            raise ValueError("name is not regular expression for os")
-        return name
+        return validation.is_valid_path_name(name)
+
+    @staticmethod
+    def _is_valid_choice(value: str, choices: tuple) -> str or ValueError:
+        return validation.is_valid_choice(value, choices)
+
+    @staticmethod
+    def _is_valid_flag(value: bool) -> bool or ValueError:
+        return validation.is_valid_flag(value)
+
+    @staticmethod
+    def _is_valid_section(layout: BeamLayout) -> BeamLayout or ValueError:
+        """Pręty muszą mieścić się w przekroju - inaczej rysunek przekroju byłby błędny"""
+        errors = layout.bar_placement.errors()
+        if errors:
+            raise ValueError('; '.join(errors))
+        return layout
 
     @staticmethod
     def bar_bending(diameter: float) -> float:
         """Obliczanie wygięcia pręta związanego ze średnicą pręta"""
-        if diameter <= 16:
-            return diameter * 2.5
-        else:
-            return diameter * 4.0
+        return beam_layout.bar_bending(diameter)
 
     @staticmethod
     def mass_1m_bar(diameter: float, mass: float = 7850) -> float:
-        return round(mass * math.pi * ((diameter / 2) / 1000) ** 2, 3)
-
-    def _secondary_stirrup_spacing_min(self) -> float:
-        self.secondary_stirrup_spacing = math.floor(
-            min(self.secondary_stirrup_spacing, 400, int(self.beam_height * 0.75)) / 5) * 5
-        return self.secondary_stirrup_spacing
+        return beam_layout.mass_1m_bar(diameter, mass)
 
     def initial_drawing(self, LTSCALE: int = 50, INSUNITS: int = 4, MEASUREMENT: int = 1):
         """
@@ -184,15 +396,10 @@ class DxfElement:
         return self.drawing
 
     def language_choice(self):
+        """Wybór języka opisów, nieznany język - angielski"""
         global LANG
-        if self.language == 'pl':
-            LANG = LANG_PL
-        elif self.language == 'eng':
-            LANG = LANG_ENG
-        elif self.language == 'de':
-            LANG = LANG_DE
-        else:
-            LANG = LANG_ENG
+        module_name = LANGUAGES.get(self.language, 'LANG_ENG')
+        LANG = getattr(importlib.import_module(f'LANG.{module_name}'), module_name)
 
     def layer_element(self,                      counter: str = 'KONEC-Obrys', color_counter: int = 3,
                       bar: str = 'KONEC-Prety', color_bar: int = 1,
@@ -219,7 +426,7 @@ class DxfElement:
         self.drawing.layers.new(stirrup, dxfattribs={'color': color_stirrup})
         self.drawing.layers.new(hatch, dxfattribs={'color': color_hatch})
         self.drawing.layers.new(dimension, dxfattribs={'color': color_dimension})
-        self.drawing.layers.new(hidden, dxfattribs={'color': color_hidden, 'linetype': 'DASHED'})
+        self.drawing.layers.new(hidden, dxfattribs={'color': color_hidden, 'linetype': self._linetype('DASHED')})
         self.drawing.styles.new(text, dxfattribs={'font': font_text})
         self.drawing.dimstyles.new(dim_name,
                                    dxfattribs={'dimjust': 0, 'dimscale': dim_scale, 'dimblk': 'OBLIQUE',
@@ -234,249 +441,138 @@ class DxfElement:
         self._create_block_marker_left()
         self._create_block_marker_section()
 
-    def _start_points(self, start_x: float = None, start_y: float = None):
-        if start_x is None:
-            start_x = self.start_point_x
-        if start_y is None:
-            start_y = self.start_point_y
-
-        beam = self.width_support_left + self.beam_span + self.width_support_right
-
-        # main beam
-        self.position['main_beam'] = (start_x, start_y)
-        # top bar dimension
-        self.position['main_bar_top'] = (start_x, start_y - self.beam_height - 800)
-        # bottom bar dimension
-        self.position['main_bar_bottom'] = (start_x, start_y - self.beam_height - 950)
-        # section
-        self.position['section'] = (start_x + beam + 500, start_y)
-        # stirrup
-        self.position['stirrup'] = (start_x + beam + 500 + self.beam_width + 400, start_y)
-        # bending_schedule
-        self.position['bending_schedule'] = (start_x + beam + 300, start_y - 300)
-
-    def save(self):
-        """Zapisywanie do pliku"""
-        zoom.extents(self.msp, factor=1.1)
-        print(f"Zapisuje {self.name}.dxf")
-        self.drawing.saveas(f'{self.name}.dxf')
-
-    def bar_bulge(self, diameter):
-        """funkcja potrzebna aby wyliczyć promień łuku dla wyoblenia"""
-        bulge = self.bar_bending(diameter)
-        math_bulge = ezdxf.math.arc_to_bulge((bulge, 0), math.pi, math.pi / 2, bulge)
-        return -1 / math_bulge[2]
+    def _linetype(self, name: str) -> str:
+        """Dodanie standardowego typu linii do rysunku, jeżeli jeszcze nie istnieje"""
+        if name not in self.drawing.linetypes:
+            description, pattern = standard_linetypes(self.drawing.header.get('$MEASUREMENT', 1))[name]
+            self.drawing.linetypes.new(name, dxfattribs={'description': description, 'pattern': pattern})
+        return name
+
+    def zoom_extents(self, factor: float = 1.1):
+        """
+        Widok rysunku po otwarciu - cała belka.
+        Zasięg pełnego rysunku znany jest z modelu belki, encje przeglądane są tylko przy wybranych widokach.
+        """
+        start = time.perf_counter()
+        if self.views is None:
+            (x_min, y_min), (x_max, y_max) = self.layout.extents
+            zoom.center(self.msp, ((x_min + x_max) / 2, (y_min + y_max) / 2),
+                        ((x_max - x_min) * factor, (y_max - y_min) * factor))
+        else:
+            zoom.extents(self.msp, factor=factor)
+        self.timings['zoom_extents'] = time.perf_counter() - start
+
+    def save(self, filename: str = None, fmt: str = 'asc'):
+        """Zapisywanie do pliku, domyślnie {name}.dxf w katalogu bieżącym, fmt - 'asc' lub 'bin' (DXF binarny)"""
+        self._is_valid_choice(fmt, validation.FORMATS)
+        if filename is None:
+            filename = f'{self.name}.dxf'
+        self.zoom_extents()
+        print(f"Zapisuje {filename}")
+        start = time.perf_counter()
+        self.drawing.saveas(filename, fmt=fmt)
+        self.timings['output'] = time.perf_counter() - start
+        self._notify(os.path.getsize(filename))
+
+    def write(self, stream: BinaryIO, fmt: str = 'asc'):
+        """
+        Zapis rysunku do strumienia binarnego (plik, BytesIO, archiwum zip, gzip, odpowiedź HTTP), bez pliku na dysku.
+        fmt - 'asc' lub 'bin' (DXF binarny)
+        """
+        self._is_valid_choice(fmt, validation.FORMATS)
+        self.zoom_extents()
+        start = time.perf_counter()
+        counter = _CountingStream(stream)
+        if fmt == 'bin':
+            self.drawing.write(counter, fmt='bin')
+        else:
+            # kodowanie jak przy zapisie pliku przez ezdxf, strumień nie jest zamykany
+            text = io.TextIOWrapper(counter, encoding=self.drawing.output_encoding, errors='dxfreplace')
+            try:
+                self.drawing.write(text)
+                text.flush()
+            finally:
+                text.detach()
+        self.timings['output'] = time.perf_counter() - start
+        self._notify(counter.size)
+
+    def to_bytes(self, fmt: str = 'asc') -> bytes:
+        """Zawartość pliku DXF"""
+        stream = io.BytesIO()
+        self.write(stream, fmt)
+        return stream.getvalue()
+
+    def metrics(self, output_size: int = None) -> BuildMetrics:
+        """Czasy etapów ostatniego rysowania i liczba encji w modelu"""
+        by_type, by_layer = {}, {}
+        for entity in self.msp:
+            by_type[entity.dxftype()] = by_type.get(entity.dxftype(), 0) + 1
+            by_layer[entity.dxf.layer] = by_layer.get(entity.dxf.layer, 0) + 1
+        return BuildMetrics(name=self.name, phases=dict(self.timings), entities_by_type=by_type,
+                            entities_by_layer=by_layer,
+                            entities_by_part={name: len(handles) for name, (_, handles) in self.groups.items()},
+                            output_size=output_size)
+
+    def _notify(self, output_size: int = None):
+        """Przekazanie pomiaru obserwatorom, bez obserwatorów encje nie są zliczane"""
+        observers = [*_observers, *self.observers]
+        if not observers:
+            return
+        metrics = self.metrics(output_size)
+        for observer in observers:
+            observer(metrics)
+
+    def add_polyline(self, polyline: Polyline):
+        """rysowanie polilinii z modelu, warstwa podana jest jako nazwa atrybutu np. 'bar'"""
+        return self.msp.add_lwpolyline(polyline.points,
+                                       dxfattribs={'closed': polyline.closed, 'layer': getattr(self, polyline.layer)})
+
+    def add_dimension(self, dimension: Dimension):
+        return self.dimension_generator(dimension.base, dimension.p1, dimension.p2, angle=dimension.angle,
+                                        text=dimension.text,
+                                        dimstyle=self.dim_name_bar if dimension.style == 'bar' else self.dim_name)
 
     def beam_outline(self):
         """generowanie obrysu belki"""
-        start_point_x, start_point_y = self.position['main_beam']
-        points = [(start_point_x, start_point_y),
-                  (start_point_x + self.width_support_left, start_point_y),
-                  ((start_point_x + self.width_support_left + self.beam_span), start_point_y),
-                  ((start_point_x + self.width_support_left + self.beam_span + self.width_support_right),
-                   start_point_y),
-                  ((start_point_x + self.width_support_left + self.beam_span + self.width_support_right),
-                   start_point_y + self.beam_height),
-                  (start_point_x, start_point_y + self.beam_height)]
-        self.msp.add_lwpolyline(points, dxfattribs={'closed': True, 'layer': self.counter})
+        self.add_polyline(self.layout.outline)
 
-        self.supports(start_point_x, start_point_x + self.width_support_left)
-        self.supports(start_point_x + self.width_support_left + self.beam_span,
-                      start_point_x + self.width_support_left + self.beam_span + self.width_support_right)
-
-        self.generate_marker_section(
-            (start_point_x + self.width_support_left + self.beam_span / 2, start_point_y + self.beam_height + 300), 'a')
-        self.generate_marker_section(
-            (start_point_x + self.width_support_left + self.beam_span / 2, start_point_y - 500), 'a')
-
-    def length_bar(self, points: list, diameter: float, angle: int = 90) -> float:
-        """angle jest to kąt pod jakim zmieniają się proste"""
-        arc_radius = self.bar_bending(diameter)
-        total_length_bar = 0
-        for i in range(len(points) - 1):
-            if len(points[i]) == 5:
-                total_length_bar += 2 * (angle / 360) * math.pi * arc_radius
-                continue
-            total_length_bar += ((points[i][0] - points[i + 1][0]) ** 2 + (points[i][1] - points[i + 1][1]) ** 2) ** 0.5
-        return round(total_length_bar)
-
-    def list_bar(self, points: tuple[float, float], diameter: float = None, quantity_bar: int = None,
-                 length: float = None, steel_grade: str = None,
-                 name: str = None):
-        self.steel_bill = [dict(t) for t in {tuple(d.items()) for d in self.steel_bill}]
-
-        bar = {
-            'name_element': self.name if name is None else self._is_valid_path_name(name),
-            'number': len(self.steel_bill) + 1,
-            'diameter': diameter,
-            'quantity_bar': quantity_bar,
-            'length': length,
-            'steel_grade': steel_grade,
-            'points_generate': points,
-        }
-        # todo: można dodać sortowanie po 'name_element' potem po 'number'
-        self.steel_bill.append(bar)
-        self.steel_bill.sort(key=(lambda x: x['number']))
+        for support in self.layout.supports:
+            self.supports(support)
 
-    def view_top_bar(self, quantity_bar: int, steel_grade: str, dimension: bool = False, start_point_x: float = None,
-                     start_point_y: float = None):
-        """generowanie pręta górnego"""
+        for marker in self.layout.section_markers:
+            self.generate_marker_section(marker.position, marker.text)
 
-        if start_point_x is None:
-            start_point_x = self.position['main_bar_top'][0] if dimension else self.position['main_beam'][0]
-        if start_point_y is None:
-            start_point_y = self.position['main_bar_top'][1] if dimension else self.position['main_beam'][1]
-
-        bugle = self.bar_bulge(self.diameter_main_top)
-        bending = self.bar_bending(self.diameter_main_top)
-        points = [((start_point_x + self.cover_view_left + 0.5 * self.diameter_main_top),
-                   start_point_y + self.cover_bottom, self.diameter_main_top,
-                   self.diameter_main_top),
-                  ((start_point_x + self.cover_view_left + 0.5 * self.diameter_main_top),
-                   (
-                           start_point_y + self.beam_height - self.cover_top - self.diameter_stirrup - 0.5 * self.diameter_main_top - bending),
-                   self.diameter_main_top, self.diameter_main_top, bugle),
-                  ((start_point_x + self.cover_view_left + 0.5 * self.diameter_main_top + bending),
-                   (
-                           start_point_y + self.beam_height - self.cover_top - self.diameter_stirrup - 0.5 * self.diameter_main_top),
-                   self.diameter_main_top,
-                   self.diameter_main_top),
-                  ((
-                           start_point_x + self.width_support_left + self.beam_span + self.width_support_right - self.cover_view_right - 0.5 * self.diameter_main_top - bending),
-                   (
-                           start_point_y + self.beam_height - self.cover_top - self.diameter_stirrup - 0.5 * self.diameter_main_top),
-                   self.diameter_main_top,
-                   self.diameter_main_top, bugle),
-                  ((
-                           start_point_x + self.width_support_left + self.beam_span + self.width_support_right - self.cover_view_right - 0.5 * self.diameter_main_top),
-                   (
-                           start_point_y + self.beam_height - self.cover_top - self.diameter_stirrup - 0.5 * self.diameter_main_top - bending),
-                   self.diameter_main_top, self.diameter_main_top),
-                  ((
-                           start_point_x + self.width_support_left + self.beam_span + self.width_support_right - self.cover_view_right - 0.5 * self.diameter_main_top),
-                   start_point_y + self.cover_bottom)]
-        self.msp.add_lwpolyline(points, dxfattribs={'closed': False, 'layer': self.bar})
-
-        length_bar = self.length_bar(points=points, diameter=self.diameter_main_top)
+    def view_top_bar(self, dimension: bool = False):
+        """generowanie pręta górnego"""
+        self.add_polyline(self.layout.top_bar_detail if dimension else self.layout.top_bar)
 
         if dimension:
-            self.list_bar(diameter=self.diameter_main_top, quantity_bar=quantity_bar, length=length_bar,
-                          steel_grade=steel_grade,
-                          points=(points[0][0] + (points[-1][0] - points[0][0]) / 2, points[3][1]))
-            half = 0.5 * self.diameter_main_top
-            self.dimension_generator(
-                (points[0][0] - 25, points[0][1]), points[0][:2], (points[2][0], points[2][1] + half), angle=90,
-                dimstyle=self.dim_name_bar
-            )
-            self.dimension_generator(
-                (points[3][0], points[3][1] - 100), (points[1][0] - half, points[1][1]),
-                (points[4][0] + half, points[4][1]), dimstyle=self.dim_name_bar
-            )
-            self.dimension_generator(
-                (points[5][0] + 100, points[5][1]), (points[3][0], points[3][1] + half), points[5][:2], angle=90,
-                dimstyle=self.dim_name_bar
-            )
+            for i in self.layout.dimensions_top_bar:
+                self.add_dimension(i)
 
-    def view_bottom_bar(self, quantity_bar: int, steel_grade: str, dimension: bool = False, start_point_x: float = None,
-                        start_point_y: float = None):
+    def view_bottom_bar(self, dimension: bool = False):
         """generowanie pręta dolnego"""
-
-        if start_point_x is None:
-            start_point_x = self.position['main_bar_bottom'][0] if dimension else self.position['main_beam'][0]
-        if start_point_y is None:
-            start_point_y = self.position['main_bar_bottom'][1] if dimension else self.position['main_beam'][1]
-
-        points = [((start_point_x + self.cover_view_left),
-                   (start_point_y + self.cover_bottom + self.diameter_stirrup + 0.5 * self.diameter_main_bottom),
-                   self.diameter_main_bottom, self.diameter_main_bottom),
-                  (
-                      start_point_x + self.width_support_left + self.beam_span + self.width_support_right - self.cover_view_right,
-                      (start_point_y + self.cover_bottom + self.diameter_stirrup + 0.5 * self.diameter_main_bottom))]
-        self.msp.add_lwpolyline(points, dxfattribs={'closed': False, 'layer': self.bar})
-
-        length_bar = self.length_bar(points=points, diameter=self.diameter_main_bottom)
+        self.add_polyline(self.layout.bottom_bar_detail if dimension else self.layout.bottom_bar)
 
         if dimension:
-            self.list_bar(diameter=self.diameter_main_bottom, quantity_bar=quantity_bar, length=length_bar,
-                          steel_grade=steel_grade,
-                          points=(points[0][0] + (points[-1][0] - points[0][0]) / 2, points[0][1]))
-            self.dimension_generator(
-                (points[0][0], points[0][1] - 100), points[0][:2], points[1][:2], dimstyle=self.dim_name_bar
-            )
-
-    def distance_from_supports(self, distance: float) -> float:
-        value = 0
-
-        if self.first_row_stirrup_range_left != 0 and self.first_row_stirrup_spacing_left != 0:
-            value += math.ceil(
-                self.first_row_stirrup_range_left / self.first_row_stirrup_spacing_left) * self.first_row_stirrup_spacing_left
-        else:
-            value += 0
-
-        if self.first_row_stirrup_range_right != 0 and self.first_row_stirrup_spacing_right != 0:
-            value += math.ceil(
-                self.first_row_stirrup_range_right / self.first_row_stirrup_spacing_right) * self.first_row_stirrup_spacing_right
-        else:
-            value += 0
-
-        return self.beam_span - (value + math.floor((self.beam_span - value) / distance) * distance)
+            for i in self.layout.dimensions_bottom_bar:
+                self.add_dimension(i)
 
     def stirrup_spacing(self):
         """rozstaw strzemion w belce"""
-        last_stirrup_left: float = 0
-        last_stirrup_right: float = self.beam_span
-        localization_stirrups = []
-        start_point_x, start_point_y = self.position['main_beam']
-        range_first_row = self.distance_from_supports(self.secondary_stirrup_spacing)
-
-        while range_first_row > 60:
-            self.secondary_stirrup_spacing -= 5
-            range_first_row = self.distance_from_supports(self.secondary_stirrup_spacing)
-
-        if self.first_row_stirrup_range_left != 0 and self.first_row_stirrup_spacing_left != 0:
-            for i in range(int(math.ceil(self.first_row_stirrup_range_left / self.first_row_stirrup_spacing_left) + 1)):
-                localization_stirrups.append(range_first_row / 2 + i * self.first_row_stirrup_spacing_left)
-            last_stirrup_left = localization_stirrups[-1]
-            self.dimension_points.append(last_stirrup_left)
-
-        if self.first_row_stirrup_range_right != 0 and self.first_row_stirrup_spacing_right != 0:
-            for i in range(
-                    int(math.ceil(self.first_row_stirrup_range_right / self.first_row_stirrup_spacing_right) + 1)):
-                localization_stirrups.append(
-                    self.beam_span - range_first_row / 2 - i * self.first_row_stirrup_spacing_right)
-            last_stirrup_right = localization_stirrups[-1]
-            self.dimension_points.append(last_stirrup_right)
-
-        self.dimension_points.append(range_first_row / 2)
-        self.dimension_points.append(self.beam_span - range_first_row / 2)
-
-        self.dimension_points = list(dict.fromkeys(self.dimension_points))
-        self.dimension_points.sort()
-
-        for i in range(int((self.beam_span - last_stirrup_left - (
-                (
-                        self.beam_span - last_stirrup_right) if last_stirrup_right > 0 else 0)) / self.secondary_stirrup_spacing) + 1):
-            localization_stirrups.append((
-                                             last_stirrup_left if last_stirrup_left > 0 else range_first_row / 2) + i * self.secondary_stirrup_spacing)
-
-        localization_stirrups = list(dict.fromkeys(localization_stirrups))
-        localization_stirrups.sort()
-
-        self.number_of_stirrups_of_the_second_row = math.ceil(
-            (last_stirrup_right - last_stirrup_left) / self.secondary_stirrup_spacing)
-
-        for i in localization_stirrups:
-            points_stirrups = [
-                (
-                    (start_point_x + self.width_support_left + i), start_point_y + self.cover_bottom,
-                    self.diameter_stirrup,
-                    self.diameter_stirrup),
-                ((start_point_x + self.width_support_left + i), start_point_y + (self.beam_height - self.cover_top))]
-            self.msp.add_lwpolyline(points_stirrups, dxfattribs={'layer': self.stirrup})
-        self.count_stirrups = len(localization_stirrups)
-
-    def supports(self, value_left: float, value_right: float, height: int = 200, hatch_name: str = 'ANSI32'):
-        start_point_x, start_point_y = self.position['main_beam']
+        if self.stirrup_style == 'block':
+            name = self._create_block_stirrup()
+            for run in self.layout.stirrup_runs:
+                insert = self.msp.add_blockref(name, run.position, dxfattribs={'layer': self.stirrup})
+                if run.count > 1:
+                    insert.grid(size=(1, run.count), spacing=(0, run.spacing))
+            return
+
+        for i in self.layout.stirrup_lines:
+            self.add_polyline(i)
+
+    def supports(self, support: Support, hatch_name: str = 'ANSI32'):
+        value_left, value_right, start_point_y, height = support
         hatch = self.msp.add_hatch(dxfattribs={'layer': self.hatch})
         hatch.set_pattern_fill(hatch_name, scale=10, color=-1)
         hatch.paths.add_polyline_path(
@@ -503,389 +599,59 @@ class DxfElement:
                                        dxfattribs={'layer': self.dimension},
                                        text=text)
 
-    def dimension_main(self, height: int = 400):
-        start_point_x, start_point_y = self.position['main_beam']
-        self.dimension_generator(
-            (start_point_x, start_point_y - height),
-            (start_point_x, start_point_y - height),
-            (start_point_x + self.width_support_left, start_point_y - height)
-        )
-
-        self.dimension_generator(
-            (start_point_x, start_point_y - height),
-            (start_point_x + self.width_support_left, start_point_y - height),
-            (start_point_x + self.width_support_left + self.beam_span, start_point_y - height)
-        )
-
-        self.dimension_generator(
-            (start_point_x, start_point_y - height),
-            (start_point_x + self.width_support_left + self.beam_span, start_point_y - height),
-            (start_point_x + self.width_support_left + self.beam_span + self.width_support_right,
-             start_point_y - height)
-        )
-
-        self.dimension_generator(
-            (start_point_x - 200, start_point_y),
-            (start_point_x, start_point_y),
-            (start_point_x, start_point_y + self.beam_height),
-            90
-        )
-
-    def dimension_stirrup(self, height: float = 300):
-        value1, value2, value3, value4, value5, value6 = 0, 0, 0, 0, 0, self.beam_span
-        start_end_dimension: bool = False
-        start_point_x, start_point_y = self.position['main_beam']
-        if len(self.dimension_points) == 2:
-            value3 = 0
-            value4 = self.beam_span
-            self.number_of_stirrups_of_the_second_row += 1
-        elif len(
-                self.dimension_points) == 3 and self.first_row_stirrup_range_left != 0 and self.first_row_stirrup_spacing_left != 0:
-            value3 = 0
-            value4 = self.dimension_points[1]
-            value5 = self.beam_span
-        elif len(
-                self.dimension_points) == 3 and self.first_row_stirrup_range_right != 0 and self.first_row_stirrup_spacing_right != 0:
-            value2 = 0
-            value3 = self.dimension_points[1]
-            value4 = self.beam_span
-        elif len(self.dimension_points) == 4 and (self.dimension_points[1] - self.dimension_points[0]) > 30:
-            value2 = self.dimension_points[0]
-            value3 = self.dimension_points[1]
-            value4 = self.dimension_points[2]
-            value5 = self.dimension_points[3]
-        elif len(self.dimension_points) == 4:
-            value2 = self.dimension_points[1]
-            value3 = self.dimension_points[1]
-            value4 = self.dimension_points[2]
-            value5 = self.dimension_points[2]
-            start_end_dimension = True
-            self.number_of_stirrups_of_the_second_row -= 1
-        elif len(
-                self.dimension_points) == 5 and self.first_row_stirrup_range_left != 0 and self.first_row_stirrup_spacing_left != 0:
-            value2 = self.dimension_points[1]
-            value3 = self.dimension_points[2]
-            value4 = self.dimension_points[3]
-            value5 = self.dimension_points[3]
-            start_end_dimension = True
-            self.number_of_stirrups_of_the_second_row -= 1
-        elif len(
-                self.dimension_points) == 5 and self.first_row_stirrup_range_right != 0 and self.first_row_stirrup_spacing_right != 0:
-            value2 = self.dimension_points[1]
-            value3 = self.dimension_points[1]
-            value4 = self.dimension_points[2]
-            value5 = self.dimension_points[3]
-            start_end_dimension = True
-            self.number_of_stirrups_of_the_second_row -= 1
-        elif len(self.dimension_points) == 6:
-            value2 = self.dimension_points[1]
-            value3 = self.dimension_points[2]
-            value4 = self.dimension_points[3]
-            value5 = self.dimension_points[4]
-            start_end_dimension = True
+    def dimension_main(self):
+        for i in self.layout.dimensions_main:
+            self.add_dimension(i)
+
+    def dimension_stirrup(self):
+        for i in self.layout.dimensions_stirrup:
+            self.add_dimension(i)
+
+    def bar_section(self, diameter: float, point: tuple[tuple[float, float], ...]):
+        if self.bar_symbol == 'block':
+            name = self._create_block_bar_section()
+            for i in point:
+                self.msp.add_blockref(name, i, dxfattribs={'layer': self.bar}).set_scale(diameter)
+        elif self.bar_symbol == 'multipath':
+            hatch = self.msp.add_hatch(color=-1, dxfattribs={"layer": self.hatch})
+            for i in point:
+                self.msp.add_circle(i, diameter / 2, dxfattribs={"layer": self.bar})
+                hatch.paths.add_edge_path().add_arc(i, diameter / 2)
         else:
-            print('error 1. Błąd generatora wymiarowania', self.dimension_points)
-
-        if start_end_dimension:
-            self.dimension_generator(
-                (start_point_x, start_point_y - height),
-                (start_point_x + self.width_support_left + value1, start_point_y - height),
-                (start_point_x + self.width_support_left + value2, start_point_y - height)
-            )
-
-            self.dimension_generator(
-                (start_point_x, start_point_y - height),
-                (start_point_x + self.width_support_left + value5, start_point_y - height),
-                (start_point_x + self.width_support_left + value6, start_point_y - height)
-            )
-
-        if self.first_row_stirrup_range_left != 0 and self.first_row_stirrup_spacing_left != 0:
-            self.dimension_generator(
-                (start_point_x, start_point_y - height),
-                (start_point_x + self.width_support_left + value2,
-                 start_point_y - height),
-                (start_point_x + self.width_support_left + value3,
-                 start_point_y - height),
-                text=f'{math.ceil((value3 - value2) / self.first_row_stirrup_spacing_left)} x {self.first_row_stirrup_spacing_left} = <>'
-            )
-
-        if self.first_row_stirrup_range_right != 0 and self.first_row_stirrup_spacing_right != 0:
-            self.dimension_generator(
-                (start_point_x, start_point_y - height),
-                (start_point_x + self.width_support_left + value5,
-                 start_point_y - height),
-                (start_point_x + self.width_support_left + value4,
-                 start_point_y - height),
-                text=f'{math.ceil((value5 - value4) / self.first_row_stirrup_spacing_right)} x {self.first_row_stirrup_spacing_right} = <>'
-            )
-
-        if self.number_of_stirrups_of_the_second_row != 0:
-            self.dimension_generator(
-                (start_point_x, start_point_y - height),
-                (start_point_x + self.width_support_left + value3,
-                 start_point_y - height),
-                (start_point_x + self.width_support_left + value4,
-                 start_point_y - height),
-                text=f'{math.ceil((value4 - value3) / self.number_of_stirrups_of_the_second_row)} x {self.number_of_stirrups_of_the_second_row} = <>'
-            )
-
-    def bar_section(self, diameter: float, point: list[tuple[float, float]]):
-        for i in point:
-            self.msp.add_circle(i, diameter / 2, dxfattribs={"layer": self.bar})
-            self.msp.add_hatch(color=-1, dxfattribs={"layer": self.hatch}).paths.add_edge_path().add_arc(i,
-                                                                                                         diameter / 2)
-
-    def localization_bar_section(self, localization: Literal['top', 'bottom']) -> list[tuple[float, float]]:
-        start_point_x, start_point_y = self.position['section']
-        bar = {}
-        turn = 1
-        list_points = []
-        center = 0
-        if localization == 'top':
-            bar = self.steel_bill[0]
-            start_point_y += self.beam_height
-            turn = -1
-            center = self.cover_top + self.diameter_stirrup + bar['diameter'] / 2
-        elif localization == 'bottom':
-            bar = self.steel_bill[1]
-            center = self.cover_bottom + self.diameter_stirrup + bar['diameter'] / 2
-
-        bending = self.bar_bending(self.diameter_stirrup)
-        first_bar_horizontal = (
-            self.cover_left + self.diameter_stirrup / 2 + bending,
-            self.beam_width - self.cover_right - self.diameter_stirrup / 2 - bending) \
-            if bending - self.diameter_stirrup / 2 >= bar['diameter'] / 2 \
-            else (
-            self.cover_left + self.diameter_stirrup + bar['diameter'] / 2,
-            self.beam_width - self.cover_right - self.diameter_stirrup - bar['diameter'] / 2)
-
-        value = spacing_between_bars(bar['diameter'])
-
-        count_bar_next_line = 0
-        while (first_bar_horizontal[1] - first_bar_horizontal[0]) / (
-                bar['quantity_bar'] - count_bar_next_line - 1) < value:
-            count_bar_next_line += 1
-
-        spacing_first_line = first_bar_horizontal[1] - first_bar_horizontal[0]
-        first_line = bar['quantity_bar'] - count_bar_next_line
-
-        for i in range(first_line):
-            list_points.append(
-                (start_point_x + first_bar_horizontal[0] + spacing_first_line / (first_line - 1) * i,
-                 start_point_y + turn * center))
-
-        if count_bar_next_line > 0:
-            if count_bar_next_line == 1:
-                list_points.append(
-                    (start_point_x + self.cover_left + self.diameter_stirrup + bar['diameter'] / 2,
-                     start_point_y + turn * (center + value)))
-            else:
-                second_bar_horizontal = (
-                    self.cover_left + self.diameter_stirrup + bar['diameter'] / 2,
-                    self.beam_width - self.cover_left - self.diameter_stirrup - bar['diameter'] / 2
-                )
-                spacing_second_line = second_bar_horizontal[1] - second_bar_horizontal[0]
-                if (second_bar_horizontal[1] - second_bar_horizontal[0]) / (count_bar_next_line if count_bar_next_line == 1 else count_bar_next_line - 1) >= value:
-                    for i in range(count_bar_next_line):
-                        list_points.append((start_point_x + second_bar_horizontal[0] + spacing_second_line / (count_bar_next_line - 1) * i, start_point_y + turn * (center + value)))
-                else:
-                    self.msp.add_text("Nie poprawny rozstaw prętów, zmień przekrój belki lub prętów!!", dxfattribs={'height': 500, 'style': self.text})\
-                        .set_placement((start_point_x + self.beam_span, start_point_y + 2 * self.beam_height), align=TextEntityAlignment.MIDDLE_CENTER)
-
-        return list_points
+            for i in point:
+                self.msp.add_circle(i, diameter / 2, dxfattribs={"layer": self.bar})
+                self.msp.add_hatch(color=-1, dxfattribs={"layer": self.hatch}).paths.add_edge_path().add_arc(
+                    i, diameter / 2)
 
     def beam_section_rectangular(self):
-        start_point_x, start_point_y = self.position['section']
+        section = self.layout.section
 
         self.msp.add_text('A-A', dxfattribs={"height": 5 * 20, 'style': self.text, "layer": self.counter}) \
-            .set_placement((start_point_x + self.beam_height / 2, start_point_y + self.beam_height + 200),
-                           align=TextEntityAlignment.BOTTOM_CENTER)
-
-        points_beam_section = [(start_point_x, start_point_y),
-                               (start_point_x + self.beam_width, start_point_y),
-                               (start_point_x + self.beam_width, start_point_y + self.beam_height),
-                               (start_point_x, start_point_y + self.beam_height)]
-
-        self.msp.add_lwpolyline(points_beam_section, dxfattribs={'closed': True, 'layer': self.counter})
-        self.view_stirrups_type_1(start_point_x, start_point_y)
-
-        self.bar_section(self.diameter_main_bottom, self.localization_bar_section('bottom'))
-        self.bar_section(self.diameter_main_top, self.localization_bar_section('top'))
-        start_for_line = []
-        for value, (x0, y0) in enumerate(self.localization_bar_section('top')):
-            x1 = (x0 + (start_point_y + self.beam_height + 100 - y0) * math.tan(math.pi / 2 - math.radians(60)))
-            if value == 0:
-                start_for_line.append(x1)
-            self.msp.add_lwpolyline(
-                [(x0, y0),
-                 (x1,
-                  (start_point_y + self.beam_height + 100))],
-                dxfattribs={'layer': self.counter})
-        for value, (x0, y0) in enumerate(self.localization_bar_section('bottom')):
-            x1 = (x0 + (y0 - start_point_y + 100) * math.tan(2 * math.pi + math.radians(30)))
-            if value == 0:
-                start_for_line.append(x1)
-            self.msp.add_lwpolyline(
-                [(x0, y0),
-                 (x1,
-                  (start_point_y - 100))
-                 ],
-                dxfattribs={'layer': self.counter})
-        self.msp.add_lwpolyline([(start_for_line[0], start_point_y + self.beam_height + 100),
-                                 ((start_point_x + self.beam_width + 100), (start_point_y + self.beam_height + 100))],
-                                dxfattribs={'layer': self.counter})
-        self.msp.add_lwpolyline([(start_for_line[1], start_point_y - 100),
-                                 ((start_point_x + self.beam_width + 100), (start_point_y - 100))],
-                                dxfattribs={'layer': self.counter})
-        self.msp.add_lwpolyline(
-            [(start_point_x + self.beam_width - self.cover_right, start_point_y + self.beam_height / 2),
-             (start_point_x + self.beam_width + 100, start_point_y + self.beam_height / 2)],
-            dxfattribs={'layer': self.counter})
-        # todo: Poprawić ponieważ powinno samo nadawać nr pręta
-        self.generate_marker_left(((start_point_x + self.beam_width + 100), (start_point_y + self.beam_height + 100)),
-                                  1)
-        self.generate_marker_left(((start_point_x + self.beam_width + 100), (start_point_y - 100)), 2)
-        self.generate_marker_left((start_point_x + self.beam_width + 100, start_point_y + self.beam_height / 2), 3)
+            .set_placement(section.title, align=TextEntityAlignment.BOTTOM_CENTER)
 
-        self.dimension_section()
+        self.add_polyline(section.outline)
+        self.view_stirrups_type_1()
 
-    def dimension_section(self, height: int = 200):
-        start_point_x, start_point_y = self.position['section']
-        self.dimension_generator(
-            (start_point_x, start_point_y - height),
-            (start_point_x, start_point_y - height),
-            (start_point_x + self.beam_width, start_point_y - height)
-        )
+        self.bar_section(self.diameter_main_bottom, section.bars_bottom)
+        self.bar_section(self.diameter_main_top, section.bars_top)
+        for i in section.leaders:
+            self.add_polyline(i)
+        for marker in section.markers:
+            self.generate_marker_left(marker.position, marker.text)
 
-        self.dimension_generator(
-            (start_point_x - height / 4, start_point_y),
-            (start_point_x, start_point_y),
-            (start_point_x, start_point_y + self.beam_height),
-            angle=90
-        )
+        self.dimension_section()
 
-    def view_stirrups_type_1(self, start_point_x: float, start_point_y: float, anchoring_stirrup: float = 80):
-
-        bending_stirrup = self.bar_bending(self.diameter_stirrup)
-        bending_arrow = self.bar_bulge(bending_stirrup)
-
-        points = [
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup - bending_stirrup - anchoring_stirrup,
-             self.diameter_stirrup, self.diameter_stirrup),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup - bending_stirrup,
-             self.diameter_stirrup, self.diameter_stirrup, bending_arrow),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup + bending_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup),
-            (start_point_x + self.beam_width - self.cover_right - 0.5 * self.diameter_stirrup - bending_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup, bending_arrow),
-            (start_point_x + self.beam_width - self.cover_right - 0.5 * self.diameter_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup - bending_stirrup,
-             self.diameter_stirrup, self.diameter_stirrup),
-            (start_point_x + self.beam_width - self.cover_right - 0.5 * self.diameter_stirrup,
-             start_point_y + self.cover_bottom + 0.5 * self.diameter_stirrup + bending_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup, bending_arrow),
-            (start_point_x + self.beam_width - self.cover_right - 0.5 * self.diameter_stirrup - bending_stirrup,
-             start_point_y + self.cover_bottom + 0.5 * self.diameter_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup + bending_stirrup,
-             start_point_y + self.cover_bottom + 0.5 * self.diameter_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup, bending_arrow),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-             start_point_y + self.cover_bottom + 0.5 * self.diameter_stirrup + bending_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup - bending_stirrup,
-             self.diameter_stirrup, self.diameter_stirrup, bending_arrow),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup + bending_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup + bending_stirrup + anchoring_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup, self.diameter_stirrup,
-             self.diameter_stirrup)
-        ]
-        length_bar = self.length_bar(points=points, diameter=self.diameter_stirrup)
-
-        self.list_bar(diameter=self.diameter_stirrup, quantity_bar=self.count_stirrups, length=length_bar,
-                      steel_grade=self.steel_grade_stirrup, points=(0, 0))
-
-        self.msp.add_lwpolyline(points, dxfattribs={'layer': self.bar})
-
-    def view_stirrups_type_2(self, anchoring_stirrup: float = (10 * 8)):
-        bending_stirrup = self.bar_bending(self.diameter_stirrup)
-        start_point_x, start_point_y = self.position['stirrup']
-
-        theta = 60
-
-        point_1 = point_position(start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-                                 start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup,
-                                 self.beam_width - self.diameter_stirrup - self.cover_left - self.cover_right, theta)
-
-        point_2 = point_position(point_1[0], point_1[1], bending_stirrup + anchoring_stirrup, 90 + theta)
-
-        points = [(
-            start_point_x + self.beam_width - self.cover_left - 0.5 * self.diameter_stirrup - bending_stirrup - anchoring_stirrup,
-            start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup,
-            self.diameter_stirrup,
-            self.diameter_stirrup),
-            (start_point_x + self.beam_width - self.cover_left - 0.5 * self.diameter_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup,
-             self.diameter_stirrup,
-             self.diameter_stirrup),
-            (start_point_x + self.beam_width - self.cover_left - 0.5 * self.diameter_stirrup,
-             start_point_y + self.cover_bottom + 0.5 * self.diameter_stirrup,
-             self.diameter_stirrup,
-             self.diameter_stirrup
-             ),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-             start_point_y + self.cover_bottom + 0.5 * self.diameter_stirrup,
-             self.diameter_stirrup,
-             self.diameter_stirrup
-             ),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup,
-             self.diameter_stirrup,
-             self.diameter_stirrup
-             ),
-            (start_point_x + self.cover_left + 0.5 * self.diameter_stirrup,
-             start_point_y + self.beam_height - self.cover_top - 0.5 * self.diameter_stirrup,
-             self.diameter_stirrup,
-             self.diameter_stirrup
-             ),
-            (
-                point_1[0],
-                point_1[1],
-                self.diameter_stirrup,
-                self.diameter_stirrup
-            ),
-            (
-                point_2[0],
-                point_2[1],
-                self.diameter_stirrup,
-                self.diameter_stirrup
-            )
+    def dimension_section(self):
+        for i in self.layout.dimensions_section:
+            self.add_dimension(i)
 
-        ]
+    def view_stirrups_type_1(self):
+        self.add_polyline(self.layout.stirrup_section)
 
-        self.msp.add_lwpolyline(points, dxfattribs={'layer': self.bar})
-
-        self.msp.add_linear_dim((start_point_x, start_point_y - 50),
-                                (start_point_x + self.cover_left, start_point_y + self.cover_bottom), (
-                                    start_point_x + self.beam_width - self.cover_right,
-                                    start_point_y + self.cover_bottom), dimstyle=self.dim_name_bar,
-                                dxfattribs={'layer': self.dimension}, angle=0, text='<>')
-        # dimension left
-        self.msp.add_linear_dim(
-            (start_point_x + self.cover_left - 25, start_point_y),
-            (start_point_x + self.cover_left, start_point_y + self.cover_bottom),
-            (start_point_x + self.cover_left, start_point_y + self.beam_height - self.cover_top),
-            dimstyle=self.dim_name_bar,
-            dxfattribs={'layer': self.dimension}, angle=90, text='<>')
-        self.steel_bill[-1]['points_generate'] = (
-            start_point_x + self.beam_width - self.cover_right + 400, start_point_y + self.beam_height / 2 - 100)
+    def view_stirrups_type_2(self):
+        self.add_polyline(self.layout.stirrup_shape)
+        for i in self.layout.dimensions_stirrup_shape:
+            self.add_dimension(i)
 
     # def generate_cell(self, points: list[tuple[float, float]], scale: int = 20, text: str = "__"):
 
@@ -929,21 +695,12 @@ class DxfElement:
     def create_table(self, steel_bill: list, scale: int = 20):
         start_point_x, start_point_y = self.position['bending_schedule']
 
-        steel_grade = {}
-        for i in steel_bill:
-            value_grade = i['steel_grade']
-            if value_grade not in steel_grade:
-                steel_grade[value_grade] = []
+        registry = BarRegistry(steel_bill, self.number_of_elements)
+        steel_bill = registry.rows
+        steel_grade = registry.grades
+        columns = registry.columns
 
-        for i in steel_bill:
-            value_diameter = i['diameter']
-            value_grade = i['steel_grade']
-            for j in steel_grade:
-                if value_grade == j:
-                    if value_diameter not in steel_grade[value_grade]:
-                        steel_grade[value_grade].append(value_diameter)
-
-        count_column = sum(len(value) for value in steel_grade.values())
+        count_column = len(columns)
         count_row = len(steel_bill)
 
         column_width = [10, 15, 15, 15, 15, 15 * count_column, 20]
@@ -1028,6 +785,10 @@ class DxfElement:
         # array_bending_schedule = count_column * [count_row * [0]]
 
         array_bending_schedule = [['-' for i in range(count_column)] for j in range(count_row)]
+        column_index = {column: index for index, column in enumerate(columns)}
+        for k, position in enumerate(registry):
+            array_bending_schedule[k][column_index[(position.row.steel_grade, position.row.diameter)]] = \
+                position.total_length
         count_count_grade_value = 0
 
         for i in steel_grade:
@@ -1050,11 +811,6 @@ class DxfElement:
                                    height=sum(row_height[4:5]),
                                    text=f'%%c{steel_grade[i][j]}')
 
-                for k in range(len(steel_bill)):
-                    if steel_bill[k]['steel_grade'] == i and steel_bill[k]['diameter'] == steel_grade[i][j]:
-                        array_bending_schedule[k][count_count_grade_value] = round(
-                            steel_bill[k]['length'] / 1000 * steel_bill[k]['quantity_bar'] * self.number_of_elements, 2)
-
                 count_count_grade_value += 1
 
         if column_width[6] > 0:
@@ -1067,7 +823,7 @@ class DxfElement:
 
         elements = []
         for i in steel_bill:
-            value_element = i['name_element']
+            value_element = i.name_element
             if value_element not in elements:
                 elements.append(value_element)
         elements.sort()
@@ -1091,7 +847,7 @@ class DxfElement:
                                                                  5] * j / count_row) * scale),
                                    width=column_width[0],
                                    height=row_height[5] / count_row,
-                                   text=steel_bill[j]['number'])
+                                   text=steel_bill[j].number)
 
                 self.generate_cell(point_top_left=tuple_dest(start_point,
                                                              height=-(sum(row_height[:5]) + row_height[
@@ -1100,7 +856,7 @@ class DxfElement:
 
                                    width=column_width[1],
                                    height=row_height[5] / count_row,
-                                   text=f"%%c {steel_bill[j]['diameter']}")
+                                   text=f"%%c {steel_bill[j].diameter}")
 
                 self.generate_cell(point_top_left=tuple_dest(start_point,
                                                              height=-(sum(row_height[:5]) + row_height[
@@ -1109,7 +865,7 @@ class DxfElement:
 
                                    width=column_width[2],
                                    height=row_height[5] / count_row,
-                                   text=steel_bill[j]['length'])
+                                   text=steel_bill[j].length)
 
                 self.generate_cell(point_top_left=tuple_dest(start_point,
                                                              height=-(sum(row_height[:5]) + row_height[
@@ -1118,7 +874,7 @@ class DxfElement:
 
                                    width=column_width[3],
                                    height=row_height[5] / count_row,
-                                   text=steel_bill[j]['quantity_bar'])
+                                   text=steel_bill[j].quantity_bar)
 
                 self.generate_cell(point_top_left=tuple_dest(start_point,
                                                              height=-(sum(row_height[:5]) + row_height[
@@ -1127,7 +883,7 @@ class DxfElement:
 
                                    width=column_width[4],
                                    height=row_height[5] / count_row,
-                                   text=f"{steel_bill[j]['quantity_bar'] * self.number_of_elements}")
+                                   text=f"{steel_bill[j].quantity_bar * self.number_of_elements}")
 
                 for k in range(count_column):
                     self.generate_cell(point_top_left=tuple_dest(start_point,
@@ -1149,25 +905,10 @@ class DxfElement:
                                        height=row_height[5] / count_row,
                                        text='')
         # footer
-        array_total_mass = [[0 for i in range(count_column)] if j < 3 else [0] for j in range(4)]
-
-        for i in range(len(array_bending_schedule[0])):
-            for j in array_bending_schedule:
-                if type(j[i]) is float:
-                    array_total_mass[0][i] += j[i]
-
-        count_count_grade_value = 0
-        for i in steel_grade:
-            for j in range(len(steel_grade[i])):
-                for k in range(len(steel_bill)):
-                    if steel_bill[k]['steel_grade'] == i and steel_bill[k]['diameter'] == steel_grade[i][j]:
-                        array_total_mass[1][count_count_grade_value] = self.mass_1m_bar(steel_bill[k]['diameter'])
-                count_count_grade_value += 1
-
-        for i in range(len(array_total_mass[2])):
-            value = array_total_mass[0][i] * array_total_mass[1][i]
-            array_total_mass[2][i] = round(value, 1)
-            array_total_mass[3][0] += round(value, 1)
+        array_total_mass = [[registry.total_length(*column) for column in columns],
+                            [self.mass_1m_bar(diameter) for _, diameter in columns],
+                            [registry.mass(*column) for column in columns],
+                            [registry.total_mass]]
 
         array_footer = [
             [(LANG['total_length_dia'], 4), (LANG['length_m'], 6)],
@@ -1213,6 +954,25 @@ class DxfElement:
         block.add_attdef('SECTION', dxfattribs={"height": 5, 'style': self.text, "layer": self.counter}).set_placement(
             (1, 0), align=TextEntityAlignment.MIDDLE_LEFT)
 
+    def _create_block_stirrup(self) -> str:
+        """Blok strzemienia w widoku, zależny od średnicy i wysokości strzemienia"""
+        name = f'stirrup_{self.diameter_stirrup}_{self.layout.stirrup_height}'
+        if name not in self.drawing.blocks:
+            block = self.drawing.blocks.new(name)
+            # warstwa '0' - strzemię przyjmuje warstwę wstawienia bloku
+            block.add_lwpolyline([(0, 0, self.diameter_stirrup, self.diameter_stirrup),
+                                  (0, self.layout.stirrup_height)], dxfattribs={'layer': '0'})
+        return name
+
+    def _create_block_bar_section(self) -> str:
+        """Blok pręta w przekroju o średnicy 1, wstawiany w skali równej średnicy pręta"""
+        name = 'bar_section'
+        if name not in self.drawing.blocks:
+            block = self.drawing.blocks.new(name)
+            block.add_circle((0, 0), 0.5, dxfattribs={"layer": self.bar})
+            block.add_hatch(color=-1, dxfattribs={"layer": self.hatch}).paths.add_edge_path().add_arc((0, 0), 0.5)
+        return name
+
     def _create_block_marker_left(self):
         name = 'marker'
         if name in self.drawing.blocks:
@@ -1247,28 +1007,41 @@ class DxfElement:
         block.add_attdef('LENGTH', dxfattribs={"height": 2.5, 'style': self.text, "layer": self.counter}).set_placement(
             (9, 5), align=TextEntityAlignment.MIDDLE_LEFT)
 
+    def add_block_with_attribs(self, name: str, position: tuple, values: dict[str, str], scale: int = 20):
+        """
+        Wstawienie bloku z atrybutami.
+        explode_blocks - przez blok anonimowy rozbijany na wstawienie bloku name, w przeciwnym razie bezpośrednio
+        """
+        if self.explode_blocks:
+            insert = self.msp.add_auto_blockref(name, position, values).set_scale(scale)
+            anonymous = insert.dxf.name
+            insert.explode()
+            # po rozbiciu blok anonimowy nie jest używany - nie zostaje w rysunku ani po ponownym rysowaniu części
+            self.drawing.blocks.delete_block(anonymous, safe=False)
+        else:
+            self.msp.add_blockref(name, position).set_scale(scale).add_auto_attribs(values)
+
     def generate_reinforcement_description(self, position: tuple, number: float or str, quantity: float or str,
                                            diameter: float or str,
                                            length: float or str, scale: int = 20):
-        self.msp.add_auto_blockref("reinforcement_description", position,
-                                   {"NUMBER": str(number), "QUANTITY": str(quantity), "DIAMETER": str(diameter),
-                                    "LENGTH": str(length)}).set_scale(scale).explode()
+        self.add_block_with_attribs("reinforcement_description", position,
+                                    {"NUMBER": str(number), "QUANTITY": str(quantity), "DIAMETER": str(diameter),
+                                     "LENGTH": str(length)}, scale)
 
     def generate_marker_left(self, position: tuple, number: float or str, scale: int = 20):
-        self.msp.add_auto_blockref("marker", position, {"NUMBER": str(number)}).set_scale(scale).explode()
+        self.add_block_with_attribs("marker", position, {"NUMBER": str(number)}, scale)
 
     def generate_marker_section(self, position: tuple, section: float or str, scale: int = 20):
-        self.msp.add_auto_blockref("marker_section", position, {"SECTION": str(section).upper()}).set_scale(
-            scale).explode()
+        self.add_block_with_attribs("marker_section", position, {"SECTION": str(section).upper()}, scale)
 
     def generate_block(self):
         for i in self.steel_bill:
             self.generate_reinforcement_description(
-                position=i['points_generate'],
-                number=i['number'],
-                quantity=i['quantity_bar'],
-                diameter=i['diameter'],
-                length=i['length']
+                position=i.points_generate,
+                number=i.number,
+                quantity=i.quantity_bar,
+                diameter=i.diameter,
+                length=i.length
             )
 
     def layout_new(self):
@@ -1283,3 +1056,71 @@ class DxfElement:
             size=(420, 297), margins=(0.5, 0.5, 0.5, 0.5), units="mm", scale=(1, 20)
         )
         # layout.add_viewport((420 / 2, 297 / 2), (419 * 20, 296 * 20), (420, 297), 296 * 20)
+
+
+class ContinuousDxfElement(DxfElement):
+    """
+    Belka ciągła o wielu przęsłach w jednym rysunku (ContinuousBeamLayout).
+    spans - rozpiętości przęseł lub słowniki parametrów przęseł (beam_span i rozstaw strzemion),
+    supports - szerokości podpór, o jedną więcej niż przęseł, pozostałe parametry jak dla DxfElement
+    bez beam_span, width_support_left i width_support_right. Rozstaw strzemion podany dla belki jest domyślny
+    dla wszystkich przęseł. Pręty nad podporami pośrednimi: diameter_support_top, quantity_support_top,
+    steel_grade_support_top (domyślnie jak pręt górny), support_bar_ratio - długość w przęsła.
+    """
+    layout_class = ContinuousBeamLayout
+    redraw_parameters = DxfElement.redraw_parameters | {'supports'}
+
+    def __init__(self, spans: list, supports: list[int], autosave: bool = True,
+                 observers: Iterable[Callable[[BuildMetrics], None]] = (), **parameters):
+        start = time.perf_counter()
+        # parametry belki - do update()
+        self.parameters = {**validation.DEFAULTS, **parameters, 'spans': spans, 'supports': supports}
+        errors = validation.validate(self.parameters)
+        if errors:
+            raise ValueError('; '.join(errors))
+        self.autosave = self._is_valid_flag(autosave)
+        self.observers = list(observers)
+        self.timings = {}
+        # supports to również metoda rysująca podporę - szerokości podpór dostępne są w modelu
+        for key, value in self.parameters.items():
+            if key != 'supports':
+                setattr(self, key, value)
+        self.layout = self._is_valid_section(self.layout_class.from_parameters(self.parameters))
+        self.position = self.layout.position
+        self._new_drawing(start)
+
+    def _parts(self) -> dict[str, tuple]:
+        layout = self.layout
+        parts = super()._parts()
+        parts.update({
+            'top_bar': (self.view_top_bars, lambda: (layout.top_bar, layout.support_bars)),
+            'top_bar_detail': (lambda: self.view_top_bars(dimension=True),
+                               lambda: (layout.top_bar_detail, layout.dimensions_top_bar, layout.support_bars_detail,
+                                        layout.dimensions_support_bars)),
+            'bottom_bar': (self.view_bottom_bars, lambda: layout.bottom_bars),
+            'bottom_bar_detail': (lambda: self.view_bottom_bars(dimension=True),
+                                  lambda: (layout.bottom_bars_detail, layout.dimensions_bottom_bars)),
+        })
+        return parts
+
+    def view_top_bars(self, dimension: bool = False):
+        """pręt górny i pręty nad podporami pośrednimi"""
+        self.view_top_bar(dimension)
+        for bar in self.layout.support_bars_detail if dimension else self.layout.support_bars:
+            self.add_polyline(bar)
+        if dimension:
+            for i in self.layout.dimensions_support_bars:
+                self.add_dimension(i)
+
+    def view_bottom_bars(self, dimension: bool = False):
+        """pręty dolne wszystkich przęseł"""
+        for bar in self.layout.bottom_bars_detail if dimension else self.layout.bottom_bars:
+            self.add_polyline(bar)
+        if dimension:
+            for i in self.layout.dimensions_bottom_bars:
+                self.add_dimension(i)
+
+
+def new_element(**parameters) -> DxfElement:
+    """DxfElement lub ContinuousDxfElement dla parametrów belki ciągłej (spans)"""
+    return (ContinuousDxfElement if 'spans' in parameters else DxfElement)(**parameters)
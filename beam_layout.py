@@ -0,0 +1,933 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""Geometria belki bez zależności od ezdxf - model rysunku wyliczany przed renderowaniem"""
+import math
+from functools import cached_property
+from typing import Literal, NamedTuple, Sequence
+
+import stirrup_solver
+from bar_placement import SectionPlacement, solve_section
+from validation import SPAN_PARAMETERS
+
+Point = tuple[float, float]
+# wierzchołek polilinii w formacie 'xyseb' - (x, y[, start_width, end_width[, bulge]])
+Vertex = tuple
+
+
+class Polyline(NamedTuple):
+    points: tuple[Vertex, ...]
+    layer: str
+    closed: bool = False
+
+
+class Dimension(NamedTuple):
+    base: Point
+    p1: Point
+    p2: Point
+    angle: float = 0
+    text: str = "<>"
+    style: Literal['main', 'bar'] = 'main'
+
+
+class Support(NamedTuple):
+    left: float
+    right: float
+    y: float
+    height: float = 200
+
+
+class Marker(NamedTuple):
+    position: Point
+    text: str
+
+
+class StirrupLayout(NamedTuple):
+    positions: tuple[float, ...]
+    secondary_spacing: float
+    range_first_row: float
+    dimension_points: tuple[float, ...]
+    number_of_stirrups_of_the_second_row: int
+
+
+class StirrupRun(NamedTuple):
+    """strzemiona o stałym rozstawie w widoku - position: pierwsze strzemię (dół), count: liczba strzemion"""
+    position: Point
+    spacing: float
+    count: int
+
+
+class SectionLayout(NamedTuple):
+    outline: Polyline
+    title: Point
+    bars_top: tuple[Point, ...]
+    bars_bottom: tuple[Point, ...]
+    leaders: tuple[Polyline, ...]
+    markers: tuple[Marker, ...]
+
+
+class ScheduleRow(NamedTuple):
+    name_element: str
+    number: int
+    diameter: float
+    quantity_bar: int
+    length: float
+    steel_grade: str
+    points_generate: Point
+    # kształt pręta - przesunięcia kolejnych wierzchołków, pręty o tym samym kształcie i długości są identyczne
+    shape: tuple = ()
+
+
+def point_position(x0: float, y0: float, distance: float, theta: float = 60) -> tuple[float, float]:
+    """
+    theta zgodna z ruchem wskazowek zegara. godzina 12:00 to 0st, 3:00 to 90st, 6:00 to 180st, 9:00 to 270st
+    """
+    theta_rad = math.pi / 2 - math.radians(theta)
+    return x0 + distance * math.cos(theta_rad), y0 + distance * math.sin(theta_rad)
+
+
+def spacing_between_bars(diameter: float, diameter_aggregate: float = 16) -> float:
+    return math.ceil(max(diameter, 20, diameter_aggregate + 5)) + diameter
+
+
+def bar_bending(diameter: float) -> float:
+    """Obliczanie wygięcia pręta związanego ze średnicą pręta"""
+    if diameter <= 16:
+        return diameter * 2.5
+    else:
+        return diameter * 4.0
+
+
+def bar_bulge(diameter: float) -> float:
+    """wyoblenie łuku 90st, odpowiednik ezdxf.math.arc_to_bulge((r, 0), pi, pi / 2, r)"""
+    angle = math.fmod(2 * math.pi + (math.pi / 2 - math.pi), 2 * math.pi) / 4.0
+    return -1 / (math.sin(angle) / math.cos(angle))
+
+
+def mass_1m_bar(diameter: float, mass: float = 7850) -> float:
+    return round(mass * math.pi * ((diameter / 2) / 1000) ** 2, 3)
+
+
+def bar_shape(points: list) -> tuple[tuple[float, float], ...]:
+    """kształt pręta niezależny od położenia na rysunku, łuki opisane są wypukłością"""
+    return tuple((round(end[0] - start[0], 1), round(end[1] - start[1], 1), *start[4:5])
+                 for start, end in zip(points, points[1:]))
+
+
+def length_bar(points: list, diameter: float, angle: int = 90) -> float:
+    """angle jest to kąt pod jakim zmieniają się proste"""
+    arc_radius = bar_bending(diameter)
+    total_length_bar = 0
+    for i in range(len(points) - 1):
+        if len(points[i]) == 5:
+            total_length_bar += 2 * (angle / 360) * math.pi * arc_radius
+            continue
+        total_length_bar += ((points[i][0] - points[i + 1][0]) ** 2 + (points[i][1] - points[i + 1][1]) ** 2) ** 0.5
+    return round(total_length_bar)
+
+
+class BeamLayout:
+    """
+    Model belki - obrys, pręty, strzemiona, wymiary, przekrój i zestawienie stali.
+    Poszczególne części liczone są przy pierwszym odwołaniu, nie wymagają ezdxf.
+    """
+
+    def __init__(self,
+                 beam_span: float,
+                 beam_height: float,
+                 beam_width: float,
+                 width_support_left: int,
+                 width_support_right: int,
+                 diameter_main_top: int,
+                 quantity_main_top: int,
+                 steel_grade_main_top: str,
+                 diameter_main_bottom: int,
+                 quantity_main_bottom: int,
+                 steel_grade_main_bottom: str,
+                 diameter_stirrup: int,
+                 steel_grade_stirrup: str,
+                 cover_view_left: int,
+                 cover_view_right: int,
+                 cover_bottom: int,
+                 cover_top: int,
+                 cover_left: int,
+                 cover_right: int,
+                 first_row_stirrup_range_left: int,
+                 first_row_stirrup_range_right: int,
+                 first_row_stirrup_spacing_left: int,
+                 first_row_stirrup_spacing_right: int,
+                 secondary_stirrup_spacing: int,
+                 number_of_elements: int = 1,
+                 name: str = "Belka",
+                 start_point_x: float = 0,
+                 start_point_y: float = 0):
+        self.beam_span = beam_span
+        self.beam_height = beam_height
+        self.beam_width = beam_width
+        self.width_support_left = width_support_left
+        self.width_support_right = width_support_right
+        self.diameter_main_top = diameter_main_top
+        self.quantity_main_top = quantity_main_top
+        self.steel_grade_main_top = steel_grade_main_top
+        self.diameter_main_bottom = diameter_main_bottom
+        self.quantity_main_bottom = quantity_main_bottom
+        self.steel_grade_main_bottom = steel_grade_main_bottom
+        self.diameter_stirrup = diameter_stirrup
+        self.steel_grade_stirrup = steel_grade_stirrup
+        self.cover_view_left = cover_view_left
+        self.cover_view_right = cover_view_right
+        self.cover_bottom = cover_bottom
+        self.cover_top = cover_top
+        self.cover_left = cover_left
+        self.cover_right = cover_right
+        self.first_row_stirrup_range_left = first_row_stirrup_range_left
+        self.first_row_stirrup_range_right = first_row_stirrup_range_right
+        self.first_row_stirrup_spacing_left = first_row_stirrup_spacing_left
+        self.first_row_stirrup_spacing_right = first_row_stirrup_spacing_right
+        self.number_of_elements = number_of_elements
+        self.name = name
+        self.start_point_x = start_point_x
+        self.start_point_y = start_point_y
+
+        self.secondary_stirrup_spacing = int(stirrup_solver.secondary_spacing_limit(self.beam_height,
+                                                                                    secondary_stirrup_spacing))
+
+        self.position = {}
+        self._start_points(start_y=self.start_point_y - 2 * self.beam_height)
+
+    @classmethod
+    def from_parameters(cls, parameters: dict) -> "BeamLayout":
+        """Model z parametrów DxfElement, parametry dotyczące tylko rysunku (np. language) są pomijane"""
+        names = cls.__init__.__code__.co_varnames[1:cls.__init__.__code__.co_argcount]
+        return cls(**{key: value for key, value in parameters.items() if key in names})
+
+    @property
+    def length(self) -> float:
+        """całkowita długość belki razem z podporami"""
+        return self.width_support_left + self.beam_span + self.width_support_right
+
+    def _start_points(self, start_x: float = None, start_y: float = None):
+        if start_x is None:
+            start_x = self.start_point_x
+        if start_y is None:
+            start_y = self.start_point_y
+
+        beam = self.length
+
+        # main beam
+        self.position['main_beam'] = (start_x, start_y)
+        # top bar dimension
+        self.position['main_bar_top'] = (start_x, start_y - self.beam_height - 800)
+        # bottom bar dimension
+        self.position['main_bar_bottom'] = (start_x, start_y - self.beam_height - 950)
+        # section
+        self.position['section'] = (start_x + beam + 500, start_y)
+        # stirrup
+        self.position['stirrup'] = (start_x + beam + 500 + self.beam_width + 400, start_y)
+        # bending_schedule
+        self.position['bending_schedule'] = (start_x + beam + 300, start_y - 300)
+
+    # --- widok ---
+
+    @cached_property
+    def outline(self) -> Polyline:
+        """obrys belki"""
+        start_point_x, start_point_y = self.position['main_beam']
+        points = ((start_point_x, start_point_y),
+                  (start_point_x + self.width_support_left, start_point_y),
+                  ((start_point_x + self.width_support_left + self.beam_span), start_point_y),
+                  ((start_point_x + self.length), start_point_y),
+                  ((start_point_x + self.length), start_point_y + self.beam_height),
+                  (start_point_x, start_point_y + self.beam_height))
+        return Polyline(points, 'counter', True)
+
+    @cached_property
+    def supports(self) -> tuple[Support, Support]:
+        start_point_x, start_point_y = self.position['main_beam']
+        return (Support(start_point_x, start_point_x + self.width_support_left, start_point_y),
+                Support(start_point_x + self.width_support_left + self.beam_span,
+                        start_point_x + self.length, start_point_y))
+
+    @cached_property
+    def section_markers(self) -> tuple[Marker, Marker]:
+        start_point_x, start_point_y = self.position['main_beam']
+        x = start_point_x + self.width_support_left + self.beam_span / 2
+        return (Marker((x, start_point_y + self.beam_height + 300), 'a'),
+                Marker((x, start_point_y - 500), 'a'))
+
+    def _top_bar_points(self, start_point_x: float, start_point_y: float) -> tuple[Vertex, ...]:
+        diameter = self.diameter_main_top
+        bugle = bar_bulge(diameter)
+        bending = bar_bending(diameter)
+        x_left = start_point_x + self.cover_view_left + 0.5 * diameter
+        x_right = start_point_x + self.length - self.cover_view_right - 0.5 * diameter
+        y_top = start_point_y + self.beam_height - self.cover_top - self.diameter_stirrup - 0.5 * diameter
+        return ((x_left, start_point_y + self.cover_bottom, diameter, diameter),
+                (x_left, y_top - bending, diameter, diameter, bugle),
+                (x_left + bending, y_top, diameter, diameter),
+                (x_right - bending, y_top, diameter, diameter, bugle),
+                (x_right, y_top - bending, diameter, diameter),
+                (x_right, start_point_y + self.cover_bottom))
+
+    def _bottom_bar_points(self, start_point_x: float, start_point_y: float) -> tuple[Vertex, ...]:
+        diameter = self.diameter_main_bottom
+        y = start_point_y + self.cover_bottom + self.diameter_stirrup + 0.5 * diameter
+        return ((start_point_x + self.cover_view_left, y, diameter, diameter),
+                (start_point_x + self.length - self.cover_view_right, y))
+
+    @cached_property
+    def top_bar(self) -> Polyline:
+        """pręt górny w widoku belki"""
+        return Polyline(self._top_bar_points(*self.position['main_beam']), 'bar')
+
+    @cached_property
+    def top_bar_detail(self) -> Polyline:
+        """pręt górny wyrysowany pod belką"""
+        return Polyline(self._top_bar_points(*self.position['main_bar_top']), 'bar')
+
+    @cached_property
+    def bottom_bar(self) -> Polyline:
+        """pręt dolny w widoku belki"""
+        return Polyline(self._bottom_bar_points(*self.position['main_beam']), 'bar')
+
+    @cached_property
+    def bottom_bar_detail(self) -> Polyline:
+        """pręt dolny wyrysowany pod belką"""
+        return Polyline(self._bottom_bar_points(*self.position['main_bar_bottom']), 'bar')
+
+    @cached_property
+    def dimensions_top_bar(self) -> tuple[Dimension, ...]:
+        points = self.top_bar_detail.points
+        half = 0.5 * self.diameter_main_top
+        return (Dimension((points[0][0] - 25, points[0][1]), points[0][:2], (points[2][0], points[2][1] + half),
+                          angle=90, style='bar'),
+                Dimension((points[3][0], points[3][1] - 100), (points[1][0] - half, points[1][1]),
+                          (points[4][0] + half, points[4][1]), style='bar'),
+                Dimension((points[5][0] + 100, points[5][1]), (points[3][0], points[3][1] + half), points[5][:2],
+                          angle=90, style='bar'))
+
+    @cached_property
+    def dimensions_bottom_bar(self) -> tuple[Dimension, ...]:
+        points = self.bottom_bar_detail.points
+        return (Dimension((points[0][0], points[0][1] - 100), points[0][:2], points[1][:2], style='bar'),)
+
+    # --- strzemiona ---
+
+    @cached_property
+    def stirrups(self) -> StirrupLayout:
+        """rozstaw strzemion w belce, położenia liczone od lica lewej podpory"""
+        parameters = (self.beam_span, self.first_row_stirrup_range_left, self.first_row_stirrup_spacing_left,
+                      self.first_row_stirrup_range_right, self.first_row_stirrup_spacing_right,
+                      self.secondary_stirrup_spacing)
+        solution = stirrup_solver.solve(*parameters)
+        range_first_row = solution.range_first_row[0].item()
+
+        dimension_points = [0.0, float(self.beam_span)]
+        if self.first_row_stirrup_range_left != 0 and self.first_row_stirrup_spacing_left != 0:
+            dimension_points.append(solution.last_stirrup_left[0].item())
+        if self.first_row_stirrup_range_right != 0 and self.first_row_stirrup_spacing_right != 0:
+            dimension_points.append(solution.last_stirrup_right[0].item())
+        dimension_points.append(range_first_row / 2)
+        dimension_points.append(self.beam_span - range_first_row / 2)
+
+        dimension_points = list(dict.fromkeys(dimension_points))
+        dimension_points.sort()
+
+        return StirrupLayout(
+            positions=tuple(stirrup_solver.positions(*parameters, solution=solution).tolist()),
+            secondary_spacing=solution.secondary_spacing[0].item(),
+            range_first_row=range_first_row,
+            dimension_points=tuple(dimension_points),
+            number_of_stirrups_of_the_second_row=int(solution.number_of_stirrups_of_the_second_row[0]))
+
+    @cached_property
+    def stirrup_lines(self) -> tuple[Polyline, ...]:
+        """strzemiona w widoku belki"""
+        start_point_x, start_point_y = self.position['main_beam']
+        return tuple(
+            Polyline((((start_point_x + self.width_support_left + i), start_point_y + self.cover_bottom,
+                       self.diameter_stirrup, self.diameter_stirrup),
+                      ((start_point_x + self.width_support_left + i), start_point_y + (self.beam_height - self.cover_top))),
+                     'stirrup')
+            for i in self.stirrups.positions)
+
+    @property
+    def stirrup_height(self) -> float:
+        """wysokość strzemienia w widoku belki"""
+        return self.beam_height - self.cover_top - self.cover_bottom
+
+    @cached_property
+    def stirrup_runs(self) -> tuple[StirrupRun, ...]:
+        """strzemiona w widoku belki podzielone na odcinki o stałym rozstawie"""
+        start_point_x, start_point_y = self.position['main_beam']
+        positions = self.stirrups.positions
+        runs = []
+        first = 0
+        while first < len(positions):
+            last = first + 1
+            spacing = positions[last] - positions[first] if last < len(positions) else 0
+            while last + 1 < len(positions) and abs(positions[last + 1] - positions[last] - spacing) < 1e-6:
+                last += 1
+            count = min(last, len(positions) - 1) - first + 1
+            runs.append(StirrupRun((start_point_x + self.width_support_left + positions[first],
+                                    start_point_y + self.cover_bottom), spacing, count))
+            first += count
+        return tuple(runs)
+
+    @property
+    def count_stirrups(self) -> int:
+        return len(self.stirrups.positions)
+
+    # --- wymiary ---
+
+    @cached_property
+    def dimensions_main(self) -> tuple[Dimension, ...]:
+        height = 400
+        start_point_x, start_point_y = self.position['main_beam']
+        return (
+            Dimension((start_point_x, start_point_y - height),
+                      (start_point_x, start_point_y - height),
+                      (start_point_x + self.width_support_left, start_point_y - height)),
+            Dimension((start_point_x, start_point_y - height),
+                      (start_point_x + self.width_support_left, start_point_y - height),
+                      (start_point_x + self.width_support_left + self.beam_span, start_point_y - height)),
+            Dimension((start_point_x, start_point_y - height),
+                      (start_point_x + self.width_support_left + self.beam_span, start_point_y - height),
+                      (start_point_x + self.length, start_point_y - height)),
+            Dimension((start_point_x - 200, start_point_y),
+                      (start_point_x, start_point_y),
+                      (start_point_x, start_point_y + self.beam_height),
+                      90))
+
+    @cached_property
+    def dimensions_stirrup(self) -> tuple[Dimension, ...]:
+        height = 300
+        stirrups = self.stirrups
+        dimension_points = stirrups.dimension_points
+        number_of_stirrups_of_the_second_row = stirrups.number_of_stirrups_of_the_second_row
+        value1, value2, value3, value4, value5, value6 = 0, 0, 0, 0, 0, self.beam_span
+        start_end_dimension: bool = False
+        start_point_x, start_point_y = self.position['main_beam']
+        left = self.first_row_stirrup_range_left != 0 and self.first_row_stirrup_spacing_left != 0
+        right = self.first_row_stirrup_range_right != 0 and self.first_row_stirrup_spacing_right != 0
+        if len(dimension_points) == 2:
+            value3 = 0
+            value4 = self.beam_span
+            number_of_stirrups_of_the_second_row += 1
+        elif len(dimension_points) == 3 and left:
+            value3 = 0
+            value4 = dimension_points[1]
+            value5 = self.beam_span
+        elif len(dimension_points) == 3 and right:
+            value2 = 0
+            value3 = dimension_points[1]
+            value4 = self.beam_span
+        elif len(dimension_points) == 4 and (dimension_points[1] - dimension_points[0]) > 30:
+            value2 = dimension_points[0]
+            value3 = dimension_points[1]
+            value4 = dimension_points[2]
+            value5 = dimension_points[3]
+        elif len(dimension_points) == 4:
+            value2 = dimension_points[1]
+            value3 = dimension_points[1]
+            value4 = dimension_points[2]
+            value5 = dimension_points[2]
+            start_end_dimension = True
+            number_of_stirrups_of_the_second_row -= 1
+        elif len(dimension_points) == 5 and left:
+            value2 = dimension_points[1]
+            value3 = dimension_points[2]
+            value4 = dimension_points[3]
+            value5 = dimension_points[3]
+            start_end_dimension = True
+            number_of_stirrups_of_the_second_row -= 1
+        elif len(dimension_points) == 5 and right:
+            value2 = dimension_points[1]
+            value3 = dimension_points[1]
+            value4 = dimension_points[2]
+            value5 = dimension_points[3]
+            start_end_dimension = True
+            number_of_stirrups_of_the_second_row -= 1
+        elif len(dimension_points) == 6:
+            value2 = dimension_points[1]
+            value3 = dimension_points[2]
+            value4 = dimension_points[3]
+            value5 = dimension_points[4]
+            start_end_dimension = True
+        else:
+            print('error 1. Błąd generatora wymiarowania', dimension_points)
+
+        def x(value: float) -> Point:
+            return start_point_x + self.width_support_left + value, start_point_y - height
+
+        base = (start_point_x, start_point_y - height)
+        dimensions = []
+        if start_end_dimension:
+            dimensions.append(Dimension(base, x(value1), x(value2)))
+            dimensions.append(Dimension(base, x(value5), x(value6)))
+
+        if left:
+            dimensions.append(Dimension(
+                base, x(value2), x(value3),
+                text=f'{math.ceil((value3 - value2) / self.first_row_stirrup_spacing_left)} x {self.first_row_stirrup_spacing_left} = <>'))
+
+        if right:
+            dimensions.append(Dimension(
+                base, x(value5), x(value4),
+                text=f'{math.ceil((value5 - value4) / self.first_row_stirrup_spacing_right)} x {self.first_row_stirrup_spacing_right} = <>'))
+
+        if number_of_stirrups_of_the_second_row != 0:
+            dimensions.append(Dimension(
+                base, x(value3), x(value4),
+                text=f'{math.ceil((value4 - value3) / number_of_stirrups_of_the_second_row)} x {number_of_stirrups_of_the_second_row} = <>'))
+        return tuple(dimensions)
+
+    # --- przekrój ---
+
+    @cached_property
+    def bar_placement(self) -> SectionPlacement:
+        """rozmieszczenie prętów górnych i dolnych w przekroju, z wynikiem sprawdzenia (feasible, errors())"""
+        return solve_section(
+            self.beam_width, self.beam_height, self.cover_left, self.cover_right, self.cover_top, self.cover_bottom,
+            self.diameter_stirrup, self.diameter_main_top, self.quantity_main_top, self.diameter_main_bottom,
+            self.quantity_main_bottom)
+
+    def localization_bar_section(self, localization: Literal['top', 'bottom']) -> list[Point]:
+        """
+        Położenia prętów w przekroju, w dowolnej liczbie warstw.
+        Czy pręty mieszczą się w przekroju - wynik sprawdzenia w bar_placement.
+        """
+        start_point_x, start_point_y = self.position['section']
+        if localization == 'top':
+            placement = self.bar_placement.top
+            start_point_y += self.beam_height
+            turn = -1
+        else:
+            placement = self.bar_placement.bottom
+            turn = 1
+
+        list_points = []
+        for x0, step, count, offset in placement.layers_at():
+            for i in range(count):
+                list_points.append((start_point_x + x0 + step * i, start_point_y + turn * offset))
+        return list_points
+
+    @cached_property
+    def section(self) -> SectionLayout:
+        """przekrój poprzeczny A-A"""
+        start_point_x, start_point_y = self.position['section']
+        outline = Polyline(((start_point_x, start_point_y),
+                            (start_point_x + self.beam_width, start_point_y),
+                            (start_point_x + self.beam_width, start_point_y + self.beam_height),
+                            (start_point_x, start_point_y + self.beam_height)), 'counter', True)
+
+        bars_top = self.localization_bar_section('top')
+        bars_bottom = self.localization_bar_section('bottom')
+
+        leaders = []
+        start_for_line = []
+        for value, (x0, y0) in enumerate(bars_top):
+            x1 = (x0 + (start_point_y + self.beam_height + 100 - y0) * math.tan(math.pi / 2 - math.radians(60)))
+            if value == 0:
+                start_for_line.append(x1)
+            leaders.append(Polyline(((x0, y0), (x1, (start_point_y + self.beam_height + 100))), 'counter'))
+        for value, (x0, y0) in enumerate(bars_bottom):
+            x1 = (x0 + (y0 - start_point_y + 100) * math.tan(2 * math.pi + math.radians(30)))
+            if value == 0:
+                start_for_line.append(x1)
+            leaders.append(Polyline(((x0, y0), (x1, (start_point_y - 100))), 'counter'))
+        leaders.append(Polyline(((start_for_line[0], start_point_y + self.beam_height + 100),
+                                 ((start_point_x + self.beam_width + 100), (start_point_y + self.beam_height + 100))),
+                                'counter'))
+        leaders.append(Polyline(((start_for_line[1], start_point_y - 100),
+                                 ((start_point_x + self.beam_width + 100), (start_point_y - 100))), 'counter'))
+        leaders.append(Polyline(
+            ((start_point_x + self.beam_width - self.cover_right, start_point_y + self.beam_height / 2),
+             (start_point_x + self.beam_width + 100, start_point_y + self.beam_height / 2)), 'counter'))
+
+        # todo: Poprawić ponieważ powinno samo nadawać nr pręta
+        markers = (Marker(((start_point_x + self.beam_width + 100), (start_point_y + self.beam_height + 100)), '1'),
+                   Marker(((start_point_x + self.beam_width + 100), (start_point_y - 100)), '2'),
+                   Marker((start_point_x + self.beam_width + 100, start_point_y + self.beam_height / 2), '3'))
+
+        return SectionLayout(
+            outline=outline,
+            title=(start_point_x + self.beam_height / 2, start_point_y + self.beam_height + 200),
+            bars_top=tuple(bars_top),
+            bars_bottom=tuple(bars_bottom),
+            leaders=tuple(leaders),
+            markers=markers)
+
+    @cached_property
+    def dimensions_section(self) -> tuple[Dimension, ...]:
+        height = 200
+        start_point_x, start_point_y = self.position['section']
+        return (Dimension((start_point_x, start_point_y - height),
+                          (start_point_x, start_point_y - height),
+                          (start_point_x + self.beam_width, start_point_y - height)),
+                Dimension((start_point_x - height / 4, start_point_y),
+                          (start_point_x, start_point_y),
+                          (start_point_x, start_point_y + self.beam_height),
+                          angle=90))
+
+    @cached_property
+    def stirrup_section(self) -> Polyline:
+        """strzemię w przekroju"""
+        anchoring_stirrup = 80
+        start_point_x, start_point_y = self.position['section']
+        diameter = self.diameter_stirrup
+        bending_stirrup = bar_bending(diameter)
+        bending_arrow = bar_bulge(bending_stirrup)
+        x_left = start_point_x + self.cover_left + 0.5 * diameter
+        x_right = start_point_x + self.beam_width - self.cover_right - 0.5 * diameter
+        y_top = start_point_y + self.beam_height - self.cover_top - 0.5 * diameter
+        y_bottom = start_point_y + self.cover_bottom + 0.5 * diameter
+
+        points = (
+            (x_left, y_top - bending_stirrup - anchoring_stirrup, diameter, diameter),
+            (x_left, y_top - bending_stirrup, diameter, diameter, bending_arrow),
+            (x_left + bending_stirrup, y_top, diameter, diameter),
+            (x_right - bending_stirrup, y_top, diameter, diameter, bending_arrow),
+            (x_right, y_top - bending_stirrup, diameter, diameter),
+            (x_right, y_bottom + bending_stirrup, diameter, diameter, bending_arrow),
+            (x_right - bending_stirrup, y_bottom, diameter, diameter),
+            (x_left + bending_stirrup, y_bottom, diameter, diameter, bending_arrow),
+            (x_left, y_bottom + bending_stirrup, diameter, diameter),
+            (x_left, y_top - bending_stirrup, diameter, diameter, bending_arrow),
+            (x_left + bending_stirrup, y_top, diameter, diameter),
+            (x_left + bending_stirrup + anchoring_stirrup, y_top, diameter, diameter)
+        )
+        return Polyline(points, 'bar')
+
+    @cached_property
+    def stirrup_shape(self) -> Polyline:
+        """kształt strzemienia obok przekroju"""
+        anchoring_stirrup = 10 * 8
+        bending_stirrup = bar_bending(self.diameter_stirrup)
+        start_point_x, start_point_y = self.position['stirrup']
+        diameter = self.diameter_stirrup
+
+        theta = 60
+
+        point_1 = point_position(start_point_x + self.cover_left + 0.5 * diameter,
+                                 start_point_y + self.beam_height - self.cover_top - 0.5 * diameter,
+                                 self.beam_width - diameter - self.cover_left - self.cover_right, theta)
+
+        point_2 = point_position(point_1[0], point_1[1], bending_stirrup + anchoring_stirrup, 90 + theta)
+
+        x_left = start_point_x + self.cover_left + 0.5 * diameter
+        x_right = start_point_x + self.beam_width - self.cover_left - 0.5 * diameter
+        y_top = start_point_y + self.beam_height - self.cover_top - 0.5 * diameter
+        y_bottom = start_point_y + self.cover_bottom + 0.5 * diameter
+        points = (
+            (x_right - bending_stirrup - anchoring_stirrup, y_top, diameter, diameter),
+            (x_right, y_top, diameter, diameter),
+            (x_right, y_bottom, diameter, diameter),
+            (x_left, y_bottom, diameter, diameter),
+            (x_left, y_top, diameter, diameter),
+            (x_left, y_top, diameter, diameter),
+            (point_1[0], point_1[1], diameter, diameter),
+            (point_2[0], point_2[1], diameter, diameter)
+        )
+        return Polyline(points, 'bar')
+
+    @cached_property
+    def dimensions_stirrup_shape(self) -> tuple[Dimension, ...]:
+        start_point_x, start_point_y = self.position['stirrup']
+        return (Dimension((start_point_x, start_point_y - 50),
+                          (start_point_x + self.cover_left, start_point_y + self.cover_bottom),
+                          (start_point_x + self.beam_width - self.cover_right, start_point_y + self.cover_bottom),
+                          style='bar'),
+                # dimension left
+                Dimension((start_point_x + self.cover_left - 25, start_point_y),
+                          (start_point_x + self.cover_left, start_point_y + self.cover_bottom),
+                          (start_point_x + self.cover_left, start_point_y + self.beam_height - self.cover_top),
+                          angle=90, style='bar'))
+
+    # --- zestawienie stali ---
+
+    @cached_property
+    def schedule(self) -> tuple[ScheduleRow, ...]:
+        """wiersze zestawienia stali: pręt górny, pręt dolny, strzemiona"""
+        top = self.top_bar_detail.points
+        bottom = self.bottom_bar_detail.points
+        start_point_x, start_point_y = self.position['stirrup']
+        return (
+            ScheduleRow(self.name, 1, self.diameter_main_top, int(self.quantity_main_top),
+                        length_bar(top, self.diameter_main_top), self.steel_grade_main_top,
+                        (top[0][0] + (top[-1][0] - top[0][0]) / 2, top[3][1]), bar_shape(top)),
+            ScheduleRow(self.name, 2, self.diameter_main_bottom, int(self.quantity_main_bottom),
+                        length_bar(bottom, self.diameter_main_bottom), self.steel_grade_main_bottom,
+                        (bottom[0][0] + (bottom[-1][0] - bottom[0][0]) / 2, bottom[0][1]), bar_shape(bottom)),
+            ScheduleRow(self.name, 3, self.diameter_stirrup, self.count_stirrups,
+                        length_bar(self.stirrup_section.points, self.diameter_stirrup), self.steel_grade_stirrup,
+                        (start_point_x + self.beam_width - self.cover_right + 400,
+                         start_point_y + self.beam_height / 2 - 100), bar_shape(self.stirrup_section.points)),
+        )
+
+    # --- zasięg rysunku ---
+
+    @cached_property
+    def extents(self) -> tuple[Point, Point]:
+        """
+        Zasięg rysunku (lewy dolny, prawy górny narożnik) wyliczony z położeń części rysunku,
+        z zapasem na teksty wymiarów i opisy - bez przeglądania encji
+        """
+        scale = 20  # skala tabeli i bloków opisu, jak w DxfElement
+        start_point_x, start_point_y = self.position['main_beam']
+        table_x, table_y = self.position['bending_schedule']
+        count_column = len({(row.steel_grade, row.diameter) for row in self.schedule})
+        table_width = (10 + 4 * 15 + 15 * count_column + 20) * scale
+        table_height = (10 + 4 * 5 + 5 * len(self.schedule) + 4 * 5) * scale
+        label_x = max(row.points_generate[0] for row in self.schedule)
+
+        # teksty w komórkach tabeli mogą wystawać poza jej obrys
+        x_min = start_point_x - 300
+        x_max = max(table_x + table_width + 100, label_x + 25 * scale)
+        y_min = min(self.position['main_bar_bottom'][1] - 200, table_y - table_height - 100)
+        y_max = start_point_y + self.beam_height + 400
+        # hak strzemienia szerokiej belki wystaje ponad widok
+        for point in self.stirrup_shape.points:
+            x_max = max(x_max, point[0] + self.diameter_stirrup)
+            y_max = max(y_max, point[1] + self.diameter_stirrup)
+        return (x_min, y_min), (x_max, y_max)
+
+
+# długość prętów górnych nad podporą pośrednią w każde z sąsiednich przęseł, jako część rozpiętości przęsła
+SUPPORT_BAR_RATIO = 0.25
+# zaokrąglenie długości prętów nad podporą [mm]
+SUPPORT_BAR_ROUNDING = 10
+
+
+class ContinuousBeamLayout(BeamLayout):
+    """
+    Model belki ciągłej - przęsła o wspólnym przekroju oparte na wspólnych podporach pośrednich.
+    Pręt górny biegnie przez całą belkę, nad podporami pośrednimi dodatkowe pręty górne, pręty dolne i strzemiona
+    w każdym przęśle osobno. Części liczone są w czasie liniowym względem liczby przęseł.
+    spans - rozpiętości przęseł lub słowniki parametrów przęseł (beam_span i rozstaw strzemion,
+    validation.SPAN_PARAMETERS), supports - szerokości podpór, o jedną więcej niż przęseł.
+    """
+
+    def __init__(self, spans: Sequence, supports: Sequence[int], support_bar_ratio: float = SUPPORT_BAR_RATIO,
+                 diameter_support_top: int = None, quantity_support_top: int = None,
+                 steel_grade_support_top: str = None, **parameters):
+        self.supports_width = tuple(supports)
+        self.support_bar_ratio = support_bar_ratio
+        self.diameter_support_top = diameter_support_top or parameters['diameter_main_top']
+        self.quantity_support_top = quantity_support_top or parameters['quantity_main_top']
+        self.steel_grade_support_top = steel_grade_support_top or parameters['steel_grade_main_top']
+        # parametry przęseł: wspólne parametry belki zmienione parametrami przęsła
+        self._shared = {key: value for key, value in parameters.items() if key not in SPAN_PARAMETERS}
+        self.span_parameters = tuple({**{key: parameters.get(key, 0) for key in SPAN_PARAMETERS},
+                                      **(span if isinstance(span, dict) else {'beam_span': span})}
+                                     for span in spans)
+        # cała belka - pręt górny, przekrój i strzemię; rozstaw strzemion liczony w przęsłach
+        super().__init__(beam_span=sum(span['beam_span'] for span in self.span_parameters) + sum(supports[1:-1]),
+                         width_support_left=supports[0], width_support_right=supports[-1],
+                         **{key: parameters.get(key, 0) for key in SPAN_PARAMETERS if key != 'beam_span'},
+                         **self._shared)
+
+    @classmethod
+    def from_parameters(cls, parameters: dict) -> "ContinuousBeamLayout":
+        """Model z parametrów ContinuousDxfElement, parametry dotyczące tylko rysunku są pomijane"""
+        code = BeamLayout.__init__.__code__
+        names = {*code.co_varnames[1:code.co_argcount], 'spans', 'supports', 'support_bar_ratio',
+                 'diameter_support_top', 'quantity_support_top', 'steel_grade_support_top'} - {
+            'beam_span', 'width_support_left', 'width_support_right'}
+        return cls(**{key: value for key, value in parameters.items() if key in names})
+
+    def _start_points(self, start_x: float = None, start_y: float = None):
+        super()._start_points(start_x, start_y)
+        # pręty nad podporami pośrednimi wyrysowane pod prętami dolnymi
+        main_x, main_y = self.position['main_beam']
+        self.position['support_bar'] = (main_x, main_y - self.beam_height - 1100)
+
+    @cached_property
+    def faces(self) -> tuple[float, ...]:
+        """położenia krawędzi podpór od początku belki: lewa i prawa krawędź kolejnych podpór"""
+        faces = [0.0]
+        for index, width in enumerate(self.supports_width):
+            faces.append(faces[-1] + width)
+            if index < len(self.span_parameters):
+                faces.append(faces[-1] + self.span_parameters[index]['beam_span'])
+        return tuple(faces)
+
+    @cached_property
+    def spans(self) -> tuple[BeamLayout, ...]:
+        """modele przęseł w położeniu na rysunku belki - strzemiona i ich wymiary"""
+        return tuple(BeamLayout(**{**self._shared, **span, 'width_support_left': self.supports_width[index],
+                                   'width_support_right': self.supports_width[index + 1],
+                                   'start_point_x': self.start_point_x + self.faces[2 * index]})
+                     for index, span in enumerate(self.span_parameters))
+
+    # --- widok ---
+
+    @cached_property
+    def section_markers(self) -> tuple[Marker, Marker]:
+        """przekrój w środku pierwszego przęsła"""
+        start_point_x, start_point_y = self.position['main_beam']
+        x = start_point_x + (self.faces[1] + self.faces[2]) / 2
+        return (Marker((x, start_point_y + self.beam_height + 300), 'a'),
+                Marker((x, start_point_y - 500), 'a'))
+
+    def _support_bar_points(self, start_point_x: float, y: float) -> tuple[tuple[Vertex, ...], ...]:
+        diameter = self.diameter_support_top
+        bars = []
+        for index in range(1, len(self.supports_width) - 1):
+            left = math.ceil(self.support_bar_ratio * self.span_parameters[index - 1]['beam_span']
+                             / SUPPORT_BAR_ROUNDING) * SUPPORT_BAR_ROUNDING
+            right = math.ceil(self.support_bar_ratio * self.span_parameters[index]['beam_span']
+                              / SUPPORT_BAR_ROUNDING) * SUPPORT_BAR_ROUNDING
+            bars.append(((start_point_x + self.faces[2 * index] - left, y, diameter, diameter),
+                         (start_point_x + self.faces[2 * index + 1] + right, y)))
+        return tuple(bars)
+
+    def _bottom_bars_points(self, start_point_x: float, start_point_y: float) -> tuple[tuple[Vertex, ...], ...]:
+        """pręty dolne przęseł, w podporach pośrednich do osi podpory"""
+        diameter = self.diameter_main_bottom
+        y = start_point_y + self.cover_bottom + self.diameter_stirrup + 0.5 * diameter
+        faces = self.faces
+        last = len(self.span_parameters) - 1
+        return tuple(
+            ((start_point_x + (self.cover_view_left if index == 0 else (faces[2 * index] + faces[2 * index + 1]) / 2),
+              y, diameter, diameter),
+             (start_point_x + (self.length - self.cover_view_right if index == last
+                               else (faces[2 * index + 2] + faces[2 * index + 3]) / 2), y))
+            for index in range(last + 1))
+
+    @cached_property
+    def support_bars(self) -> tuple[Polyline, ...]:
+        """pręty górne nad podporami pośrednimi w widoku belki, w drugiej warstwie pod prętem górnym"""
+        start_point_x, start_point_y = self.position['main_beam']
+        diameter = self.diameter_support_top
+        y = (start_point_y + self.beam_height - self.cover_top - self.diameter_stirrup - 0.5 * diameter
+             - spacing_between_bars(diameter))
+        return tuple(Polyline(points, 'bar') for points in self._support_bar_points(start_point_x, y))
+
+    @cached_property
+    def support_bars_detail(self) -> tuple[Polyline, ...]:
+        """pręty nad podporami wyrysowane pod belką"""
+        return tuple(Polyline(points, 'bar') for points in self._support_bar_points(*self.position['support_bar']))
+
+    @cached_property
+    def dimensions_support_bars(self) -> tuple[Dimension, ...]:
+        return tuple(Dimension((bar.points[0][0], bar.points[0][1] - 100), bar.points[0][:2], bar.points[1][:2],
+                               style='bar') for bar in self.support_bars_detail)
+
+    @cached_property
+    def bottom_bars(self) -> tuple[Polyline, ...]:
+        """pręty dolne przęseł w widoku belki"""
+        return tuple(Polyline(points, 'bar') for points in self._bottom_bars_points(*self.position['main_beam']))
+
+    @cached_property
+    def bottom_bars_detail(self) -> tuple[Polyline, ...]:
+        return tuple(Polyline(points, 'bar')
+                     for points in self._bottom_bars_points(*self.position['main_bar_bottom']))
+
+    @cached_property
+    def dimensions_bottom_bars(self) -> tuple[Dimension, ...]:
+        return tuple(Dimension((bar.points[0][0], bar.points[0][1] - 100), bar.points[0][:2], bar.points[1][:2],
+                               style='bar') for bar in self.bottom_bars_detail)
+
+    @property
+    def bottom_bar(self) -> Polyline:
+        """pręt dolny pierwszego przęsła"""
+        return self.bottom_bars[0]
+
+    @property
+    def bottom_bar_detail(self) -> Polyline:
+        return self.bottom_bars_detail[0]
+
+    @property
+    def dimensions_bottom_bar(self) -> tuple[Dimension, ...]:
+        return self.dimensions_bottom_bars[:1]
+
+    # --- strzemiona ---
+
+    @property
+    def span_stirrups(self) -> tuple[StirrupLayout, ...]:
+        """rozstaw strzemion w każdym przęśle, położenia liczone od lica lewej podpory przęsła"""
+        return tuple(span.stirrups for span in self.spans)
+
+    @cached_property
+    def stirrups(self) -> StirrupLayout:
+        """
+        rozstaw strzemion całej belki, położenia liczone od lica lewej podpory skrajnej;
+        secondary_spacing - największy rozstaw przęseł, pozostałe wartości - sumy przęseł
+        """
+        offsets = [face - self.faces[1] for face in self.faces[1::2]]
+        stirrups = self.span_stirrups
+        return StirrupLayout(
+            positions=tuple(position + offset for offset, span in zip(offsets, stirrups)
+                            for position in span.positions),
+            secondary_spacing=max(span.secondary_spacing for span in stirrups),
+            range_first_row=sum(span.range_first_row for span in stirrups),
+            dimension_points=tuple(sorted(dict.fromkeys(point + offset for offset, span in zip(offsets, stirrups)
+                                                        for point in span.dimension_points))),
+            number_of_stirrups_of_the_second_row=sum(span.number_of_stirrups_of_the_second_row
+                                                     for span in stirrups))
+
+    @cached_property
+    def stirrup_runs(self) -> tuple[StirrupRun, ...]:
+        """odcinki o stałym rozstawie w każdym przęśle osobno"""
+        return tuple(run for span in self.spans for run in span.stirrup_runs)
+
+    # --- wymiary ---
+
+    @cached_property
+    def dimensions_main(self) -> tuple[Dimension, ...]:
+        """łańcuch wymiarowy podpór i przęseł oraz wysokość belki"""
+        height = 400
+        start_point_x, start_point_y = self.position['main_beam']
+        base = (start_point_x, start_point_y - height)
+        return (*(Dimension(base, (start_point_x + left, start_point_y - height),
+                            (start_point_x + right, start_point_y - height))
+                  for left, right in zip(self.faces, self.faces[1:])),
+                Dimension((start_point_x - 200, start_point_y), (start_point_x, start_point_y),
+                          (start_point_x, start_point_y + self.beam_height), 90))
+
+    @cached_property
+    def dimensions_stirrup(self) -> tuple[Dimension, ...]:
+        return tuple(dimension for span in self.spans for dimension in span.dimensions_stirrup)
+
+    # --- zestawienie stali ---
+
+    @cached_property
+    def schedule(self) -> tuple[ScheduleRow, ...]:
+        """
+        Wiersze zestawienia stali: pręt górny, pręt dolny pierwszego przęsła, strzemiona wszystkich przęseł,
+        pręty dolne kolejnych przęseł i pręty nad podporami. Identyczne pręty mają ten sam numer.
+        """
+        numbers = {}
+
+        def row(diameter: float, quantity: int, points: tuple, steel_grade: str, position: Point) -> ScheduleRow:
+            length, shape = length_bar(points, diameter), bar_shape(points)
+            number = numbers.setdefault((diameter, steel_grade, length, shape), len(numbers) + 1)
+            return ScheduleRow(self.name, number, diameter, quantity, length, steel_grade, position, shape)
+
+        def straight(diameter: float, quantity: int, polyline: Polyline, steel_grade: str) -> ScheduleRow:
+            points = polyline.points
+            return row(diameter, quantity, points, steel_grade,
+                       (points[0][0] + (points[-1][0] - points[0][0]) / 2, points[0][1]))
+
+        top = self.top_bar_detail.points
+        start_point_x, start_point_y = self.position['stirrup']
+        bottom = [(self.diameter_main_bottom, int(self.quantity_main_bottom), bar, self.steel_grade_main_bottom)
+                  for bar in self.bottom_bars_detail]
+        rows = [row(self.diameter_main_top, int(self.quantity_main_top), top, self.steel_grade_main_top,
+                    (top[0][0] + (top[-1][0] - top[0][0]) / 2, top[3][1])),
+                straight(*bottom[0]),
+                row(self.diameter_stirrup, self.count_stirrups, self.stirrup_section.points, self.steel_grade_stirrup,
+                    (start_point_x + self.beam_width - self.cover_right + 400,
+                     start_point_y + self.beam_height / 2 - 100))]
+        rows += [straight(*bar) for bar in bottom[1:]]
+        rows += [straight(self.diameter_support_top, int(self.quantity_support_top), bar,
+                          self.steel_grade_support_top) for bar in self.support_bars_detail]
+        return tuple(rows)
+
+    # --- zasięg rysunku ---
+
+    @cached_property
+    def extents(self) -> tuple[Point, Point]:
+        (x_min, y_min), (x_max, y_max) = super().extents
+        if self.support_bars_detail:
+            y_min = min(y_min, self.position['support_bar'][1] - 200)
+        return (x_min, y_min), (x_max, y_max)
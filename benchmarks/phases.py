@@ -0,0 +1,152 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Pomiar czasu poszczególnych etapów rysowania belki (DxfElement.timings) dla siatki parametrów.
+Wynik każdego etapu to minimum z kilku powtórzeń, sumowane dla wszystkich belek siatki.
+Wyniki zapisywane są do pliku bazowego (json), kolejne pomiary porównywane są z plikiem bazowym.
+
+    python benchmarks/phases.py --save benchmarks/baseline.json
+    python benchmarks/phases.py --compare benchmarks/baseline.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+from importlib import metadata
+
+ROOT = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+
+from beam_generator import DxfElement  # noqa: E402
+from main import EXAMPLE  # noqa: E402
+
+# siatka parametrów: rozpiętość, liczba prętów górnych i dolnych, rozstaw strzemion, język
+SPANS = (3000, 8000, 15000)
+QUANTITIES = (1, 2, 8, 40)
+SPACINGS = (50, 150, 400)
+LANGUAGES = ('pl', 'eng', 'de')
+# porównanie: etap wolniejszy o więcej niż THRESHOLD i o więcej niż MIN_DELTA [ms] to regresja
+THRESHOLD = 0.2
+MIN_DELTA = 1.0
+
+
+def grid() -> dict[str, dict]:
+    """Parametry belek siatki: nazwa przypadku - parametry DxfElement"""
+    cases = {}
+    for span, quantity, spacing, language in itertools.product(SPANS, QUANTITIES, SPACINGS, LANGUAGES):
+        # szerokość belki i średnice dobrane tak, aby pręty zmieściły się w przekroju
+        wide = quantity > 8
+        cases[f'L{span}-n{quantity}-s{spacing}-{language}'] = {
+            **EXAMPLE,
+            'name': 'Benchmark',
+            'beam_span': span,
+            'beam_width': 1000 if wide else 400,
+            'quantity_main_top': quantity,
+            'quantity_main_bottom': quantity,
+            'diameter_main_top': 16 if wide else 20,
+            'diameter_main_bottom': 16 if wide else 20,
+            'first_row_stirrup_range_left': min(span // 4, 1000),
+            'first_row_stirrup_range_right': min(span // 4, 1000),
+            'first_row_stirrup_spacing_left': spacing,
+            'first_row_stirrup_spacing_right': spacing,
+            'secondary_stirrup_spacing': spacing,
+            'language': language,
+        }
+    return cases
+
+
+def measure(parameters: dict, directory: str) -> dict[str, float]:
+    """Czasy etapów rysowania i zapisu jednej belki [ms]"""
+    element = DxfElement(**parameters, autosave=False)
+    with open(os.path.join(directory, 'benchmark.dxf'), 'wb') as file:
+        element.write(file)
+    return {phase: seconds * 1000 for phase, seconds in element.timings.items()}
+
+
+def run(cases: dict[str, dict], repeat: int = 3) -> dict:
+    """Pomiar siatki, wynik w postaci zapisywanej do pliku bazowego"""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for case, parameters in cases.items():
+            runs = [measure(parameters, directory) for _ in range(repeat)]
+            results[case] = {phase: round(min(run[phase] for run in runs), 3) for phase in runs[0]}
+    phases = {}
+    for times in results.values():
+        for phase, milliseconds in times.items():
+            phases[phase] = phases.get(phase, 0) + milliseconds
+    return {
+        'python': platform.python_version(),
+        'ezdxf': metadata.version('ezdxf'),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'phases': {phase: round(milliseconds, 3) for phase, milliseconds in phases.items()},
+        'total': round(sum(phases.values()), 3),
+        'cases': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list[str]:
+    """Etapy wolniejsze niż w pliku bazowym"""
+    regressions = []
+    for phase, milliseconds in current['phases'].items():
+        reference = baseline['phases'].get(phase)
+        if reference is None:
+            continue
+        if milliseconds - reference > MIN_DELTA and milliseconds > reference * (1 + threshold):
+            regressions.append(f"{phase}: {milliseconds:.1f} ms, baseline {reference:.1f} ms "
+                               f"(+{(milliseconds / reference - 1) * 100:.0f}%)")
+    return regressions
+
+
+def report(current: dict, baseline: dict = None):
+    print(f"{'etap':<20} {'ms':>10}" + (f" {'baseline':>10} {'zmiana':>8}" if baseline else ''))
+    for phase, milliseconds in [*current['phases'].items(), ('total', current['total'])]:
+        line = f"{phase:<20} {milliseconds:10.1f}"
+        if baseline:
+            reference = baseline['total'] if phase == 'total' else baseline['phases'].get(phase)
+            if reference:
+                line += f" {reference:10.1f} {(milliseconds / reference - 1) * 100:+7.0f}%"
+        print(line)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Pomiar czasu etapów rysowania belki dla siatki parametrów')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='liczba powtórzeń każdej belki, default=3')
+    parser.add_argument('-k', '--filter', default='', help='tylko przypadki zawierające tekst, np. L15000')
+    parser.add_argument('--save', default=None, help='zapis wyników do pliku bazowego .json')
+    parser.add_argument('--compare', default=None, help='porównanie z plikiem bazowym .json')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f'dopuszczalny wzrost czasu etapu, default={THRESHOLD}')
+    args = parser.parse_args(argv)
+
+    cases = {case: parameters for case, parameters in grid().items() if args.filter in case}
+    if not cases:
+        print(f"Brak przypadków dla '{args.filter}'", file=sys.stderr)
+        return 2
+    print(f"Belek: {len(cases)}, powtórzeń: {args.repeat}")
+    current = run(cases, args.repeat)
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if set(baseline['cases']) != set(current['cases']):
+            print("Uwaga: inna siatka parametrów niż w pliku bazowym", file=sys.stderr)
+    report(current, baseline)
+
+    if args.save is not None:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(current, file, indent=2)
+        print(f"Zapisuje {args.save}")
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESJA {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
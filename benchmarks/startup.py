@@ -0,0 +1,68 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Pomiar czasu uruchomienia CLI (python main.py) względem budżetu.
+Mierzony jest czas ponad samo uruchomienie interpretera (python -c pass), mediana z kilku powtórzeń.
+
+    python benchmarks/startup.py
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# budżet [ms] ponad start interpretera
+BUDGET = {
+    '--help': 50,
+    '--validate': 50,
+}
+
+
+def measure(arguments: list[str], repeat: int = 7) -> float:
+    """Mediana czasu wykonania [ms]"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], cwd=ROOT, check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def imports_ezdxf(arguments: list[str]) -> bool:
+    """Czy wywołanie CLI importuje ezdxf"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=ROOT, check=False,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return any(line.rstrip().endswith('| ezdxf') for line in result.stderr.splitlines())
+
+
+def main() -> int:
+    sys.path.insert(0, ROOT)
+    from main import EXAMPLE
+
+    with tempfile.TemporaryDirectory() as directory:
+        parameters = os.path.join(directory, 'belka.json')
+        with open(parameters, 'w', encoding='utf-8') as file:
+            json.dump(EXAMPLE, file)
+        commands = {
+            '--help': ['main.py', '--help'],
+            '--validate': ['main.py', parameters, '--validate'],
+        }
+        interpreter = measure(['-c', 'pass'])
+        print(f"{'python -c pass':<14} {interpreter:7.1f} ms")
+        over_budget = False
+        for name, arguments in commands.items():
+            elapsed = measure(arguments) - interpreter
+            ezdxf = imports_ezdxf(arguments)
+            ok = elapsed <= BUDGET[name] and not ezdxf
+            over_budget |= not ok
+            print(f"{name:<14} {elapsed:7.1f} ms  budżet {BUDGET[name]} ms  "
+                  f"{'ezdxf importowany ' if ezdxf else ''}{'OK' if ok else 'PRZEKROCZONY'}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
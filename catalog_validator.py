@@ -0,0 +1,253 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Sprawdzenie katalogu belek (CSV, JSON, JSONL) bez rysowania i bez importu ezdxf.
+Reguły parametrów budowane są raz z tabel validation (zakresy, nazwy plików, listy wartości), komunikaty błędów
+są takie same jak validation.validate. Warunki geometryczne - pierwszy rząd strzemion w rozpiętości belki,
+rozstaw strzemion drugiego rzędu i pręty w przekroju - sprawdzane są wektorowo dla całego katalogu.
+Dla każdej belki zwracane są wszystkie błędy, nie tylko pierwszy. Belki ciągłe (spans, supports) sprawdzane są
+jak validation.validate_continuous, warunki geometryczne - w każdym przęśle osobno.
+
+    python catalog_validator.py katalog.csv
+    python catalog_validator.py katalog.jsonl -o bledy.csv
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+import bar_placement
+import stirrup_solver
+import validation
+
+# liczba belek sprawdzanych geometrycznie jednym wywołaniem NumPy - ogranicza zużycie pamięci
+CHUNK = 10_000
+# parametry warunków geometrycznych
+GEOMETRY = ('beam_span', 'beam_height', 'first_row_stirrup_range_left', 'first_row_stirrup_spacing_left',
+            'first_row_stirrup_range_right', 'first_row_stirrup_spacing_right', 'secondary_stirrup_spacing',
+            *bar_placement.SECTION_PARAMETERS)
+
+Rule = Callable[[dict], Optional[str]]
+
+
+def _limit_rule(key: str, min_value: int, max_value: int) -> Rule:
+    def rule(values: dict) -> Optional[str]:
+        value = values.get(key)
+        if type(value) is int and min_value <= value <= max_value:
+            return None
+        try:
+            validation.is_valid_value(value, min_value, max_value)
+        except (ValueError, TypeError) as error:
+            return f"{key}: {error}"
+    return rule
+
+
+def _span_rule(key: str, min_value: int, max_value: int) -> Rule:
+    def rule(values: dict) -> Optional[str]:
+        value = values.get(key)
+        try:
+            validation.is_valid_value_beam(value, values.get('first_row_stirrup_range_left', 0),
+                                           values.get('first_row_stirrup_range_right', 0), min_value, max_value)
+        except (ValueError, TypeError) as error:
+            return f"{key}: {error}"
+    return rule
+
+
+def _name_rule(key: str) -> Rule:
+    match = validation.PATH_NAME.fullmatch
+
+    def rule(values: dict) -> Optional[str]:
+        value = values.get(key)
+        if type(value) is str and match(value):
+            return None
+        try:
+            validation.is_valid_path_name(value)
+        except (ValueError, TypeError) as error:
+            return f"{key}: {error}"
+    return rule
+
+
+def _checked_rule(key: str, check: Callable) -> Rule:
+    def rule(values: dict) -> Optional[str]:
+        try:
+            check(values[key])
+        except (ValueError, TypeError) as error:
+            return f"{key}: {error}"
+    return rule
+
+
+def compile_rules() -> list[tuple[str, Rule]]:
+    """Reguły parametrów w kolejności jak validation.validate: (parametr, reguła zwracająca błąd lub None)"""
+    rules = []
+    for key, (min_value, max_value) in validation.LIMITS.items():
+        rules.append((key, (_span_rule if key == 'beam_span' else _limit_rule)(key, min_value, max_value)))
+    rules += [(key, _name_rule(key)) for key in validation.NAMES]
+    rules += [(key, _checked_rule(key, lambda value, choices=choices: validation.is_valid_choice(value, choices)))
+              for key, choices in validation.CHOICES.items()]
+    rules += [(key, _checked_rule(key, validation.is_valid_flag)) for key in validation.FLAGS]
+    rules.append(('views', _checked_rule('views', validation.is_valid_views)))
+    return rules
+
+
+RULES = compile_rules()
+_PARAMETERS = frozenset(validation.PARAMETERS)
+_REQUIRED = (*validation.LIMITS, *validation.NAMES)
+
+
+def check_parameters(parameters: dict) -> list[str]:
+    """Błędy parametrów jednej belki, jak validation.validate"""
+    if not isinstance(parameters, dict):
+        return ['parameters must be a json object']
+    if 'spans' in parameters:
+        return validation.validate_continuous(parameters)
+    errors = [f"unexpected parameter '{key}'" for key in parameters if key not in _PARAMETERS]
+    values = {**validation.DEFAULTS, **parameters}
+    errors += [f"missing parameter '{key}'" for key in _REQUIRED if key not in values]
+    for key, rule in RULES:
+        if key in values and (error := rule(values)) is not None:
+            errors.append(error)
+    return errors
+
+
+def check_geometry(beams: dict[str, np.ndarray]) -> list[list[str]]:
+    """
+    Warunki geometryczne serii belek, beams - parametry GEOMETRY jako tablice o długości liczby belek.
+    Zwraca listę błędów każdej belki.
+    """
+    beams = {key: np.asarray(value) for key, value in beams.items()}
+    errors = [[] for _ in range(len(beams['beam_span']))]
+
+    first_row_left = stirrup_solver.first_row_length(beams['first_row_stirrup_range_left'],
+                                                     beams['first_row_stirrup_spacing_left'])
+    first_row_right = stirrup_solver.first_row_length(beams['first_row_stirrup_range_right'],
+                                                      beams['first_row_stirrup_spacing_right'])
+    for index in np.flatnonzero(first_row_left + first_row_right > beams['beam_span']):
+        errors[index].append(f"first row stirrups ({first_row_left[index]:.0f} + {first_row_right[index]:.0f}) "
+                             f"do not fit in beam_span {beams['beam_span'][index]}")
+
+    spacing = stirrup_solver.secondary_spacing_limit(beams['beam_height'], beams['secondary_stirrup_spacing'])
+    for index in np.flatnonzero(spacing <= 0):
+        errors[index].append(f"secondary_stirrup_spacing: {beams['secondary_stirrup_spacing'][index]} "
+                             f"gives no secondary stirrup spacing (min is 5)")
+
+    placement = bar_placement.solve_section(**{key: beams[key] for key in bar_placement.SECTION_PARAMETERS})
+    for index in np.flatnonzero(~placement.feasible):
+        errors[index] += placement.errors(index)
+    return errors
+
+
+def validate_catalog(beams: Iterable[dict], geometry: bool = True) -> list[list[str]]:
+    """
+    Błędy wszystkich belek katalogu, pusta lista - belka poprawna.
+    geometry - sprawdzenie warunków geometrycznych belek o poprawnych parametrach
+    """
+    beams = list(beams)
+    errors = [check_parameters(parameters) for parameters in beams]
+    if not geometry:
+        return errors
+    # belka ciągła sprawdzana jest przęsłami, każde przęsło jak pojedyncza belka
+    spans = [(index, span) for index, beam_errors in enumerate(errors) if not beam_errors
+             for span in (validation.span_parameters(beams[index]) if 'spans' in beams[index] else [beams[index]])]
+    span_errors = {}
+    for start in range(0, len(spans), CHUNK):
+        chunk = spans[start:start + CHUNK]
+        values = [{**validation.DEFAULTS, **parameters} for _, parameters in chunk]
+        geometry_errors = check_geometry({key: np.array([parameters[key] for parameters in values])
+                                          for key in GEOMETRY})
+        for (index, _), beam_errors in zip(chunk, geometry_errors):
+            span_errors.setdefault(index, []).append(beam_errors)
+    for index, beam_errors in span_errors.items():
+        if 'spans' not in beams[index]:
+            errors[index] += beam_errors[0]
+            continue
+        # błędy wspólne dla wszystkich przęseł podawane są raz, jak validation.validate_continuous
+        shared = set(beam_errors[0]).intersection(*beam_errors[1:])
+        errors[index] += [error for error in beam_errors[0] if error in shared]
+        for number, span in enumerate(beam_errors):
+            errors[index] += [f"span {number + 1}: {error}" for error in span if error not in shared]
+    return errors
+
+
+_INTEGER = re.compile(r'[+-]?\d+')
+_BOOLEANS = {'true': True, 'false': False}
+
+
+def _number(text: str):
+    """liczba całkowita, ułamek lub tekst - błędna wartość trafia do raportu bez zmian"""
+    if _INTEGER.fullmatch(text):
+        return int(text)
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _converter(key: str) -> Callable[[str], object]:
+    """Zamiana tekstu kolumny CSV na wartość parametru"""
+    if key in validation.LIMITS or key in ('start_point_x', 'start_point_y'):
+        return _number
+    if key in validation.FLAGS:
+        return lambda text: _BOOLEANS.get(text.lower(), text)
+    if key == 'views':
+        return lambda text: [view.strip() for view in text.split(',') if view.strip()]
+    return str
+
+
+def read_csv(path: str) -> Iterator[dict]:
+    """Belki z pliku CSV, nagłówek - nazwy parametrów, puste pola - wartości domyślne"""
+    with open(path, encoding='utf-8', newline='') as file:
+        sample = file.readline()
+        file.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        reader = csv.reader(file, dialect)
+        columns = [(key.strip(), _converter(key.strip())) for key in next(reader)]
+        for row in reader:
+            if row:
+                yield {key: convert(text) for (key, convert), text in zip(columns, row) if text != ''}
+
+
+def load_catalog(path: str) -> list[dict]:
+    """Wczytanie katalogu belek z pliku .csv, .json (lista) lub .jsonl (jedna belka w linii)"""
+    if path.endswith('.csv'):
+        return list(read_csv(path))
+    with open(path, encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in file if line.strip()]
+        return json.load(file)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Sprawdzenie katalogu belek bez rysowania')
+    parser.add_argument('catalog', help='plik .csv, .json (lista parametrów) lub .jsonl')
+    parser.add_argument('-o', '--output', default=None, help='zapis błędów do pliku .csv (wiersz, nazwa, błąd)')
+    parser.add_argument('--no-geometry', action='store_true', help='bez sprawdzania warunków geometrycznych')
+    parser.add_argument('-q', '--quiet', action='store_true', help='tylko podsumowanie')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    beams = load_catalog(args.catalog)
+    errors = validate_catalog(beams, geometry=not args.no_geometry)
+    seconds = time.perf_counter() - start
+
+    rows = [(index, str(parameters.get('name', validation.DEFAULTS['name'])) if isinstance(parameters, dict) else '',
+             error) for index, (parameters, beam_errors) in enumerate(zip(beams, errors)) for error in beam_errors]
+    if not args.quiet:
+        for index, name, error in rows:
+            print(f"[{index}] {name}: {error}", file=sys.stderr)
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file, delimiter=';')
+            writer.writerow(('row', 'name', 'error'))
+            writer.writerows(rows)
+        print(f"Zapisuje {args.output}")
+    invalid = sum(bool(beam_errors) for beam_errors in errors)
+    print(f"{len(beams) - invalid}/{len(beams)} OK, błędów: {len(rows)}, {seconds:.2f} s")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
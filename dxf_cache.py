@@ -0,0 +1,208 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Pamięć podręczna wygenerowanych plików DXF.
+Kluczem jest skrót wszystkich parametrów DxfElement, wersji ezdxf i kodu generatora - niezmieniona belka
+nie jest rysowana ponownie, plik kopiowany jest z pamięci podręcznej.
+Rozmiar ograniczony jest przez max_size, usuwane są najdawniej używane pliki (LRU wg czasu modyfikacji).
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import metadata
+
+import validation
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# moduł rysujący belkę - zawartość pliku DXF zależy od niego i od wszystkich lokalnych modułów, które importuje
+GENERATOR = 'beam_generator'
+# instrukcje importu, również wewnątrz funkcji: from moduł import ... lub import moduł[, moduł]
+IMPORT = re.compile(r'^[ \t]*(?:from[ \t]+([\w.]+)[ \t]+import|import[ \t]+([\w.]+(?:[ \t]*,[ \t]*[\w.]+)*))', re.M)
+
+
+@lru_cache(maxsize=None)
+def sources(module: str = GENERATOR) -> tuple[str, ...]:
+    """
+    Pliki kodu generatora: moduł, lokalne moduły importowane przez niego (również pośrednio) i opisy LANG,
+    ładowane przez importlib. Importy odczytywane są z tekstu kodu, bez importu modułów (ezdxf, NumPy).
+    """
+    found, pending = [], [module]
+    while pending:
+        name = pending.pop()
+        path = f"{name.replace('.', '/')}.py"
+        if path in found or not os.path.isfile(os.path.join(ROOT, path)):
+            continue
+        found.append(path)
+        with open(os.path.join(ROOT, path), encoding='utf-8') as file:
+            for module_from, modules in IMPORT.findall(file.read()):
+                pending += [module_from] if module_from else [name.strip() for name in modules.split(',')]
+    languages = sorted(os.path.relpath(path, ROOT).replace(os.sep, '/')
+                       for path in glob.glob(os.path.join(ROOT, 'LANG', '*.py')))
+    return tuple(sorted(found)) + tuple(languages)
+
+
+@lru_cache(maxsize=None)
+def generator_version() -> str:
+    """Wersja ezdxf i skrót kodu generatora, liczone raz na proces"""
+    digest = hashlib.sha256(metadata.version('ezdxf').encode())
+    for name in sources():
+        with open(os.path.join(ROOT, name), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def cache_key(parameters: dict, fmt: str = 'asc') -> str:
+    """Stały skrót parametrów belki i formatu pliku, parametry domyślne uzupełniane są wartościami domyślnymi"""
+    values = {**validation.DEFAULTS, **parameters}
+    # kolejność widoków nie zmienia rysunku
+    if values['views'] is not None:
+        values['views'] = sorted(set(values['views']))
+    data = json.dumps(values, sort_keys=True, ensure_ascii=False)
+    if fmt != 'asc':
+        data += f'\n{fmt}'
+    return hashlib.sha256(f'{generator_version()}\n{data}'.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    entries: int = 0
+
+
+class DxfCache:
+    """
+    Pamięć podręczna plików DXF w katalogu directory.
+    max_size - maksymalny rozmiar [B], link - plik wynikowy jako dowiązanie twarde zamiast kopii
+    (szybciej, ale zmiana pliku wynikowego zmienia plik w pamięci podręcznej)
+
+        cache = DxfCache('.dxf_cache')
+        cache.generate(**parameters)
+    """
+
+    def __init__(self, directory: str, max_size: int = 512 * 1024 ** 2, link: bool = False):
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        self.link = link
+        os.makedirs(self.directory, exist_ok=True)
+        self.stats = CacheStats()
+        self._scan()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.dxf')
+
+    def _entries(self) -> list[os.DirEntry]:
+        return [entry for directory in os.scandir(self.directory) if directory.is_dir()
+                for entry in os.scandir(directory.path) if entry.name.endswith('.dxf')]
+
+    def _scan(self):
+        entries = self._entries()
+        self.stats.entries = len(entries)
+        self.stats.size = sum(entry.stat().st_size for entry in entries)
+
+    def generate(self, fmt: str = 'asc', **parameters) -> str:
+        """
+        Plik DXF belki w katalogu bieżącym, jak DxfElement(**parameters), fmt - 'asc' lub 'bin' (DXF binarny).
+        Zwraca nazwę pliku.
+        """
+        filename = f"{parameters.get('name', validation.DEFAULTS['name'])}.dxf"
+        cached = self.path(cache_key(parameters, fmt))
+        if os.path.exists(cached):
+            self.stats.hits += 1
+            # czas modyfikacji to czas ostatniego użycia - kolejność usuwania LRU
+            os.utime(cached)
+            self._output(cached, filename)
+            return filename
+
+        self.stats.misses += 1
+        # import ezdxf dopiero przy rysowaniu
+        from beam_generator import new_element
+        new_element(**parameters, autosave=False).save(filename, fmt)
+        self.store(filename, cached)
+        return filename
+
+    def read(self, fmt: str = 'asc', **parameters) -> bytes:
+        """Zawartość pliku DXF belki, bez zapisu w katalogu bieżącym - np. do archiwum zip"""
+        cached = self.path(cache_key(parameters, fmt))
+        try:
+            with open(cached, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            pass
+        else:
+            self.stats.hits += 1
+            os.utime(cached)
+            return data
+
+        self.stats.misses += 1
+        from beam_generator import new_element
+        data = new_element(**parameters, autosave=False).to_bytes(fmt)
+        self.store_bytes(data, cached)
+        return data
+
+    def _output(self, cached: str, filename: str):
+        if os.path.lexists(filename):
+            os.remove(filename)
+        if self.link:
+            try:
+                os.link(cached, filename)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(cached, filename)
+
+    def store(self, filename: str, cached: str):
+        """Zapis pliku do pamięci podręcznej, przez plik tymczasowy - bezpieczny dla wielu procesów"""
+        temporary = self._temporary(cached)
+        shutil.copyfile(filename, temporary)
+        self._commit(temporary, cached)
+
+    def store_bytes(self, data: bytes, cached: str):
+        """Zapis zawartości pliku do pamięci podręcznej"""
+        temporary = self._temporary(cached)
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        self._commit(temporary, cached)
+
+    @staticmethod
+    def _temporary(cached: str) -> str:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(cached), suffix='.tmp')
+        os.close(descriptor)
+        return temporary
+
+    def _commit(self, temporary: str, cached: str):
+        os.replace(temporary, cached)
+        self.stats.entries += 1
+        self.stats.size += os.path.getsize(cached)
+        if self.stats.size > self.max_size:
+            self.evict()
+
+    def evict(self, max_size: int = None):
+        """Usuwanie najdawniej używanych plików do rozmiaru max_size"""
+        if max_size is None:
+            max_size = self.max_size
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= max_size:
+                break
+            size -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                # usunięty przez inny proces
+                continue
+            self.stats.evictions += 1
+        self._scan()
+
+    def clear(self):
+        self.evict(max_size=0)
+
@@ -1,31 +1,110 @@
-from beam_generator import DxfElement
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Generowanie belek z linii poleceń.
+ezdxf i opisy w wybranym języku ładowane są dopiero przy rysowaniu,
+--help i --validate nie importują ezdxf.
+
+    python main.py belka.json
+    python main.py belki.jsonl --validate
+"""
+import argparse
+import json
+import sys
+
+import validation
+
+# belka przykładowa, generowana gdy nie podano pliku parametrów
+EXAMPLE = dict(
+    beam_span=3000,
+    beam_height=500,
+    beam_width=250,
+    width_support_left=250,
+    width_support_right=250,
+    diameter_main_top=20,
+    quantity_main_top=3,
+    steel_grade_main_top='B500SP',
+    diameter_main_bottom=12,
+    quantity_main_bottom=4,
+    steel_grade_main_bottom='B500SP',
+    diameter_stirrup=8,
+    steel_grade_stirrup='B500A',
+    cover_view_left=25,
+    cover_view_right=30,
+    cover_bottom=25,
+    cover_top=30,
+    cover_left=35,
+    cover_right=35,
+    first_row_stirrup_range_left=0,
+    first_row_stirrup_range_right=0,
+    first_row_stirrup_spacing_left=110,
+    first_row_stirrup_spacing_right=100,
+    secondary_stirrup_spacing=400,
+    name="BŻ-4",
+    number_of_elements=5,
+    language='pl')
+
+
+def load_parameters(path: str) -> list[dict]:
+    """Parametry z pliku .json (belka lub lista belek) lub .jsonl (jedna belka w linii)"""
+    with open(path, encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in file if line.strip()]
+        parameters = json.load(file)
+    return [parameters] if isinstance(parameters, dict) else parameters
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Generowanie rysunków belek żelbetowych DXF')
+    parser.add_argument('parameters', nargs='?', default=None,
+                        help='plik .json (belka lub lista belek) lub .jsonl, default=belka przykładowa')
+    parser.add_argument('--validate', action='store_true', help='tylko sprawdzenie parametrów, bez rysowania')
+    parser.add_argument('--example', action='store_true', help='wypisanie parametrów belki przykładowej (json)')
+    parser.add_argument('-l', '--language', choices=('pl', 'eng', 'de'), default=None,
+                        help='język opisów, nadpisuje wartość z pliku')
+    parser.add_argument('--views', default=None,
+                        help=f"rysowane widoki oddzielone przecinkami ({', '.join(validation.VIEWS)}), "
+                             f"default=cały rysunek")
+    parser.add_argument('-w', '--workers', type=int, default=1, help='liczba procesów, default=1')
+    parser.add_argument('-o', '--output-dir', default=None, help='katalog zapisu plików .dxf')
+    parser.add_argument('--cache', default=None, help='katalog pamięci podręcznej plików .dxf')
+    parser.add_argument('-f', '--format', choices=validation.FORMATS, default='asc',
+                        help="format DXF: 'asc' - tekstowy, 'bin' - binarny, default=asc")
+    parser.add_argument('--compress', choices=validation.COMPRESSIONS, default=None,
+                        help="'gzip' - pliki .dxf.gz, 'zip' - jedno archiwum, default=bez kompresji")
+    parser.add_argument('--archive', default=None, help='plik archiwum przy --compress zip, default=belki.zip')
+    args = parser.parse_args(argv)
+
+    if args.example:
+        print(json.dumps(EXAMPLE, ensure_ascii=False, indent=4))
+        return 0
+
+    beams = load_parameters(args.parameters) if args.parameters else [dict(EXAMPLE)]
+    if args.language is not None:
+        for parameters in beams:
+            parameters['language'] = args.language
+    if args.views is not None:
+        for parameters in beams:
+            parameters['views'] = [view.strip() for view in args.views.split(',') if view.strip()]
+
+    invalid = 0
+    for index, parameters in enumerate(beams):
+        errors = validation.validate(parameters)
+        for error in errors:
+            print(f"[{index}] {parameters.get('name', 'Belka')}: {error}", file=sys.stderr)
+        invalid += bool(errors)
+    if args.validate or invalid:
+        print(f"{len(beams) - invalid}/{len(beams)} OK")
+        return 1 if invalid else 0
+
+    from batch_generator import generate_batch
+    failed = [result for result in generate_batch(beams, workers=args.workers, output_dir=args.output_dir,
+                                                    cache_dir=args.cache, fmt=args.format,
+                                                    compression=args.compress, archive=args.archive)
+              if not result.ok]
+    for result in failed:
+        print(f"[{result.index}] {result.name}: {result.error}", file=sys.stderr)
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
-    DxfElement(
-        beam_span=3000,
-        beam_height=500,
-        beam_width=250,
-        width_support_left=250,
-        width_support_right=250,
-        diameter_main_top=20,
-        quantity_main_top=3,
-        steel_grade_main_top='B500SP',
-        diameter_main_bottom=12,
-        quantity_main_bottom=4,
-        steel_grade_main_bottom='B500SP',
-        diameter_stirrup=8,
-        steel_grade_stirrup='B500A',
-        cover_view_left=25,
-        cover_view_right=30,
-        cover_bottom=25,
-        cover_top=30,
-        cover_left=35,
-        cover_right=35,
-        first_row_stirrup_range_left=0,
-        first_row_stirrup_range_right=0,
-        first_row_stirrup_spacing_left=110,
-        first_row_stirrup_spacing_right=100,
-        secondary_stirrup_spacing=400,
-        name="BŻ-4",
-        number_of_elements=5,
-        language='pl')
+    sys.exit(main())
@@ -0,0 +1,306 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Dobór zbrojenia głównego belek o najmniejszej masie stali, bez rysowania i bez importu ezdxf (NumPy).
+Dla każdej belki sprawdzane są naraz wszystkie kombinacje średnicy i liczby prętów górnych i dolnych, których pole
+przekroju mieści się w wymaganym zakresie. Rozmieszczenie prętów sprawdzane jest jak w bar_placement, masa liczona
+jak w zestawieniu stali (długość pręta jak length_bar, masa 1 m jak mass_1m_bar).
+
+    python reinforcement_optimizer.py belki.jsonl -n 3
+    python reinforcement_optimizer.py belki.jsonl -o dobrane.jsonl --diameters 12,16,20,25
+
+Wymagane pole przekroju podawane jest w parametrach belki [mm2]: liczba (minimum) lub [minimum, maksimum]:
+
+    {"name": "B-1", "beam_span": 6000, ..., "required_area_top": 400, "required_area_bottom": [1200, 1600]}
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+import bar_placement
+import validation
+
+# średnice prętów głównych [mm]
+DIAMETERS = (8, 10, 12, 14, 16, 20, 25, 28, 32, 40)
+# liczba prętów po jednej stronie przekroju, zakres jak w validation.LIMITS
+QUANTITIES = tuple(range(validation.LIMITS['quantity_main_top'][0], validation.LIMITS['quantity_main_top'][1] + 1))
+# wymagane pole przekroju prętów górnych i dolnych [mm2]
+AREAS = ('required_area_top', 'required_area_bottom')
+# parametry belki potrzebne do doboru zbrojenia
+PARAMETERS = ('beam_span', 'beam_height', 'beam_width', 'width_support_left', 'width_support_right',
+              'cover_view_left', 'cover_view_right', 'cover_top', 'cover_bottom', 'cover_left', 'cover_right',
+              'diameter_stirrup', 'number_of_elements')
+# największa liczba par (pręty górne, pręty dolne) sprawdzana jednocześnie - ogranicza zużycie pamięci
+MAX_PAIRS = 2_000_000
+
+
+class Solution(NamedTuple):
+    """Zbrojenie główne belki, masa prętów głównych wszystkich elementów [kg]"""
+    diameter_main_top: int
+    quantity_main_top: int
+    diameter_main_bottom: int
+    quantity_main_bottom: int
+    area_top: float
+    area_bottom: float
+    layers_top: int
+    layers_bottom: int
+    mass: float
+
+    def parameters(self) -> dict:
+        """parametry DxfElement zbrojenia głównego"""
+        return {'diameter_main_top': self.diameter_main_top, 'quantity_main_top': self.quantity_main_top,
+                'diameter_main_bottom': self.diameter_main_bottom, 'quantity_main_bottom': self.quantity_main_bottom}
+
+
+@dataclass
+class BeamOptimization:
+    index: int
+    name: str
+    # rozwiązania od najlżejszego, pusta lista - brak zbrojenia spełniającego warunki
+    solutions: list[Solution] = field(default_factory=list)
+    error: str = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and bool(self.solutions)
+
+    @property
+    def best(self) -> Optional[Solution]:
+        return self.solutions[0] if self.solutions else None
+
+
+def bar_area(diameter, quantity) -> np.ndarray:
+    """Pole przekroju prętów [mm2]"""
+    diameter = np.asarray(diameter, dtype=float)
+    return np.asarray(quantity) * math.pi * diameter ** 2 / 4
+
+
+def mass_1m_bar(diameter, mass: float = 7850) -> np.ndarray:
+    """Masa 1 m pręta [kg], jak beam_layout.mass_1m_bar"""
+    diameter = np.asarray(diameter, dtype=float)
+    return np.round(mass * math.pi * ((diameter / 2) / 1000) ** 2, 3)
+
+
+def length_top_bar(beam_span, beam_height, width_support_left, width_support_right, cover_view_left,
+                   cover_view_right, cover_top, cover_bottom, diameter_stirrup, diameter) -> np.ndarray:
+    """Długość pręta górnego z odgięciami do dołu belki, jak length_bar(BeamLayout.top_bar.points) [mm]"""
+    diameter = np.asarray(diameter, dtype=float)
+    bending = bar_placement.bar_bending(diameter)
+    length = width_support_left + beam_span + width_support_right
+    leg = beam_height - cover_top - diameter_stirrup - 0.5 * diameter - bending - cover_bottom
+    straight = length - cover_view_right - cover_view_left - diameter - 2 * bending
+    # długość odcinka jak w length_bar - również dla odgięcia dłuższego niż ramię pręta w niskiej belce
+    return np.round(2 * np.abs(leg) + np.abs(straight) + 2 * (2 * (90 / 360) * math.pi * bending))
+
+
+def length_bottom_bar(beam_span, width_support_left, width_support_right, cover_view_left,
+                      cover_view_right) -> np.ndarray:
+    """Długość prostego pręta dolnego, jak length_bar(BeamLayout.bottom_bar.points) [mm]"""
+    return np.round(np.abs(np.asarray(width_support_left + beam_span + width_support_right - cover_view_right
+                                      - cover_view_left, dtype=float)))
+
+
+def area_range(value) -> tuple[float, float]:
+    """Wymagane pole przekroju: liczba (minimum) lub [minimum, maksimum]"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        minimum, maximum = value, math.inf
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        minimum, maximum = value
+    else:
+        raise ValueError(f"{value} is not an area or [min, max] area range")
+    if not isinstance(minimum, (int, float)) or not isinstance(maximum, (int, float)) or not 0 <= minimum <= maximum:
+        raise ValueError(f"{value} is not a valid area range")
+    return float(minimum), float(maximum)
+
+
+def _check(parameters: dict) -> list[str]:
+    """Błędy parametrów potrzebnych do doboru zbrojenia"""
+    if not isinstance(parameters, dict):
+        return ['parameters must be a json object']
+    values = {**validation.DEFAULTS, **parameters}
+    errors = [f"missing parameter '{key}'" for key in (*PARAMETERS, *AREAS) if key not in values]
+    for key in PARAMETERS:
+        if key in values:
+            try:
+                validation.is_valid_value(values[key], *validation.LIMITS.get(key, (0, 99999)))
+            except (ValueError, TypeError) as error:
+                errors.append(f"{key}: {error}")
+    for key in AREAS:
+        if key in values:
+            try:
+                area_range(values[key])
+            except (ValueError, TypeError) as error:
+                errors.append(f"{key}: {error}")
+    return errors
+
+
+def optimize_arrays(beams: dict[str, np.ndarray], area_top: np.ndarray, area_bottom: np.ndarray,
+                    diameters=DIAMETERS, quantities=QUANTITIES, limit: int = 5) -> list[list[Solution]]:
+    """
+    Dobór zbrojenia serii belek, beams - parametry PARAMETERS jako tablice o długości liczby belek,
+    area_top, area_bottom - wymagane pole przekroju, tablice (belki, 2): minimum, maksimum.
+    Zwraca do limit najlżejszych rozwiązań każdej belki.
+    """
+    beams = {key: np.asarray(value, dtype=float) for key, value in beams.items()}
+    count = len(beams['beam_span'])
+    # kandydaci: (średnica, liczba prętów) - wspólni dla obu stron przekroju
+    diameter, quantity = (grid.ravel() for grid in np.meshgrid(np.asarray(diameters, dtype=float),
+                                                                np.asarray(quantities, dtype=int), indexing='ij'))
+    area = bar_area(diameter, quantity)
+    mass_1m = mass_1m_bar(diameter)
+
+    lengths = {
+        'top': length_top_bar(*(beams[key][:, None] for key in (
+            'beam_span', 'beam_height', 'width_support_left', 'width_support_right', 'cover_view_left',
+            'cover_view_right', 'cover_top', 'cover_bottom', 'diameter_stirrup')), diameter[None, :]),
+        'bottom': np.broadcast_to(length_bottom_bar(*(beams[key][:, None] for key in (
+            'beam_span', 'width_support_left', 'width_support_right', 'cover_view_left', 'cover_view_right'))),
+            (count, len(diameter))),
+    }
+    sides = {}
+    for side, required, cover in (('top', area_top, 'cover_top'), ('bottom', area_bottom, 'cover_bottom')):
+        required = np.asarray(required, dtype=float).reshape(count, 2)
+        # rozmieszczenie liczone tylko dla kandydatów o polu przekroju z wymaganego zakresu
+        selected = (area[None, :] >= required[:, :1]) & (area[None, :] <= required[:, 1:])
+        rows, columns = np.nonzero(selected)
+        placement = bar_placement.solve(beams['beam_width'][rows], beams['cover_left'][rows],
+                                        beams['cover_right'][rows], beams[cover][rows],
+                                        beams['diameter_stirrup'][rows], diameter[columns], quantity[columns])
+        mass = np.full(selected.shape, np.inf)
+        mass[rows, columns] = np.where(placement.fits_width, quantity[columns] * lengths[side][rows, columns] / 1000
+                                       * mass_1m[columns] * beams['number_of_elements'][rows], np.inf)
+        depth = np.zeros(selected.shape)
+        depth[rows, columns] = placement.depth
+        layers = np.zeros(selected.shape, dtype=int)
+        layers[rows, columns] = placement.layers
+        sides[side] = (mass, depth, layers)
+
+    spacing = bar_placement.spacing_between_bars(diameter)
+    candidates = len(diameter)
+    chunk = max(1, MAX_PAIRS // (candidates * candidates))
+    solutions = []
+    for start in range(0, count, chunk):
+        part = slice(start, start + chunk)
+        mass_top, depth_top, layers_top = (values[part, :, None] for values in sides['top'])
+        mass_bottom, depth_bottom, layers_bottom = (values[part, None, :] for values in sides['bottom'])
+        # warstwy prętów górnych i dolnych mieszczą się w wysokości przekroju, jak bar_placement.solve_section
+        clearance = beams['beam_height'][part, None, None] - depth_top - depth_bottom
+        fits_height = clearance >= np.maximum(spacing[:, None], spacing[None, :])
+        mass = np.where(fits_height, mass_top + mass_bottom, np.inf).reshape(len(clearance), -1)
+        order = np.argsort(mass, axis=1, kind='stable')[:, :limit]
+        for row, indices in enumerate(order):
+            beam = []
+            for index in indices:
+                if not np.isfinite(mass[row, index]):
+                    break
+                top, bottom = divmod(index.item(), candidates)
+                beam.append(Solution(int(diameter[top]), int(quantity[top]), int(diameter[bottom]),
+                                     int(quantity[bottom]), round(area[top].item(), 1),
+                                     round(area[bottom].item(), 1), int(layers_top[row, top, 0]),
+                                     int(layers_bottom[row, 0, bottom]), round(mass[row, index].item(), 2)))
+            solutions.append(beam)
+    return solutions
+
+
+def optimize(beams: list[dict], diameters=DIAMETERS, quantities=QUANTITIES, limit: int = 5,
+             workers: int = 1) -> list[BeamOptimization]:
+    """
+    Dobór zbrojenia belek o parametrach jak dla DxfElement uzupełnionych o required_area_top i required_area_bottom.
+    Wszystkie belki liczone są jednym wywołaniem NumPy, workers > 1 - podział belek na paczki liczone w puli procesów.
+    Wyniki zwracane są w kolejności parametrów wejściowych.
+    """
+    beams = list(beams)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(beams) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        size = -(-len(beams) // workers)
+        chunks = [beams[start:start + size] for start in range(0, len(beams), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(optimize, chunk, diameters, quantities, limit) for chunk in chunks]
+            results = [result for future in futures for result in future.result()]
+        for index, result in enumerate(results):
+            result.index = index
+        return results
+
+    results = [BeamOptimization(index, str(parameters.get('name', validation.DEFAULTS['name']))
+                                if isinstance(parameters, dict) else '') for index, parameters in enumerate(beams)]
+    valid = []
+    for result, parameters in zip(results, beams):
+        errors = _check(parameters)
+        if errors:
+            result.error = '; '.join(errors)
+        else:
+            valid.append((result, {**validation.DEFAULTS, **parameters}))
+    if not valid:
+        return results
+    solutions = optimize_arrays(
+        {key: np.array([parameters[key] for _, parameters in valid]) for key in PARAMETERS},
+        np.array([area_range(parameters['required_area_top']) for _, parameters in valid]),
+        np.array([area_range(parameters['required_area_bottom']) for _, parameters in valid]),
+        diameters, quantities, limit)
+    for (result, _), beam in zip(valid, solutions):
+        result.solutions = beam
+        if not beam:
+            result.error = 'no reinforcement fits the section for the required area'
+    return results
+
+
+def optimized_parameters(beams: list[dict], results: list[BeamOptimization]) -> list[dict]:
+    """Parametry belek z najlżejszym zbrojeniem, bez wymaganego pola przekroju - gotowe dla DxfElement"""
+    return [{**{key: value for key, value in parameters.items() if key not in AREAS}, **result.best.parameters()}
+            for parameters, result in zip(beams, results) if result.ok]
+
+
+def load_parameters(path: str) -> list[dict]:
+    """Wczytanie parametrów belek z pliku .json (lista) lub .jsonl (jedna belka w linii)"""
+    with open(path, encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in file if line.strip()]
+        return json.load(file)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Dobór zbrojenia głównego belek o najmniejszej masie stali')
+    parser.add_argument('parameters', help='plik .json (lista parametrów) lub .jsonl, z required_area_top '
+                                           'i required_area_bottom')
+    parser.add_argument('-n', '--solutions', type=int, default=3, help='liczba rozwiązań każdej belki, default=3')
+    parser.add_argument('-d', '--diameters', default=None,
+                        help=f"średnice prętów oddzielone przecinkami, default={','.join(map(str, DIAMETERS))}")
+    parser.add_argument('-w', '--workers', type=int, default=1, help='liczba procesów, default=1')
+    parser.add_argument('-o', '--output', default=None, help='zapis parametrów belek z najlżejszym zbrojeniem .jsonl')
+    args = parser.parse_args(argv)
+
+    diameters = DIAMETERS if args.diameters is None else tuple(int(value) for value in args.diameters.split(','))
+    beams = load_parameters(args.parameters)
+    start = time.perf_counter()
+    results = optimize(beams, diameters, limit=args.solutions, workers=args.workers)
+    seconds = time.perf_counter() - start
+
+    for result in results:
+        if not result.ok:
+            print(f"[{result.index}] {result.name}: {result.error}", file=sys.stderr)
+            continue
+        print(f"{result.name}:")
+        for solution in result.solutions:
+            print(f"    góra {solution.quantity_main_top}ø{solution.diameter_main_top} ({solution.area_top:.0f} mm2, "
+                  f"warstw: {solution.layers_top}), dół {solution.quantity_main_bottom}ø"
+                  f"{solution.diameter_main_bottom} ({solution.area_bottom:.0f} mm2, warstw: {solution.layers_bottom})"
+                  f", masa {solution.mass:.2f} kg")
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            for parameters in optimized_parameters(beams, results):
+                file.write(json.dumps(parameters, ensure_ascii=False) + '\n')
+        print(f"Zapisuje {args.output}")
+    failed = sum(not result.ok for result in results)
+    print(f"{len(results) - failed}/{len(results)} OK, {seconds:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Zestawienie stali całego projektu bezpośrednio z parametrów belek, bez rysowania i bez importu ezdxf.
+Zapis do CSV (strumieniowo, belka po belce) lub DOCX (python-docx).
+
+    python schedule_export.py belki.jsonl -o zestawienie.csv
+    python schedule_export.py belki.jsonl -o zestawienie.docx
+"""
+import argparse
+import csv
+import sys
+import time
+from typing import Iterable, Iterator
+
+import validation
+from bar_registry import BarPosition, BarRegistry
+from beam_layout import BeamLayout, ContinuousBeamLayout, mass_1m_bar
+
+POSITION_COLUMNS = ('name_element', 'number', 'diameter', 'steel_grade', 'length', 'quantity_bar',
+                    'number_of_elements', 'total_quantity', 'total_length', 'mass')
+SUMMARY_COLUMNS = ('steel_grade', 'diameter', 'total_length', 'mass_1m', 'mass')
+
+
+def beam_schedule(parameters: dict) -> Iterator[BarPosition]:
+    """Pozycje zestawienia jednej belki, parametry jak dla DxfElement"""
+    errors = validation.validate(parameters)
+    if errors:
+        raise ValueError(f"{parameters.get('name', 'Belka')}: {'; '.join(errors)}")
+    layout_class = ContinuousBeamLayout if 'spans' in parameters else BeamLayout
+    layout = layout_class.from_parameters({**validation.DEFAULTS, **parameters})
+    # identyczne pręty belki (np. przęseł belki ciągłej) w jednej pozycji
+    yield from BarRegistry(layout.schedule, layout.number_of_elements)
+
+
+def project_schedule(parameters: Iterable[dict], registry: BarRegistry = None) -> Iterator[BarPosition]:
+    """
+    Pozycje zestawienia wszystkich belek, belka po belce.
+    registry - rejestr uzupełniany o pozycje, do podsumowania wg klasy stali i średnicy; belki o tej samej nazwie
+    i różnej liczbie elementów mają w rejestrze osobne pozycje, podsumowanie zgodne jest z sumą pozycji
+    """
+    for beam in parameters:
+        for position in beam_schedule(beam):
+            if registry is not None:
+                registry.add(position.row, position.number_of_elements)
+            yield position
+
+
+def _position_values(position: BarPosition) -> tuple:
+    row = position.row
+    return (row.name_element, row.number, row.diameter, row.steel_grade, row.length, row.quantity_bar,
+            position.number_of_elements, position.total_quantity, position.total_length, position.mass)
+
+
+def _summary_values(registry: BarRegistry) -> Iterator[tuple]:
+    for steel_grade, diameter in registry.columns:
+        yield (steel_grade, diameter, round(registry.total_length(steel_grade, diameter), 2), mass_1m_bar(diameter),
+               registry.mass(steel_grade, diameter))
+
+
+def write_csv(parameters: Iterable[dict], path: str, summary: bool = True, delimiter: str = ';') -> BarRegistry:
+    """
+    Zapis zestawienia do CSV, pozycje zapisywane są zaraz po przeliczeniu belki.
+    summary - podsumowanie wg klasy stali i średnicy pod pozycjami, oddzielone pustym wierszem
+    """
+    registry = BarRegistry()
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file, delimiter=delimiter)
+        writer.writerow(POSITION_COLUMNS)
+        writer.writerows(_position_values(position) for position in project_schedule(parameters, registry))
+        if summary:
+            writer.writerow(())
+            writer.writerow(SUMMARY_COLUMNS)
+            writer.writerows(_summary_values(registry))
+            writer.writerow(('total', '', '', '', round(registry.total_mass, 1)))
+    return registry
+
+
+def write_docx(parameters: Iterable[dict], path: str, title: str = 'Zestawienie stali') -> BarRegistry:
+    """Zapis zestawienia do DOCX - tabela pozycji i tabela podsumowania"""
+    # python-docx potrzebny tylko dla tego formatu
+    from docx import Document
+
+    registry = BarRegistry()
+    document = Document()
+    document.add_heading(title, level=1)
+    _add_docx_table(document, POSITION_COLUMNS,
+                    (_position_values(position) for position in project_schedule(parameters, registry)))
+    document.add_paragraph()
+    _add_docx_table(document, SUMMARY_COLUMNS, _summary_values(registry))
+    document.add_paragraph(f"Masa całkowita: {round(registry.total_mass, 1)} kg")
+    document.save(path)
+    return registry
+
+
+def _add_docx_table(document, columns: tuple, rows: Iterable[tuple]):
+    """
+    Tabela DOCX. Wiersze kopiowane są z wiersza wzorcowego na poziomie XML -
+    Table.add_row() i Cell.text są zbyt wolne dla tysięcy pozycji.
+    """
+    from copy import deepcopy
+    from docx.oxml.ns import qn
+
+    table = document.add_table(rows=2, cols=len(columns))
+    for cell, text in zip(table.rows[0].cells, columns):
+        cell.text = text
+    for cell in table.rows[1].cells:
+        cell.text = '-'
+    template = table.rows[1]._tr
+    tbl = table._tbl
+    for values in rows:
+        tr = deepcopy(template)
+        for element, value in zip(tr.iter(qn('w:t')), values):
+            element.text = str(value)
+        tbl.append(tr)
+    tbl.remove(template)
+    return table
+
+
+def main(argv: list[str] = None) -> int:
+    # import lokalny - main.py nie importuje ezdxf
+    from main import load_parameters
+
+    parser = argparse.ArgumentParser(description='Zestawienie stali projektu bez generowania rysunków')
+    parser.add_argument('parameters', help='plik .json (belka lub lista belek) lub .jsonl')
+    parser.add_argument('-o', '--output', required=True, help='plik wynikowy .csv lub .docx')
+    parser.add_argument('--no-summary', action='store_true', help='CSV bez podsumowania wg średnic')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    parameters = load_parameters(args.parameters)
+    try:
+        if args.output.endswith('.docx'):
+            registry = write_docx(parameters, args.output)
+        else:
+            registry = write_csv(parameters, args.output, summary=not args.no_summary)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"Zapisuje {args.output}, belek: {len(parameters)}, pozycji: {len(registry)}, "
+          f"masa: {round(registry.total_mass, 1)} kg, {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Lokalna usługa HTTP generowania belek.
+Procesy robocze są uruchamiane raz, z zaimportowanym ezdxf i przygotowanym generatorem, więc żądanie
+kosztuje tylko rysowanie belki. Kolejka jest ograniczona - przy pełnej kolejce usługa odpowiada 429.
+
+    python service.py --port 8080 --workers 4
+
+    POST /beam      parametry belki (json) -> plik DXF
+    GET  /health    stan usługi (json)
+    GET  /metrics   liczniki w formacie Prometheus
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import validation
+
+MAX_BODY = 1024 ** 2
+STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+          429: 'Too Many Requests', 500: 'Internal Server Error'}
+
+# tworzenie belki procesu roboczego (beam_generator.new_element), importowane przy starcie procesu
+_new_element = None
+
+
+def _init_worker():
+    """Start procesu roboczego - import ezdxf i rysowanie belki próbnej, kolejne żądania korzystają z pamięci"""
+    global _new_element
+    from beam_generator import new_element
+    from main import EXAMPLE
+    new_element(**EXAMPLE, autosave=False).to_bytes()
+    _new_element = new_element
+
+
+def _render(parameters: dict) -> tuple[bytes, dict[str, float]]:
+    """Plik DXF belki i czasy etapów rysowania"""
+    element = _new_element(**parameters, autosave=False)
+    return element.to_bytes(), element.timings
+
+
+@dataclass
+class Metrics:
+    started: float = field(default_factory=time.time)
+    requests: dict = field(default_factory=dict)
+    generated: int = 0
+    generation_seconds: float = 0
+    # czas etapów rysowania w procesach roboczych [s]
+    phase_seconds: dict = field(default_factory=dict)
+    in_flight: int = 0
+
+    def count(self, status: int):
+        self.requests[status] = self.requests.get(status, 0) + 1
+
+    def add_phases(self, timings: dict[str, float]):
+        for phase, seconds in timings.items():
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0) + seconds
+
+
+class BeamService:
+    """
+    Usługa HTTP nad pulą procesów roboczych.
+    workers - liczba procesów, max_pending - maksymalna liczba żądań w toku (rysowane + oczekujące)
+    """
+
+    def __init__(self, workers: int = None, max_pending: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.metrics = Metrics()
+        self.executor = None
+
+    def start_pool(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        # uruchomienie wszystkich procesów przed pierwszym żądaniem
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080):
+        self.start_pool()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Usługa działa na http://{host}:{port}, procesów: {self.workers}, kolejka: {self.max_pending}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split(maxsplit=2)
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY:
+                    await self.respond(writer, 413, {'error': 'request body too large'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload, extra = await self.dispatch(method, path.split('?')[0], body)
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.strip().upper() == 'HTTP/1.1')
+                await self.respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, object, dict]:
+        if path == '/beam':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}, {}
+            return await self.generate(body)
+        if path == '/health' and method == 'GET':
+            return 200, {'status': 'ok', 'workers': self.workers, 'in_flight': self.metrics.in_flight,
+                         'max_pending': self.max_pending}, {}
+        if path == '/metrics' and method == 'GET':
+            return 200, self.prometheus(), {'Content-Type': 'text/plain; version=0.0.4'}
+        return 404, {'error': f'unknown path {path}'}, {}
+
+    async def generate(self, body: bytes) -> tuple[int, object, dict]:
+        try:
+            parameters = json.loads(body)
+        except ValueError as error:
+            return 400, {'error': f'invalid json: {error}'}, {}
+        if not isinstance(parameters, dict):
+            return 400, {'error': 'parameters must be a json object'}, {}
+        errors = validation.validate(parameters)
+        if errors:
+            return 400, {'errors': errors}, {}
+        # ograniczenie kolejki - nadmiar żądań odrzucany od razu zamiast czekać bez końca
+        if self.metrics.in_flight >= self.max_pending:
+            return 429, {'error': 'generation queue is full'}, {'Retry-After': '1'}
+
+        self.metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            output, timings = await asyncio.get_running_loop().run_in_executor(self.executor, _render, parameters)
+        except ValueError as error:
+            # warunki sprawdzane dopiero na modelu belki, np. pręty niemieszczące się w przekroju
+            return 400, {'errors': str(error).split('; ')}, {}
+        except Exception as error:
+            return 500, {'error': f'{type(error).__name__}: {error}'}, {}
+        finally:
+            self.metrics.in_flight -= 1
+        self.metrics.generated += 1
+        self.metrics.generation_seconds += time.perf_counter() - start
+        self.metrics.add_phases(timings)
+        name = parameters.get('name', validation.DEFAULTS['name'])
+        return 200, output, {'Content-Type': 'application/dxf',
+                             'Content-Disposition': f"attachment; filename*=UTF-8''{_quote(name)}.dxf"}
+
+    async def respond(self, writer: asyncio.StreamWriter, status: int, payload, extra: dict = None,
+                      keep_alive: bool = True):
+        self.metrics.count(status)
+        headers = {'Content-Type': 'application/json'}
+        headers.update(extra or {})
+        if isinstance(payload, dict):
+            payload = json.dumps(payload, ensure_ascii=False).encode()
+        elif isinstance(payload, str):
+            payload = payload.encode()
+        headers['Content-Length'] = str(len(payload))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        head = f"HTTP/1.1 {status} {STATUS[status]}\r\n" + ''.join(f"{key}: {value}\r\n"
+                                                                  for key, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + payload)
+        await writer.drain()
+
+    def prometheus(self) -> str:
+        metrics = self.metrics
+        lines = ['# TYPE beam_requests_total counter']
+        lines += [f'beam_requests_total{{status="{status}"}} {count}'
+                  for status, count in sorted(metrics.requests.items())]
+        lines += ['# TYPE beam_generated_total counter', f'beam_generated_total {metrics.generated}',
+                  '# TYPE beam_generation_seconds_total counter',
+                  f'beam_generation_seconds_total {metrics.generation_seconds:.6f}',
+                  '# TYPE beam_phase_seconds_total counter']
+        lines += [f'beam_phase_seconds_total{{phase="{phase}"}} {seconds:.6f}'
+                  for phase, seconds in metrics.phase_seconds.items()]
+        lines += ['# TYPE beam_in_flight gauge', f'beam_in_flight {metrics.in_flight}',
+                  '# TYPE beam_max_pending gauge', f'beam_max_pending {self.max_pending}',
+                  '# TYPE beam_workers gauge', f'beam_workers {self.workers}',
+                  '# TYPE beam_uptime_seconds gauge', f'beam_uptime_seconds {time.time() - metrics.started:.0f}']
+        return '\n'.join(lines) + '\n'
+
+
+def _quote(name: str) -> str:
+    from urllib.parse import quote
+    return quote(name)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Usługa HTTP generowania belek DXF')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('-w', '--workers', type=int, default=None, help='liczba procesów, default=liczba rdzeni')
+    parser.add_argument('-q', '--queue', type=int, default=None,
+                        help='maksymalna liczba żądań w toku, default=4 x liczba procesów')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(BeamService(args.workers, args.queue).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
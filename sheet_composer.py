@@ -0,0 +1,278 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Arkusze wydruku projektu: rysunki wielu belek rozmieszczane automatycznie na arkuszach formatu A.
+Wymiary rysunków znane są z modelu belki (BeamLayout.extents), bez rysowania. Rysunki układane są w półkach
+(first fit decreasing height), półki na arkuszach (first fit decreasing) - wybór pierwszej półki i arkusza
+z wolnym miejscem w czasie O(log n), łącznie O(n log n) dla n belek.
+Rysunek, który nie mieści się na wybranym formacie, trafia na najmniejszy większy format.
+Każdy arkusz ma jedno okno rzutni w skali 1:scale obejmujące jego obszar rysunku i pole na tabelkę rysunkową
+w prawym dolnym narożniku. W modelu arkusze leżą obok siebie, rysunki belek w miejscach jak na arkuszach.
+
+    python sheet_composer.py projekt.jsonl -o projekt.dxf -s A3 --scale 20
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from typing import NamedTuple, Sequence
+
+import validation
+from beam_layout import BeamLayout, ContinuousBeamLayout, Point
+
+# formaty arkuszy od najmniejszego, wymiary poziomo [mm]
+SHEETS = {'A4': (297, 210), 'A3': (420, 297), 'A2': (594, 420), 'A1': (841, 594), 'A0': (1189, 841)}
+# margines ramki arkusza [mm]
+MARGIN = 10
+# pole tabelki rysunkowej w prawym dolnym narożniku (szerokość, wysokość) [mm]
+TITLE_BLOCK = (180, 50)
+# odstęp pomiędzy rysunkami i od ramki [mm]
+GAP = 5
+# odstęp pomiędzy arkuszami w modelu [jednostki rysunku]
+SHEET_SPACING = 2000
+
+
+class Placement(NamedTuple):
+    """Rysunek belki index na arkuszu: lewy dolny narożnik i wymiary na papierze [mm]"""
+    index: int
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+@dataclass
+class Sheet:
+    number: int
+    format: str
+    scale: float
+    placements: list[Placement]
+    # lewy dolny narożnik arkusza w modelu
+    origin: Point = (0, 0)
+
+    @property
+    def size(self) -> tuple[float, float]:
+        return SHEETS[self.format]
+
+    @property
+    def area(self) -> tuple[float, float, float, float]:
+        """obszar rysunku na papierze (x, y, szerokość, wysokość) - wewnątrz ramki, razem z miejscem obok tabelki"""
+        return drawing_area(self.format)
+
+    def model_point(self, x: float, y: float) -> Point:
+        """Punkt arkusza [mm] w modelu"""
+        return self.origin[0] + x * self.scale, self.origin[1] + y * self.scale
+
+
+def drawing_area(sheet: str) -> tuple[float, float, float, float]:
+    """Obszar rysunku arkusza wewnątrz ramki (x, y, szerokość, wysokość) [mm], razem z miejscem obok tabelki"""
+    width, height = SHEETS[sheet]
+    return MARGIN + GAP, MARGIN + GAP, width - 2 * (MARGIN + GAP), height - 2 * (MARGIN + GAP)
+
+
+def fits(sheet: str, width: float, height: float) -> bool:
+    """Czy rysunek o wymiarach na papierze [mm] mieści się na arkuszu - nad tabelką lub obok niej"""
+    _, _, area_width, area_height = drawing_area(sheet)
+    return width <= area_width and (height <= area_height - TITLE_BLOCK[1]
+                                    or width <= area_width - TITLE_BLOCK[0] and height <= area_height)
+
+
+class _FirstFit:
+    """
+    Pojemniki (półki lub arkusze) w kolejności otwarcia - pierwszy pojemnik z wolnym miejscem >= size
+    wyszukiwany w drzewie maksimów w czasie O(log n)
+    """
+
+    def __init__(self, count: int):
+        self.size = 1
+        while self.size < count:
+            self.size *= 2
+        self.free = [-1.0] * (2 * self.size)
+        self.count = 0
+
+    def find(self, size: float) -> int:
+        """indeks pierwszego pojemnika, -1 - brak miejsca"""
+        if self.free[1] < size:
+            return -1
+        node = 1
+        while node < self.size:
+            node = 2 * node if self.free[2 * node] >= size else 2 * node + 1
+        return node - self.size
+
+    def set(self, index: int, free: float):
+        node = index + self.size
+        self.free[node] = free
+        while node > 1:
+            node //= 2
+            self.free[node] = max(self.free[2 * node], self.free[2 * node + 1])
+
+    def open(self, free: float) -> int:
+        self.count += 1
+        self.set(self.count - 1, free)
+        return self.count - 1
+
+
+def _pack_format(items: list[tuple[int, float, float]], sheet: str) -> list[list[Placement]]:
+    """Rysunki (index, szerokość, wysokość) na arkuszach jednego formatu, wynik - rozmieszczenie kolejnych arkuszy"""
+    x0, y0, width, height = drawing_area(sheet)
+    block_width, block_height = TITLE_BLOCK
+    # każdy rysunek zajmuje swój wymiar z odstępem, obszar powiększony o odstęp za ostatnim rysunkiem
+    items = sorted(items, key=lambda item: -item[2])
+    shelves = _FirstFit(len(items))
+    shelf_items, shelf_used, shelf_widths, shelf_heights = [], [], [], []
+    for index, item_width, item_height in items:
+        shelf = shelves.find(item_width + GAP)
+        if shelf < 0:
+            # półka wyższa niż miejsce nad tabelką musi zmieścić się obok niej
+            shelf_width = width if item_height <= height - block_height else width - block_width
+            shelf = shelves.open(shelf_width + GAP)
+            shelf_items.append([])
+            shelf_used.append(0)
+            shelf_widths.append(shelf_width + GAP)
+            # rysunki posortowane malejąco - pierwszy rysunek wyznacza wysokość półki
+            shelf_heights.append(item_height + GAP)
+        shelf_items[shelf].append((index, shelf_used[shelf], item_width, item_height))
+        shelf_used[shelf] += item_width + GAP
+        shelves.set(shelf, shelf_widths[shelf] - shelf_used[shelf])
+
+    # półki w kolejności otwarcia mają nierosnącą wysokość, układane są od góry arkusza;
+    # wolna wysokość arkusza dla półek szerokich (nad tabelką) i wąskich (mieszczących się obok tabelki)
+    wide, narrow = _FirstFit(len(shelf_heights)), _FirstFit(len(shelf_heights))
+    placements, sheet_used = [], []
+    for shelf, shelf_height in enumerate(shelf_heights):
+        sheets = narrow if shelf_used[shelf] <= width - block_width + GAP else wide
+        index = sheets.find(shelf_height)
+        if index < 0:
+            index = wide.open(height + GAP - block_height)
+            narrow.open(height + GAP)
+            placements.append([])
+            sheet_used.append(0)
+        top = y0 + height - sheet_used[index]
+        # rysunki wyrównane do góry półki
+        placements[index] += [Placement(item, x0 + x, top - item_height, item_width, item_height)
+                              for item, x, item_width, item_height in shelf_items[shelf]]
+        sheet_used[index] += shelf_height
+        wide.set(index, height + GAP - block_height - sheet_used[index])
+        narrow.set(index, height + GAP - sheet_used[index])
+    return placements
+
+
+def pack(sizes: Sequence[tuple[float, float]], sheet: str = 'A3', scale: float = 20,
+         start_point: Point = (0, 0)) -> list[Sheet]:
+    """
+    Rozmieszczenie rysunków na najmniejszej liczbie arkuszy, sizes - wymiary rysunków w modelu (szerokość, wysokość).
+    Rysunki większe od obszaru rysunku arkusza sheet trafiają na arkusze najmniejszego formatu, na którym się mieszczą.
+    Arkusze leżą w modelu obok siebie od start_point.
+    """
+    validation.is_valid_choice(sheet, tuple(SHEETS))
+    validation.is_valid_value(scale, 1)
+    formats = tuple(SHEETS)[tuple(SHEETS).index(sheet):]
+    groups = {name: [] for name in formats}
+    for index, (width, height) in enumerate(sizes):
+        width, height = width / scale, height / scale
+        for name in formats:
+            if fits(name, width, height):
+                groups[name].append((index, width, height))
+                break
+        else:
+            raise ValueError(f"drawing {index} ({width:.0f} x {height:.0f} mm) does not fit on {formats[-1]} "
+                             f"at 1:{scale}")
+
+    sheets = []
+    x = start_point[0]
+    for name, items in groups.items():
+        for placements in _pack_format(items, name):
+            sheets.append(Sheet(number=len(sheets) + 1, format=name, scale=scale, placements=placements,
+                                origin=(x, start_point[1])))
+            x += SHEETS[name][0] * scale + SHEET_SPACING
+    return sheets
+
+
+def add_sheets(drawing, sheets: Sequence[Sheet], title: str = '', name: str = 'Arkusz',
+               layer: str = 'KONEC-Obrys', style: str = 'KONEC-Tekst'):
+    """
+    Arkusze w rysunku ezdxf: ramka, pole tabelki rysunkowej z tytułem, numerem arkusza i skalą
+    oraz okno rzutni obszaru rysunku w skali arkusza
+    """
+    from ezdxf.enums import TextEntityAlignment
+
+    for sheet in sheets:
+        width, height = sheet.size
+        x, y, area_width, area_height = sheet.area
+        layout = drawing.layouts.new(f"{name} {sheet.number}")
+        layout.page_setup(size=(width, height), margins=(0, 0, 0, 0), units="mm", scale=(1, 1))
+        attributes = {'layer': layer}
+        layout.add_lwpolyline([(MARGIN, MARGIN), (width - MARGIN, MARGIN), (width - MARGIN, height - MARGIN),
+                               (MARGIN, height - MARGIN)], dxfattribs={**attributes, 'closed': True})
+
+        block_width, block_height = TITLE_BLOCK
+        left, right, top = width - MARGIN - block_width, width - MARGIN, MARGIN + block_height
+        layout.add_lwpolyline([(left, MARGIN), (left, top), (right, top)], dxfattribs=attributes)
+        layout.add_line((left, MARGIN + 15), (right, MARGIN + 15), dxfattribs=attributes)
+        text = {**attributes, 'style': style}
+        layout.add_text(title, dxfattribs={**text, 'height': 5}).set_placement(
+            (left + 5, top - 5), align=TextEntityAlignment.TOP_LEFT)
+        layout.add_text(f"{sheet.format}  1:{sheet.scale:g}", dxfattribs={**text, 'height': 3.5}).set_placement(
+            (left + 5, MARGIN + 7.5), align=TextEntityAlignment.MIDDLE_LEFT)
+        layout.add_text(f"{name} {sheet.number}/{len(sheets)}", dxfattribs={**text, 'height': 3.5}).set_placement(
+            (right - 5, MARGIN + 7.5), align=TextEntityAlignment.MIDDLE_RIGHT)
+
+        center = (x + area_width / 2, y + area_height / 2)
+        layout.add_viewport(center, (area_width, area_height), sheet.model_point(*center),
+                            area_height * sheet.scale, dxfattribs=attributes)
+
+
+def drawing_size(parameters: dict) -> tuple[float, float]:
+    """Wymiary rysunku belki w modelu (szerokość, wysokość) z BeamLayout.extents"""
+    parameters = {**validation.DEFAULTS, **parameters}
+    layout_class = ContinuousBeamLayout if 'spans' in parameters else BeamLayout
+    (x_min, y_min), (x_max, y_max) = layout_class.from_parameters(parameters).extents
+    return x_max - x_min, y_max - y_min
+
+
+def compose(beams: Sequence[dict], filename: str, sheet: str = 'A3', scale: float = 20, title: str = '',
+            dxfversion: str = 'R2010') -> list[Sheet]:
+    """
+    Rysunek zbiorczy belek z arkuszami wydruku, zapis strumieniowy (streaming_writer).
+    Parametry belek sprawdzane są przed rysowaniem, zwraca rozmieszczenie belek na arkuszach.
+    """
+    for index, parameters in enumerate(beams):
+        errors = validation.validate(parameters)
+        if errors:
+            raise ValueError(f"beam {index}: {'; '.join(errors)}")
+    sheets = pack([drawing_size(parameters) for parameters in beams], sheet, scale)
+
+    from streaming_writer import StreamingDrawing
+    with StreamingDrawing(filename, dxfversion, setup=lambda drawing: add_sheets(drawing, sheets, title)) as drawing:
+        for page in sheets:
+            for placement in page.placements:
+                drawing.add(position=page.model_point(placement.x, placement.y), **beams[placement.index])
+    return sheets
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Rysunek zbiorczy belek na arkuszach formatu A')
+    parser.add_argument('parameters', help='plik .json (lista parametrów) lub .jsonl')
+    parser.add_argument('-o', '--output', default='projekt.dxf', help='plik .dxf, default=projekt.dxf')
+    parser.add_argument('-s', '--sheet', choices=tuple(SHEETS), default='A3', help='format arkusza, default=A3')
+    parser.add_argument('--scale', type=int, default=20, help='skala rysunków 1:scale, default=20')
+    parser.add_argument('-t', '--title', default='', help='tytuł w tabelce rysunkowej')
+    args = parser.parse_args(argv)
+
+    from batch_generator import load_parameters
+    start = time.perf_counter()
+    beams = load_parameters(args.parameters)
+    try:
+        sheets = compose(beams, args.output, args.sheet, args.scale, args.title)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    formats = {}
+    for sheet in sheets:
+        formats[sheet.format] = formats.get(sheet.format, 0) + 1
+    print(f"Arkuszy: {len(sheets)} ({', '.join(f'{name}: {count}' for name, count in formats.items())}), "
+          f"{time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
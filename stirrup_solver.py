@@ -0,0 +1,151 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Rozstaw strzemion liczony wektorowo (NumPy).
+Wszystkie kandydujące rozstawy drugiego rzędu sprawdzane są naraz, a funkcje przyjmują zarówno pojedynczą belkę,
+jak i tablice parametrów wielu belek - jedno wywołanie dla całej serii.
+Położenia strzemion liczone są od lica lewej podpory.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+# maksymalna reszta rozstawu drugiego rzędu - dzielona po równo na oba końce belki
+MAX_REMAINDER = 60
+# krok zmniejszania rozstawu strzemion drugiego rzędu
+SPACING_STEP = 5
+
+
+class StirrupSolution(NamedTuple):
+    """Rozwiązanie dla serii belek, każde pole to tablica o długości liczby belek"""
+    secondary_spacing: np.ndarray
+    range_first_row: np.ndarray
+    last_stirrup_left: np.ndarray
+    last_stirrup_right: np.ndarray
+    number_of_stirrups_of_the_second_row: np.ndarray
+
+
+def first_row_length(stirrup_range, stirrup_spacing) -> np.ndarray:
+    """Długość zajęta przez strzemiona pierwszego rzędu, 0 - brak pierwszego rzędu"""
+    stirrup_range = np.asarray(stirrup_range)
+    stirrup_spacing = np.asarray(stirrup_spacing)
+    active = (stirrup_range != 0) & (stirrup_spacing != 0)
+    spacing = np.where(active, stirrup_spacing, 1)
+    return np.where(active, np.ceil(stirrup_range / spacing) * spacing, 0)
+
+
+def secondary_spacing_limit(beam_height, secondary_stirrup_spacing, max_spacing: float = 400,
+                            step: float = SPACING_STEP) -> np.ndarray:
+    """
+    Rozstaw strzemion drugiego rzędu przyjmowany w modelu belki: ograniczony wysokością belki i max_spacing,
+    zaokrąglony w dół do step. 0 - brak rozstawu
+    """
+    height = np.asarray(beam_height, dtype=float)
+    spacing = np.floor(np.minimum(0.75 * height * 0.9, secondary_stirrup_spacing) / step) * step
+    return np.floor(np.minimum(np.minimum(spacing, max_spacing), np.trunc(height * 0.75)) / step) * step
+
+
+def secondary_spacing(free_length, spacing, max_remainder: float = MAX_REMAINDER,
+                      step: float = SPACING_STEP) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Największy rozstaw drugiego rzędu spacing, spacing - step, ..., dla którego reszta z podziału free_length
+    nie przekracza max_remainder. Zwraca (rozstaw, reszta).
+    """
+    free_length = np.atleast_1d(np.asarray(free_length, dtype=float))
+    spacing = np.atleast_1d(np.asarray(spacing, dtype=float))
+    if np.any(spacing <= 0):
+        raise ValueError("secondary stirrup spacing must be positive")
+
+    candidates = spacing[:, None] - step * np.arange(int(spacing.max() // step) + 1)
+    valid = candidates > 0
+    remainder = np.mod(free_length[:, None], np.where(valid, candidates, 1))
+    feasible = valid & (remainder <= max_remainder)
+    if not feasible.any(axis=1).all():
+        raise ValueError(f"no secondary stirrup spacing with remainder below {max_remainder}")
+    index = np.argmax(feasible, axis=1)
+    rows = np.arange(len(spacing))
+    return candidates[rows, index], remainder[rows, index]
+
+
+def solve(beam_span, first_row_stirrup_range_left, first_row_stirrup_spacing_left,
+          first_row_stirrup_range_right, first_row_stirrup_spacing_right,
+          secondary_stirrup_spacing) -> StirrupSolution:
+    """Rozstaw strzemion dla jednej lub wielu belek (parametry skalarne lub tablice)"""
+    beam_span, range_left, spacing_left, range_right, spacing_right, spacing = np.broadcast_arrays(
+        *(np.atleast_1d(value) for value in (beam_span, first_row_stirrup_range_left,
+                                             first_row_stirrup_spacing_left, first_row_stirrup_range_right,
+                                             first_row_stirrup_spacing_right, secondary_stirrup_spacing)))
+    first_row = first_row_length(range_left, spacing_left) + first_row_length(range_right, spacing_right)
+    spacing, range_first_row = secondary_spacing(beam_span - first_row, spacing)
+
+    left = (range_left != 0) & (spacing_left != 0)
+    right = (range_right != 0) & (spacing_right != 0)
+    last_left = np.where(left, range_first_row / 2 + _count(range_left, spacing_left) * spacing_left, 0)
+    last_right = np.where(right, beam_span - range_first_row / 2 - _count(range_right, spacing_right) * spacing_right,
+                          beam_span)
+    return StirrupSolution(secondary_spacing=spacing, range_first_row=range_first_row,
+                           last_stirrup_left=last_left, last_stirrup_right=last_right,
+                           number_of_stirrups_of_the_second_row=np.ceil((last_right - last_left) / spacing))
+
+
+def _count(stirrup_range, stirrup_spacing) -> np.ndarray:
+    """Liczba odstępów pierwszego rzędu, 0 - brak pierwszego rzędu"""
+    active = (stirrup_range != 0) & (stirrup_spacing != 0)
+    return np.where(active, np.ceil(stirrup_range / np.where(active, stirrup_spacing, 1)), 0).astype(int)
+
+
+class StirrupPositions(NamedTuple):
+    """Położenia strzemion serii belek: wszystkie belki w jednej tablicy, counts - liczba strzemion belek"""
+    values: np.ndarray
+    counts: np.ndarray
+
+    def rows(self) -> list[np.ndarray]:
+        """Położenia strzemion osobno dla każdej belki"""
+        return np.split(self.values, np.cumsum(self.counts)[:-1])
+
+
+def positions(beam_span, first_row_stirrup_range_left, first_row_stirrup_spacing_left,
+              first_row_stirrup_range_right, first_row_stirrup_spacing_right, secondary_stirrup_spacing,
+              solution: StirrupSolution = None) -> np.ndarray:
+    """Położenia strzemion jednej belki, posortowane i bez powtórzeń"""
+    return positions_batch(beam_span, first_row_stirrup_range_left, first_row_stirrup_spacing_left,
+                           first_row_stirrup_range_right, first_row_stirrup_spacing_right, secondary_stirrup_spacing,
+                           solution).values
+
+
+def positions_batch(beam_span, first_row_stirrup_range_left, first_row_stirrup_spacing_left,
+                    first_row_stirrup_range_right, first_row_stirrup_spacing_right, secondary_stirrup_spacing,
+                    solution: StirrupSolution = None) -> StirrupPositions:
+    """Położenia strzemion serii belek, w każdej belce posortowane i bez powtórzeń"""
+    parameters = (beam_span, first_row_stirrup_range_left, first_row_stirrup_spacing_left,
+                  first_row_stirrup_range_right, first_row_stirrup_spacing_right, secondary_stirrup_spacing)
+    if solution is None:
+        solution = solve(*parameters)
+    beam_span, range_left, spacing_left, range_right, spacing_right, _ = np.broadcast_arrays(
+        *(np.atleast_1d(value) for value in parameters))
+    spacing, range_first_row, last_left, last_right, _ = solution
+
+    count_left = np.where((range_left != 0) & (spacing_left != 0), _count(range_left, spacing_left) + 1, 0)
+    count_right = np.where((range_right != 0) & (spacing_right != 0), _count(range_right, spacing_right) + 1, 0)
+    count_secondary = np.maximum(np.trunc(
+        (beam_span - last_left - np.where(last_right > 0, beam_span - last_right, 0)) / spacing).astype(int) + 1, 0)
+    start_secondary = np.where(last_left > 0, last_left, range_first_row / 2)
+
+    # kolejno: lewy pierwszy rząd, drugi rząd, prawy pierwszy rząd od środka belki - wartości rosnące
+    counts = count_left + count_secondary + count_right
+    beam = np.repeat(np.arange(len(counts)), counts)
+    index = np.arange(len(beam)) - np.repeat(np.cumsum(counts) - counts, counts)
+    index_secondary = index - count_left[beam]
+    index_right = count_right[beam] - 1 - (index_secondary - count_secondary[beam])
+    values = np.where(
+        index < count_left[beam], range_first_row[beam] / 2 + index * spacing_left[beam],
+        np.where(index_secondary < count_secondary[beam], start_secondary[beam] + index_secondary * spacing[beam],
+                 beam_span[beam] - range_first_row[beam] / 2 - index_right * spacing_right[beam]))
+
+    same_beam = beam[1:] == beam[:-1]
+    if np.any(same_beam & (values[1:] < values[:-1])):
+        # nachodzące na siebie pierwsze rzędy
+        order = np.lexsort((values, beam))
+        values, beam = values[order], beam[order]
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = ~same_beam | (values[1:] != values[:-1])
+    return StirrupPositions(values[keep], np.bincount(beam[keep], minlength=len(counts)))
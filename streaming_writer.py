@@ -0,0 +1,131 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+import os
+import tempfile
+from io import StringIO
+from typing import Callable
+
+import ezdxf
+from ezdxf.addons import iterdxf
+from ezdxf.lldxf.tagwriter import TagWriter
+from ezdxf.tools.handle import HandleGenerator
+
+from beam_generator import ContinuousDxfElement, DxfElement
+from beam_layout import BeamLayout, ContinuousBeamLayout
+
+# $HANDSEED pliku zbiorczego - uchwyty encji zapisywanych strumieniowo muszą być mniejsze
+RESERVED_HANDSEED = 'FFFFFFF'
+
+
+class _StreamElement(DxfElement):
+    """Belka rysowana do tymczasowego rysunku - bez arkusza"""
+
+    def layout_new(self):
+        pass
+
+
+class _StreamContinuousElement(ContinuousDxfElement):
+    """Belka ciągła rysowana do tymczasowego rysunku - bez arkusza"""
+    layout_new = _StreamElement.layout_new
+
+
+class StreamingDrawing:
+    """
+    Rysunek zbiorczy wielu belek zapisywany strumieniowo.
+    Każda belka rysowana jest w osobnym, tymczasowym rysunku, a jej encje od razu trafiają do pliku,
+    więc zużycie pamięci nie rośnie z liczbą belek.
+    Belki układane są jedna pod drugą, spacing - odstęp pomiędzy rysunkami belek.
+    setup - dodatkowe elementy nagłówka pliku (np. arkusze sheet_composer), wywoływane z rysunkiem nagłówka.
+
+        with StreamingDrawing('projekt.dxf') as drawing:
+            for parameters in beams:
+                drawing.add(**parameters)
+    """
+
+    def __init__(self, filename: str, dxfversion: str = 'R2010', spacing: float = 1000,
+                 start_point_x: float = 0, start_point_y: float = 0,
+                 setup: Callable[[ezdxf.document.Drawing], None] = None):
+        self.filename = filename
+        self.dxfversion = dxfversion
+        self.spacing = spacing
+        self.start_point_x = start_point_x
+        self.cursor_y = start_point_y
+        self.count = 0
+
+        frame = self._frame()
+        if setup is not None:
+            setup(frame)
+        self._owner = frame.modelspace().layout_key
+        self._handles = HandleGenerator(str(frame.entitydb.handles))
+        frame.entitydb.handles.reset(RESERVED_HANDSEED)
+
+        descriptor, self._frame_filename = tempfile.mkstemp(suffix='.dxf')
+        os.close(descriptor)
+        frame.saveas(self._frame_filename)
+        del frame
+        self._source = iterdxf.opendxf(self._frame_filename)
+        self._writer = self._source.export(filename)
+        # IterDXFWriter.write() w ezdxf 0.17 zapisuje ATTRIB i SEQEND dwukrotnie, encje eksportowane są tutaj
+        self._text = StringIO()
+        self._tagwriter = TagWriter(self._text, self._source.dxfversion)
+
+    def _frame(self):
+        """Rysunek z warstwami, stylami i blokami, bez encji - nagłówek pliku zbiorczego"""
+        # tylko konfiguracja rysunku z DxfElement, bez rysowania belki
+        element = object.__new__(_StreamElement)
+        element.drawing = ezdxf.new(dxfversion=self.dxfversion)
+        element.initial_drawing()
+        element.layer_element()
+        element._create_block_bar_section()
+        return element.drawing
+
+    def add(self, position: tuple[float, float] = None, **parameters) -> BeamLayout:
+        """
+        Dodanie belki poniżej poprzedniej, zwraca model dodanej belki.
+        position - lewy dolny narożnik zasięgu rysunku belki, default=poniżej poprzedniej belki.
+        Parametr spans - belka ciągła.
+        """
+        # bloki tworzone podczas rysowania belki nie istnieją w zapisanym już nagłówku pliku
+        parameters.update(dxfversion=self.dxfversion, start_point_x=self.start_point_x if position is None else 0,
+                          start_point_y=0, stirrup_style='polyline')
+        continuous = 'spans' in parameters
+        layout_class = ContinuousBeamLayout if continuous else BeamLayout
+        (x_min, y_min), (_, y_max) = layout_class.from_parameters(parameters).extents
+        if position is None:
+            parameters['start_point_y'] = self.cursor_y - y_max
+        else:
+            parameters.update(start_point_x=position[0] - x_min, start_point_y=position[1] - y_min)
+
+        element = (_StreamContinuousElement if continuous else _StreamElement)(**parameters, autosave=False)
+        for entity in element.msp:
+            self._write(entity)
+        if position is None:
+            self.cursor_y += y_min - y_max - self.spacing
+        self.count += 1
+        return element.layout
+
+    def _write(self, entity):
+        """Zapis encji z nowym uchwytem, unikalnym w całym pliku zbiorczym"""
+        entity.dxf.handle = self._handles.next()
+        entity.dxf.owner = self._owner
+        if entity.dxftype() == 'INSERT' and entity.attribs_follow:
+            for attrib in entity.attribs:
+                attrib.dxf.handle = self._handles.next()
+                attrib.dxf.owner = self._owner
+            entity.seqend.dxf.handle = self._handles.next()
+            entity.seqend.dxf.owner = self._owner
+        self._text.seek(0)
+        self._text.truncate()
+        entity.export_dxf(self._tagwriter)
+        self._writer.write_data(self._text.getvalue().encode(self._source.encoding))
+
+    def close(self):
+        self._writer.close()
+        self._source.close()
+        os.remove(self._frame_filename)
+        print(f"Zapisuje {self.filename}, belek: {self.count}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,228 @@
+# Copyright (c) 2021-2022, Mogielski Mateusz - KONEC
+"""
+Walidacja parametrów belki bez importu ezdxf.
+Używana przez DxfElement oraz przez CLI (python main.py --validate) do szybkiego sprawdzenia parametrów.
+"""
+import re
+
+# zakresy wartości parametrów DxfElement: nazwa - (min, max)
+LIMITS = {
+    'first_row_stirrup_spacing_right': (0, 400),
+    'first_row_stirrup_spacing_left': (0, 400),
+    'first_row_stirrup_range_right': (0, 15000),
+    'first_row_stirrup_range_left': (0, 15000),
+    'number_of_elements': (1, 1000),
+    'cover_right': (5, 100),
+    'cover_left': (5, 100),
+    'beam_width': (100, 1000),
+    'cover_top': (5, 100),
+    'cover_bottom': (5, 100),
+    'cover_view_right': (5, 100),
+    'cover_view_left': (5, 100),
+    'diameter_main_bottom': (1, 100),
+    'quantity_main_top': (1, 40),
+    'diameter_main_top': (1, 100),
+    'quantity_main_bottom': (1, 40),
+    'diameter_stirrup': (1, 100),
+    'width_support_right': (50, 1000),
+    'width_support_left': (50, 1000),
+    'beam_span': (300, 15000),
+    'beam_height': (100, 1500),
+    'secondary_stirrup_spacing': (5, 400),
+}
+# parametry będące nazwami (pliku, klasy stali, języka)
+NAMES = ('name', 'steel_grade_main_top', 'steel_grade_main_bottom', 'steel_grade_stirrup', 'language')
+# nazwa pliku: bez znaków / \ : * ? " < > | i znaków sterujących, bez spacji i kropki na końcu
+PATH_NAME = re.compile(r'[^/\\:*?"<>|\x00-\x1f]{0,19}[^/\\:*?"<>|\x00-\x1f. ]')
+# parametry o wartości z listy dopuszczalnych
+CHOICES = {
+    'stirrup_style': ('polyline', 'block'),
+    'bar_symbol': ('hatch', 'block', 'multipath'),
+}
+# parametry typu bool
+FLAGS = ('explode_blocks',)
+# widoki rysunku - części rysunku DxfElement.parts() rysowane dla widoku
+VIEWS = {
+    'elevation': ('outline', 'top_bar', 'bottom_bar', 'stirrups', 'dimension_main', 'dimension_stirrup'),
+    'details': ('top_bar_detail', 'bottom_bar_detail', 'stirrup_shape', 'labels'),
+    'section': ('section',),
+    'schedule': ('table',),
+    'sheet': ('paper_space',),
+}
+PARTS = tuple(part for parts in VIEWS.values() for part in parts)
+# formaty zapisu pliku: 'asc' - DXF tekstowy, 'bin' - DXF binarny (mniejszy i szybszy w zapisie)
+FORMATS = ('asc', 'bin')
+# kompresja plików wielu belek: 'gzip' - osobne pliki .dxf.gz, 'zip' - wszystkie belki w jednym archiwum
+COMPRESSIONS = ('gzip', 'zip')
+DEFAULTS = {
+    'number_of_elements': 1,
+    'name': "Belka",
+    'dxfversion': 'R2010',
+    'start_point_x': 0,
+    'start_point_y': 0,
+    'language': 'pl',
+    'stirrup_style': 'polyline',
+    'bar_symbol': 'hatch',
+    'explode_blocks': True,
+    'views': None,
+}
+PARAMETERS = (*LIMITS, *NAMES, *CHOICES, *FLAGS, 'views', 'dxfversion', 'start_point_x', 'start_point_y')
+# belka ciągła: parametry przęsła - wartości wspólne dla belki mogą być zmienione w każdym przęśle
+SPAN_PARAMETERS = ('beam_span', 'first_row_stirrup_range_left', 'first_row_stirrup_range_right',
+                   'first_row_stirrup_spacing_left', 'first_row_stirrup_spacing_right', 'secondary_stirrup_spacing')
+# belka ciągła: parametry zastępujące beam_span, width_support_left i width_support_right
+CONTINUOUS_PARAMETERS = ('spans', 'supports', 'support_bar_ratio', 'diameter_support_top', 'quantity_support_top',
+                         'steel_grade_support_top')
+MAX_SPANS = 100
+
+
+def is_valid_value(value: float, min_value: float = 0, max_value: float = 99999):
+    if type(value) != int or value < min_value or value > max_value:
+        raise ValueError(f"{value} max is {max_value}[m]")
+    return value
+
+
+def is_valid_value_beam(value: float, range_left: float, range_right: float, min_value: float = 0,
+                        max_value: float = 99999) -> float or ValueError:
+    if type(value) != int or value <= min_value or value > max_value or value - range_left - range_right < 0:
+        raise ValueError(f"{value} max is {max_value}[m]")
+    return value
+
+
+def is_valid_path_name(name: str) -> str or ValueError:
+    """nazwa pliku: 1-20 znaków, bez znaków niedozwolonych w nazwach plików Windows i Linux"""
+    if type(name) != str or not PATH_NAME.fullmatch(name):
+        raise ValueError(f"{name!r} is not a valid file name (1-20 characters without / \\ : * ? \" < > |)")
+    return name
+
+
+def is_valid_choice(value: str, choices: tuple) -> str or ValueError:
+    if value not in choices:
+        raise ValueError(f"{value} is not one of {', '.join(choices)}")
+    return value
+
+
+def is_valid_flag(value: bool) -> bool or ValueError:
+    if type(value) != bool:
+        raise ValueError(f"{value} is not True or False")
+    return value
+
+
+def is_valid_views(views) -> tuple[str, ...] or ValueError:
+    """None - wszystkie widoki, inaczej nazwy widoków (VIEWS) lub pojedynczych części rysunku (PARTS)"""
+    if views is None:
+        return views
+    if isinstance(views, str) or not all(isinstance(view, str) for view in views):
+        raise ValueError(f"{views} is not a collection of view names")
+    unknown = [view for view in views if view not in VIEWS and view not in PARTS]
+    if unknown:
+        raise ValueError(f"{', '.join(unknown)} is not one of {', '.join(dict.fromkeys((*VIEWS, *PARTS)))}")
+    return views
+
+
+def selected_parts(views) -> frozenset[str]:
+    """Części rysunku wybranych widoków"""
+    if views is None:
+        return frozenset(PARTS)
+    return frozenset(part for view in views for part in VIEWS.get(view, (view,)))
+
+
+def validate(parameters: dict) -> list[str]:
+    """
+    Sprawdzenie parametrów belki tak jak robi to DxfElement, bez rysowania.
+    Zwraca listę błędów, pusta lista - parametry poprawne. Parametr spans - belka ciągła (validate_continuous).
+    """
+    if 'spans' in parameters:
+        return validate_continuous(parameters)
+    errors = [f"unexpected parameter '{key}'" for key in parameters if key not in PARAMETERS]
+    values = {**DEFAULTS, **parameters}
+    errors += [f"missing parameter '{key}'" for key in (*LIMITS, *NAMES) if key not in values]
+
+    for key, (min_value, max_value) in LIMITS.items():
+        if key not in values:
+            continue
+        try:
+            if key == 'beam_span':
+                is_valid_value_beam(values[key], values.get('first_row_stirrup_range_left', 0),
+                                    values.get('first_row_stirrup_range_right', 0), min_value, max_value)
+            else:
+                is_valid_value(values[key], min_value, max_value)
+        except (ValueError, TypeError) as error:
+            errors.append(f"{key}: {error}")
+    for key in NAMES:
+        if key not in values:
+            continue
+        try:
+            is_valid_path_name(values[key])
+        except (ValueError, TypeError) as error:
+            errors.append(f"{key}: {error}")
+    for key, choices in CHOICES.items():
+        try:
+            is_valid_choice(values[key], choices)
+        except (ValueError, TypeError) as error:
+            errors.append(f"{key}: {error}")
+    for key in FLAGS:
+        try:
+            is_valid_flag(values[key])
+        except ValueError as error:
+            errors.append(f"{key}: {error}")
+    try:
+        is_valid_views(values['views'])
+    except (ValueError, TypeError) as error:
+        errors.append(f"views: {error}")
+    return errors
+
+
+def span_parameters(parameters: dict) -> list[dict]:
+    """Parametry belki ciągłej rozpisane na przęsła - parametry pojedynczej belki każdego przęsła"""
+    shared = {key: value for key, value in parameters.items() if key not in CONTINUOUS_PARAMETERS}
+    supports = parameters['supports']
+    return [{**shared, 'width_support_left': supports[index], 'width_support_right': supports[index + 1],
+             **(span if isinstance(span, dict) else {'beam_span': span})}
+            for index, span in enumerate(parameters['spans'])]
+
+
+def validate_continuous(parameters: dict) -> list[str]:
+    """
+    Sprawdzenie parametrów belki ciągłej: spans - lista przęseł (beam_span lub słownik SPAN_PARAMETERS),
+    supports - szerokości podpór (o jedną więcej niż przęseł). Każde przęsło sprawdzane jest jak pojedyncza belka,
+    błędy wspólne dla wszystkich przęseł podawane są raz.
+    """
+    spans, supports = parameters['spans'], parameters.get('supports')
+    if not isinstance(spans, list) or not 1 <= len(spans) <= MAX_SPANS:
+        return [f"spans: {spans} is not a list of 1-{MAX_SPANS} spans"]
+    if not isinstance(supports, list) or len(supports) != len(spans) + 1:
+        return [f"supports: {supports} is not a list of {len(spans) + 1} support widths"]
+    errors = [f"unexpected parameter '{key}'" for key in ('beam_span', 'width_support_left', 'width_support_right')
+              if key in parameters]
+    for index, span in enumerate(spans):
+        if isinstance(span, dict):
+            errors += [f"span {index + 1}: unexpected parameter '{key}'" for key in span
+                       if key not in SPAN_PARAMETERS]
+            if 'beam_span' not in span:
+                errors.append(f"span {index + 1}: missing parameter 'beam_span'")
+    if 'support_bar_ratio' in parameters:
+        ratio = parameters['support_bar_ratio']
+        if type(ratio) not in (int, float) or not 0 < ratio <= 0.5:
+            errors.append(f"support_bar_ratio: {ratio} is not in range (0, 0.5]")
+    for key, (min_value, max_value) in (('diameter_support_top', LIMITS['diameter_main_top']),
+                                        ('quantity_support_top', LIMITS['quantity_main_top'])):
+        if parameters.get(key) is not None:
+            try:
+                is_valid_value(parameters[key], min_value, max_value)
+            except ValueError as error:
+                errors.append(f"{key}: {error}")
+    if parameters.get('steel_grade_support_top') is not None:
+        try:
+            is_valid_path_name(parameters['steel_grade_support_top'])
+        except ValueError as error:
+            errors.append(f"steel_grade_support_top: {error}")
+    if errors:
+        return errors
+
+    span_errors = [validate(span) for span in span_parameters(parameters)]
+    shared = set(span_errors[0]).intersection(*span_errors[1:])
+    errors = [error for error in span_errors[0] if error in shared]
+    for index, span in enumerate(span_errors):
+        errors += [f"span {index + 1}: {error}" for error in span if error not in shared]
+    return errors